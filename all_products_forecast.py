@@ -17,8 +17,14 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 from zoneinfo import ZoneInfo
+import business_calendar
+import fiscal_periods
+import cache_manager
+import netsuite_models
+import sheet_schema
+from sheet_parsing import parse_numeric, parse_sheet_dates
 # ========== STREAMLIT APP CONFIG ==========
 st.set_page_config(
     page_title="Q1 2026 Forecast",
@@ -28,10 +34,19 @@ st.set_page_config(
 )
 
 # ========== DATE CONSTANTS ==========
-Q1_2026_START = pd.Timestamp('2026-01-01')
-Q1_2026_END = pd.Timestamp('2026-03-31')
-Q4_2025_START = pd.Timestamp('2025-10-01')
-Q4_2025_END = pd.Timestamp('2025-12-31')
+# Quarter boundaries live in fiscal_periods
+Q1_2026_START, Q1_2026_END = fiscal_periods.CURRENT_QUARTER.window
+Q4_2025_START, Q4_2025_END = fiscal_periods.PREVIOUS_QUARTER.window
+
+# ========== SHEET RANGES ==========
+# Tabs the forecasting tool needs on top of the main dashboard's MAIN_SHEET_RANGES.
+# Fetched as their own batch next to the main dashboard's (see load_forecast_sheets)
+FORECAST_EXTRA_RANGES = (
+    ("Copy of All Reps All Pipelines", "A:Z"),
+    ("Sales Order Line Item", "A:F"),
+    ("Item Master", "A:C"),
+)
+cache_manager.register_dataset("Q1 Forecasting extra tabs", FORECAST_EXTRA_RANGES)
 
 
 def get_mst_time():
@@ -41,31 +56,7 @@ def get_mst_time():
 
 def calculate_business_days_remaining_q1():
     """Calculate business days remaining in Q1 2026 (until Mar 31, 2026)"""
-    from datetime import date
-    
-    today = date.today()
-    q1_end = date(2026, 3, 31)
-    
-    # If we're past Q1, return 0
-    if today > q1_end:
-        return 0
-    
-    # Q1 2026 holidays
-    holidays = [
-        date(2026, 1, 1),   # New Year's Day
-        date(2026, 1, 20),  # MLK Day
-        date(2026, 2, 16),  # Presidents Day
-    ]
-    
-    business_days = 0
-    current_date = today
-    
-    while current_date <= q1_end:
-        if current_date.weekday() < 5 and current_date not in holidays:
-            business_days += 1
-        current_date += timedelta(days=1)
-    
-    return business_days
+    return business_calendar.business_days_remaining(Q1_2026_END)
 
 
 # ========== CUSTOM CSS (FORECAST UI V2) ==========
@@ -897,136 +888,54 @@ def build_customer_match_dict(ns_customers, hs_customers):
 
 # ========== HISTORICAL ANALYSIS FUNCTIONS ==========
 
-def load_historical_orders(main_dash, rep_name):
+def load_forecast_sheets(main_dash):
+    """
+    Fetch every tab the forecasting tool needs (main dashboard tabs + extras).
+    The main tabs come from the main dashboard's own cache entry, so both pages share one
+    copy of them; only the extras are an extra batch. Returns a dict of sheet name -> DataFrame
+    """
+    sheets = {}
+    for ranges in (main_dash.MAIN_SHEET_RANGES, FORECAST_EXTRA_RANGES):
+        sheets.update(main_dash.load_google_sheets_batch(
+            ranges,
+            version=main_dash.CACHE_VERSION,
+            generation=cache_manager.generation(ranges)
+        ))
+    return sheets
+
+
+def load_historical_orders(main_dash, rep_name, sheets=None):
     """
     Load 2025 completed orders for historical analysis
     
     Filters:
-    - Date Range: 2025-01-01 to 2025-12-31
+    - Date Range: fiscal_periods.HISTORY_YEAR (2025-01-01 to 2025-12-31)
     - Status: "Billed" or "Closed" only
     - Rep Master: Match selected rep
     - Amount > 0
     """
     
     # Load raw sales orders data
-    historical_df = main_dash.load_google_sheets_data("NS Sales Orders", "A:AF", version=main_dash.CACHE_VERSION)
-    
-    if historical_df.empty:
-        return pd.DataFrame()
-    
-    col_names = historical_df.columns.tolist()
-    
-    # Map columns by position (same as main dashboard)
-    rename_dict = {}
-    
-    # Column A: Internal ID
-    if len(col_names) > 0:
-        rename_dict[col_names[0]] = 'Internal ID'
-    
-    # Column B: Document Number (SO#) - IMPORTANT for line item matching
-    if len(col_names) > 1:
-        rename_dict[col_names[1]] = 'SO_Number'
-    
-    # Column C: Status
-    if len(col_names) > 2:
-        rename_dict[col_names[2]] = 'Status'
-    
-    # Column H: Amount (Transaction Total)
-    if len(col_names) > 7:
-        rename_dict[col_names[7]] = 'Amount'
-    
-    # Column I: Order Start Date
-    if len(col_names) > 8:
-        rename_dict[col_names[8]] = 'Order Start Date'
-    
-    # Column R: Order Type (Product Type)
-    if len(col_names) > 17:
-        rename_dict[col_names[17]] = 'Order Type'
-    
-    # Column AE: Corrected Customer Name
-    if len(col_names) > 30:
-        rename_dict[col_names[30]] = 'Customer'
-    
-    # Column AF: Rep Master
-    if len(col_names) > 31:
-        rename_dict[col_names[31]] = 'Rep Master'
-    
-    historical_df = historical_df.rename(columns=rename_dict)
+    if sheets is None:
+        sheets = load_forecast_sheets(main_dash)
+    raw_df = sheets.get("NS Sales Orders", pd.DataFrame())
     
-    # Remove duplicate columns
-    if historical_df.columns.duplicated().any():
-        historical_df = historical_df.loc[:, ~historical_df.columns.duplicated()]
-    
-    # Clean SO_Number immediately after rename
-    if 'SO_Number' in historical_df.columns:
-        historical_df['SO_Number'] = historical_df['SO_Number'].astype(str).str.strip().str.upper()
-    
-    # Clean Status column
-    if 'Status' in historical_df.columns:
-        historical_df['Status'] = historical_df['Status'].astype(str).str.strip()
-        # Filter to Billed and Closed only
-        historical_df = historical_df[historical_df['Status'].isin(['Billed', 'Closed'])]
-    else:
+    if raw_df.empty:
         return pd.DataFrame()
     
-    # Clean Rep Master and filter to selected rep
-    if 'Rep Master' in historical_df.columns:
-        historical_df['Rep Master'] = historical_df['Rep Master'].astype(str).str.strip()
-        invalid_values = ['', 'nan', 'None', '#N/A', '#REF!', '#VALUE!', '#ERROR!']
-        historical_df = historical_df[~historical_df['Rep Master'].isin(invalid_values)]
-        historical_df = historical_df[historical_df['Rep Master'] == rep_name]
-    else:
+    # Shared NetSuite model (same column mapping, Rep Master and date parsing as the main dashboard)
+    try:
+        sales_orders_df = netsuite_models.get_sales_orders(raw_df)
+    except sheet_schema.SchemaError:
+        # Already reported by main_dash.load_all_data for the same tab
         return pd.DataFrame()
     
-    # Clean Customer column
-    if 'Customer' in historical_df.columns:
-        historical_df['Customer'] = historical_df['Customer'].astype(str).str.strip()
-        invalid_values = ['', 'nan', 'None', '#N/A', '#REF!', '#VALUE!', '#ERROR!']
-        historical_df = historical_df[~historical_df['Customer'].isin(invalid_values)]
-    
-    # Clean Amount
-    def clean_numeric(value):
-        if pd.isna(value) or str(value).strip() == '':
-            return 0
-        cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-        try:
-            return float(cleaned)
-        except:
-            return 0
-    
-    if 'Amount' in historical_df.columns:
-        historical_df['Amount'] = historical_df['Amount'].apply(clean_numeric)
-        historical_df = historical_df[historical_df['Amount'] > 0]
-    
-    # Parse Order Start Date and filter to 2025
-    if 'Order Start Date' in historical_df.columns:
-        historical_df['Order Start Date'] = pd.to_datetime(historical_df['Order Start Date'], errors='coerce')
-        
-        # Fix 2-digit year issue
-        if historical_df['Order Start Date'].notna().any():
-            mask = (historical_df['Order Start Date'].dt.year < 2000) & (historical_df['Order Start Date'].notna())
-            if mask.any():
-                historical_df.loc[mask, 'Order Start Date'] = historical_df.loc[mask, 'Order Start Date'] + pd.DateOffset(years=100)
-        
-        # Filter to 2025 only
-        year_2025_start = pd.Timestamp('2025-01-01')
-        year_2025_end = pd.Timestamp('2025-12-31')
-        historical_df = historical_df[
-            (historical_df['Order Start Date'] >= year_2025_start) & 
-            (historical_df['Order Start Date'] <= year_2025_end)
-        ]
-    
-    # Clean Order Type
-    if 'Order Type' in historical_df.columns:
-        historical_df['Order Type'] = historical_df['Order Type'].astype(str).str.strip()
-        historical_df.loc[historical_df['Order Type'].isin(['', 'nan', 'None']), 'Order Type'] = 'Standard'
-    else:
-        historical_df['Order Type'] = 'Standard'
-    
-    return historical_df
+    return netsuite_models.completed_orders(
+        sales_orders_df, rep_name, *fiscal_periods.HISTORY_YEAR.window
+    )
 
 
-def load_invoices(main_dash, rep_name):
+def load_invoices(main_dash, rep_name, sheets=None):
     """
     Load 2025 invoices for actual revenue figures
     
@@ -1038,96 +947,26 @@ def load_invoices(main_dash, rep_name):
     - Column U: Rep Master
     """
     
-    invoice_df = main_dash.load_google_sheets_data("NS Invoices", "A:U", version=main_dash.CACHE_VERSION)
+    if sheets is None:
+        sheets = load_forecast_sheets(main_dash)
+    raw_df = sheets.get("NS Invoices", pd.DataFrame())
     
-    if invoice_df.empty:
+    if raw_df.empty:
         return pd.DataFrame()
     
-    col_names = invoice_df.columns.tolist()
-    
-    rename_dict = {}
-    
-    # Column C: Date
-    if len(col_names) > 2:
-        rename_dict[col_names[2]] = 'Invoice_Date'
-    
-    # Column E: Created From (SO#)
-    if len(col_names) > 4:
-        rename_dict[col_names[4]] = 'SO_Number'
-    
-    # Column K: Amount (Transaction Total)
-    if len(col_names) > 10:
-        rename_dict[col_names[10]] = 'Invoice_Amount'
-    
-    # Column T: Corrected Customer Name
-    if len(col_names) > 19:
-        rename_dict[col_names[19]] = 'Customer'
-    
-    # Column U: Rep Master
-    if len(col_names) > 20:
-        rename_dict[col_names[20]] = 'Rep Master'
-    
-    invoice_df = invoice_df.rename(columns=rename_dict)
-    
-    # Remove duplicate columns
-    if invoice_df.columns.duplicated().any():
-        invoice_df = invoice_df.loc[:, ~invoice_df.columns.duplicated()]
-    
-    # Clean Rep Master and filter to selected rep
-    if 'Rep Master' in invoice_df.columns:
-        invoice_df['Rep Master'] = invoice_df['Rep Master'].astype(str).str.strip()
-        invalid_values = ['', 'nan', 'None', '#N/A', '#REF!', '#VALUE!', '#ERROR!']
-        invoice_df = invoice_df[~invoice_df['Rep Master'].isin(invalid_values)]
-        invoice_df = invoice_df[invoice_df['Rep Master'] == rep_name]
-    else:
+    # Shared NetSuite model (parsed once per tab version, not once per rep)
+    try:
+        invoices_df = netsuite_models.get_invoices(raw_df)
+    except sheet_schema.SchemaError:
+        # Already reported by main_dash.load_all_data for the same tab
         return pd.DataFrame()
     
-    # Clean Customer column
-    if 'Customer' in invoice_df.columns:
-        invoice_df['Customer'] = invoice_df['Customer'].astype(str).str.strip()
-        invalid_values = ['', 'nan', 'None', '#N/A', '#REF!', '#VALUE!', '#ERROR!']
-        invoice_df = invoice_df[~invoice_df['Customer'].isin(invalid_values)]
-    
-    # Clean Amount
-    def clean_numeric(value):
-        if pd.isna(value) or str(value).strip() == '':
-            return 0
-        cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-        try:
-            return float(cleaned)
-        except:
-            return 0
-    
-    if 'Invoice_Amount' in invoice_df.columns:
-        invoice_df['Invoice_Amount'] = invoice_df['Invoice_Amount'].apply(clean_numeric)
-        invoice_df = invoice_df[invoice_df['Invoice_Amount'] > 0]
-    
-    # Parse Invoice Date and filter to 2025
-    if 'Invoice_Date' in invoice_df.columns:
-        invoice_df['Invoice_Date'] = pd.to_datetime(invoice_df['Invoice_Date'], errors='coerce')
-        
-        # Fix 2-digit year issue
-        if invoice_df['Invoice_Date'].notna().any():
-            mask = (invoice_df['Invoice_Date'].dt.year < 2000) & (invoice_df['Invoice_Date'].notna())
-            if mask.any():
-                invoice_df.loc[mask, 'Invoice_Date'] = invoice_df.loc[mask, 'Invoice_Date'] + pd.DateOffset(years=100)
-        
-        # Filter to 2025 only
-        year_2025_start = pd.Timestamp('2025-01-01')
-        year_2025_end = pd.Timestamp('2025-12-31')
-        invoice_df = invoice_df[
-            (invoice_df['Invoice_Date'] >= year_2025_start) & 
-            (invoice_df['Invoice_Date'] <= year_2025_end)
-        ]
-    
-    # Clean SO_Number for matching - keep full format
-    if 'SO_Number' in invoice_df.columns:
-        invoice_df['SO_Number'] = invoice_df['SO_Number'].astype(str).str.strip().str.upper()
-    
-    return invoice_df
+    return netsuite_models.rep_invoices(
+        invoices_df, rep_name, *fiscal_periods.HISTORY_YEAR.window
+    )
 
 
-def load_line_items(main_dash):
+def load_line_items(main_dash, sheets=None):
     """
     Load Sales Order Line Items for item-level detail
     
@@ -1138,7 +977,9 @@ def load_line_items(main_dash):
     - Column F: Quantity Ordered
     """
     
-    line_items_df = main_dash.load_google_sheets_data("Sales Order Line Item", "A:F", version=main_dash.CACHE_VERSION)
+    if sheets is None:
+        sheets = load_forecast_sheets(main_dash)
+    line_items_df = sheets.get("Sales Order Line Item", pd.DataFrame())
     
     if line_items_df.empty:
         return pd.DataFrame()
@@ -1251,20 +1092,11 @@ def load_line_items(main_dash):
         line_items_df = line_items_df[~exclude_mask]
     
     # Clean numeric columns
-    def clean_numeric(value):
-        if pd.isna(value) or str(value).strip() == '':
-            return 0
-        cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-        try:
-            return float(cleaned)
-        except:
-            return 0
-    
     if 'Item_Rate' in line_items_df.columns:
-        line_items_df['Item_Rate'] = line_items_df['Item_Rate'].apply(clean_numeric)
+        line_items_df['Item_Rate'] = parse_numeric(line_items_df['Item_Rate'])
     
     if 'Quantity' in line_items_df.columns:
-        line_items_df['Quantity'] = line_items_df['Quantity'].apply(clean_numeric)
+        line_items_df['Quantity'] = parse_numeric(line_items_df['Quantity'])
     
     # Calculate line total
     line_items_df['Line_Total'] = line_items_df['Quantity'] * line_items_df['Item_Rate']
@@ -1272,7 +1104,7 @@ def load_line_items(main_dash):
     return line_items_df
 
 
-def load_item_master(main_dash):
+def load_item_master(main_dash, sheets=None):
     """
     Load Item Master data for SKU descriptions
     
@@ -1283,7 +1115,9 @@ def load_item_master(main_dash):
     Returns a dictionary mapping SKU -> Description
     """
     
-    item_master_df = main_dash.load_google_sheets_data("Item Master", "A:C", version=main_dash.CACHE_VERSION)
+    if sheets is None:
+        sheets = load_forecast_sheets(main_dash)
+    item_master_df = sheets.get("Item Master", pd.DataFrame())
     
     if item_master_df.empty:
         return {}
@@ -1819,8 +1653,11 @@ def main():
         # Import the main dashboard module (it's named sales_dashboard.py in the repo)
         import sales_dashboard as main_dash
         
+        # Fetch every tab this tool needs (main four + extras) in one batched request
+        sheets = load_forecast_sheets(main_dash)
+        
         # Load sales orders and dashboard data using the EXACT SAME function as the main dashboard
-        deals_df_q4, dashboard_df, invoices_df, sales_orders_df, q4_push_df = main_dash.load_all_data()
+        deals_df_q4, dashboard_df, invoices_df, sales_orders_df, q4_push_df = main_dash.load_all_data(raw_sheets=sheets)
         
         # Get the categorization function
         categorize_sales_orders = main_dash.categorize_sales_orders
@@ -1828,7 +1665,7 @@ def main():
         # NOW: Load Q1 2026 deals from "Copy of All Reps All Pipelines" 
         # This sheet includes BOTH Q4 2025 and Q1 2026 close dates
         # Expanded range to A:Z to capture Account Name and other columns
-        deals_df = main_dash.load_google_sheets_data("Copy of All Reps All Pipelines", "A:Z", version=main_dash.CACHE_VERSION)
+        deals_df = sheets.get("Copy of All Reps All Pipelines", pd.DataFrame())
         
         # Process the deals data (same logic as main dashboard)
         if not deals_df.empty and len(deals_df.columns) >= 6:
@@ -1881,24 +1718,15 @@ def main():
                 deals_df['Deal Owner'] = deals_df['Deal Owner'].str.strip()
             
             # Clean amount
-            def clean_numeric(value):
-                if pd.isna(value) or str(value).strip() == '':
-                    return 0
-                cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-                try:
-                    return float(cleaned)
-                except:
-                    return 0
-            
             if 'Amount' in deals_df.columns:
-                deals_df['Amount'] = deals_df['Amount'].apply(clean_numeric)
+                deals_df['Amount'] = parse_numeric(deals_df['Amount'])
             
             # Convert dates
             if 'Close Date' in deals_df.columns:
-                deals_df['Close Date'] = pd.to_datetime(deals_df['Close Date'], errors='coerce')
+                deals_df['Close Date'] = parse_sheet_dates(deals_df['Close Date'])
             
             if 'Pending Approval Date' in deals_df.columns:
-                deals_df['Pending Approval Date'] = pd.to_datetime(deals_df['Pending Approval Date'], errors='coerce')
+                deals_df['Pending Approval Date'] = parse_sheet_dates(deals_df['Pending Approval Date'])
             
             # Filter out excluded deal stages
             excluded_stages = [
@@ -2036,8 +1864,11 @@ def main():
     total_pa_nodate_amount = 0
     total_pa_old_amount = 0
     
+    # Buckets for every rep in one pass (reps without orders fall back to the per-rep call)
+    team_so_cats = main_dash.categorize_all_sales_orders(sales_orders_df)
+    
     for r in active_team_reps:
-        so_cats = categorize_sales_orders(sales_orders_df, r)
+        so_cats = team_so_cats.get(r) or categorize_sales_orders(sales_orders_df, r)
         
         # PF with Q1 2026 dates (External + Internal)
         if not so_cats['pf_date_ext'].empty:
@@ -2620,8 +2451,8 @@ def main():
             all_historical = []
             all_invoices = []
             for r in active_team_reps:
-                rep_hist = load_historical_orders(main_dash, r)
-                rep_inv = load_invoices(main_dash, r)
+                rep_hist = load_historical_orders(main_dash, r, sheets=sheets)
+                rep_inv = load_invoices(main_dash, r, sheets=sheets)
                 if not rep_hist.empty:
                     rep_hist['Rep'] = r
                     all_historical.append(rep_hist)
@@ -2630,8 +2461,8 @@ def main():
             historical_df = pd.concat(all_historical, ignore_index=True) if all_historical else pd.DataFrame()
             invoices_df = pd.concat(all_invoices, ignore_index=True) if all_invoices else pd.DataFrame()
         else:
-            historical_df = load_historical_orders(main_dash, rep_name)
-            invoices_df = load_invoices(main_dash, rep_name)
+            historical_df = load_historical_orders(main_dash, rep_name, sheets=sheets)
+            invoices_df = load_invoices(main_dash, rep_name, sheets=sheets)
             if not historical_df.empty:
                 historical_df['Rep'] = rep_name
         
@@ -2640,10 +2471,10 @@ def main():
             historical_df = merge_orders_with_invoices(historical_df, invoices_df)
         
         # Load line items - THIS IS THE KEY DATA
-        line_items_df = load_line_items(main_dash)
+        line_items_df = load_line_items(main_dash, sheets=sheets)
         
         # Load Item Master for SKU descriptions
-        sku_to_desc = load_item_master(main_dash)
+        sku_to_desc = load_item_master(main_dash, sheets=sheets)
     
     # Debug section - EXPANDED
     with st.expander("🔧 Debug: Data Loading Status", expanded=False):
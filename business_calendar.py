@@ -0,0 +1,180 @@
+"""
+Business Calendar
+The company holiday table and the one place business days are computed. A calendar
+precomputes a business-day ordinal for every day of a multi-year range (the number of
+business days before that day), so "business days between", "N business days before" and
+"remaining in period" are index lookups - for one date or a whole datetime64[D] array.
+Dates outside the range fall back to np.busday_count / np.busday_offset on the same
+weekmask + holidays, so every view gets the same answer.
+"""
+
+import numpy as np
+import pandas as pd
+
+# ========== HOLIDAY TABLE ==========
+# Days nobody ships or processes orders (observed dates - a holiday on a weekend is listed
+# on the weekday it's observed, or left out when the office doesn't observe it).
+# Edit this table to change the calendar everywhere.
+HOLIDAYS = {
+    '2024-01-01': "New Year's Day",
+    '2024-01-15': "MLK Day",
+    '2024-02-19': "Presidents Day",
+    '2024-05-27': "Memorial Day",
+    '2024-07-04': "Independence Day",
+    '2024-09-02': "Labor Day",
+    '2024-11-28': "Thanksgiving",
+    '2024-11-29': "Day after Thanksgiving",
+    '2024-12-25': "Christmas Day",
+    '2024-12-26': "Day after Christmas",
+
+    '2025-01-01': "New Year's Day",
+    '2025-01-20': "MLK Day",
+    '2025-02-17': "Presidents Day",
+    '2025-05-26': "Memorial Day",
+    '2025-07-04': "Independence Day",
+    '2025-09-01': "Labor Day",
+    '2025-11-27': "Thanksgiving",
+    '2025-11-28': "Day after Thanksgiving",
+    '2025-12-25': "Christmas Day",
+    '2025-12-26': "Day after Christmas",
+
+    '2026-01-01': "New Year's Day",
+    '2026-01-19': "MLK Day",
+    '2026-02-16': "Presidents Day",
+    '2026-05-25': "Memorial Day",
+    '2026-07-03': "Independence Day (observed)",
+    '2026-09-07': "Labor Day",
+    '2026-11-26': "Thanksgiving",
+    '2026-11-27': "Day after Thanksgiving",
+    '2026-12-25': "Christmas Day",
+
+    '2027-01-01': "New Year's Day",
+    '2027-01-18': "MLK Day",
+    '2027-02-15': "Presidents Day",
+    '2027-05-31': "Memorial Day",
+    '2027-07-05': "Independence Day (observed)",
+    '2027-09-06': "Labor Day",
+    '2027-11-25': "Thanksgiving",
+    '2027-11-26': "Day after Thanksgiving",
+    '2027-12-24': "Christmas Day (observed)",
+}
+
+# Range the ordinal index covers (dates outside it are still correct, just not precomputed)
+INDEX_START = '2020-01-01'
+INDEX_END = '2030-12-31'
+
+
+def _to_days(values):
+    """Dates (scalar, array or Series) as datetime64[D] - time of day dropped, NaT kept"""
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    return np.asarray(pd.to_datetime(values), dtype='datetime64[ns]').astype('datetime64[D]')
+
+
+def _like(result, template):
+    """result shaped like the caller's input: Series for a Series, scalar for a scalar"""
+    if isinstance(template, pd.Series):
+        return pd.Series(result, index=template.index, name=template.name)
+    if np.ndim(result) == 0:
+        # Out-of-index fallbacks come back as 0-d arrays - unwrap to a numpy scalar first
+        value = np.asarray(result)[()]
+        return pd.Timestamp(value) if value.dtype.kind == 'M' else value.item()
+    return result
+
+
+class BusinessCalendar:
+    """
+    Monday-Friday minus a holiday table, with a precomputed ordinal index over
+    [index_start, index_end]. All methods take scalars, arrays or Series.
+    """
+
+    def __init__(self, holidays, index_start=INDEX_START, index_end=INDEX_END):
+        self.holidays = np.array(sorted(holidays), dtype='datetime64[D]')
+        self.busdaycal = np.busdaycalendar(weekmask='1111100', holidays=self.holidays)
+
+        self.first_day = np.datetime64(index_start, 'D')
+        days = np.arange(self.first_day, np.datetime64(index_end, 'D') + 1)
+        is_business = np.is_busday(days, busdaycal=self.busdaycal)
+        # _ordinals[i] = business days in [first_day, first_day + i) - one past the last day
+        # too, so "through the last day" is still a lookup
+        self._ordinals = np.concatenate([[0], np.cumsum(is_business)])
+        self._business_days = days[is_business]
+
+    def _ordinal(self, days):
+        """Business days in [first_day, day) for each day (negative before first_day)"""
+        offset = (days - self.first_day).astype(np.int64)
+        inside = (offset >= 0) & (offset < len(self._ordinals))
+        if np.all(inside):
+            return self._ordinals[offset]
+        # np.busday_count counts (end, begin] when end < begin, so count [day, first_day) directly
+        before = days < self.first_day
+        fallback = np.where(
+            before,
+            -np.busday_count(np.where(before, days, self.first_day), self.first_day, busdaycal=self.busdaycal),
+            np.busday_count(self.first_day, np.where(before, self.first_day, days), busdaycal=self.busdaycal),
+        )
+        return np.where(inside, self._ordinals[np.clip(offset, 0, len(self._ordinals) - 1)], fallback)
+
+    def is_business_day(self, dates):
+        return _like(np.is_busday(_to_days(dates), busdaycal=self.busdaycal), dates)
+
+    def business_days_in(self, start, end):
+        """Business days in [start, end], both ends included (0 when end is before start)"""
+        start_days, end_days = _to_days(start), _to_days(end)
+        days = self._ordinal(end_days + 1) - self._ordinal(start_days)
+        return _like(np.maximum(days, 0), start if np.ndim(start_days) else end)
+
+    def business_days_between(self, start, end):
+        """
+        Business days elapsed from start to end: the business days in [start, end] minus one,
+        so an order placed today is 0 days old. Never negative; a missing start counts as 0.
+        """
+        start_days, end_days = _to_days(start), _to_days(end)
+        missing = np.isnat(start_days)
+        start_days = np.where(missing, end_days, start_days)
+
+        days = self._ordinal(end_days + 1) - self._ordinal(start_days) - 1
+        return _like(np.where(missing, 0, np.maximum(days, 0)), start)
+
+    def business_days_before(self, dates, business_days):
+        """
+        The date business_days business days before each date (counting back from the
+        first business day on or after it), e.g. a ship-by cutoff from a period end
+        """
+        days = _to_days(dates)
+        target = self._ordinal(days) - np.asarray(business_days)
+        inside = (target >= 0) & (target < len(self._business_days))
+        if np.all(inside):
+            result = self._business_days[target]
+        else:
+            fallback = np.busday_offset(days, -np.asarray(business_days), roll='forward', busdaycal=self.busdaycal)
+            result = np.where(inside, self._business_days[np.clip(target, 0, len(self._business_days) - 1)], fallback)
+        return _like(result.astype('datetime64[ns]'), dates)
+
+    def business_days_remaining(self, period_end, today=None):
+        """Business days left in a period, today included (0 once the period is over)"""
+        today = pd.Timestamp.now() if today is None else today
+        return self.business_days_in(today, period_end)
+
+
+# The company calendar every view uses
+CALENDAR = BusinessCalendar(HOLIDAYS)
+
+
+# ========== BUSINESS-DAY MATH ==========
+# Module-level shortcuts on the company calendar
+
+def business_days_in(start, end):
+    return CALENDAR.business_days_in(start, end)
+
+
+def business_days_between(start, end):
+    return CALENDAR.business_days_between(start, end)
+
+
+def business_days_before(dates, business_days):
+    return CALENDAR.business_days_before(dates, business_days)
+
+
+def business_days_remaining(period_end, today=None):
+    return CALENDAR.business_days_remaining(period_end, today)
@@ -0,0 +1,60 @@
+"""
+Cache Manager
+Records which Sheets tabs each dataset (view) reads, plus a process-wide generation
+number per tab. Cached loaders take the generation of the tabs they read as an
+argument, so refreshing a tab only misses the st.cache_data entries built from that
+tab - every other view keeps its cached results.
+
+(The refresh button used to call st.cache_data.clear(), which also threw away the
+Concentrate Jar and Commission caches that nobody asked to refresh.)
+"""
+
+import threading
+
+_lock = threading.Lock()
+
+# Sheet name -> generation, bumped every time the tab is invalidated
+_generations = {}
+
+# Dataset label -> tuple of (sheet_name, range_name) pairs it reads
+_datasets = {}
+
+
+def register_dataset(label, ranges):
+    """Declare the tabs a view depends on (safe to call again on module reload)"""
+    with _lock:
+        _datasets[label] = tuple(ranges)
+
+
+def datasets():
+    """Registered datasets, label -> ranges (for the per-dataset refresh buttons)"""
+    with _lock:
+        return dict(_datasets)
+
+
+def generation(ranges):
+    """
+    Cache-key token for ranges: the current generation of each tab
+    Pass it to the st.cache_data loader so invalidating any of the tabs forces a miss
+    """
+    with _lock:
+        return tuple(_generations.get(sheet_name, 0) for sheet_name, _ in ranges)
+
+
+def invalidate_tabs(sheet_names):
+    """Bump the generation of each tab - loaders that read them miss on their next call"""
+    with _lock:
+        for sheet_name in sheet_names:
+            _generations[sheet_name] = _generations.get(sheet_name, 0) + 1
+
+
+def invalidate_ranges(ranges):
+    """invalidate_tabs for (sheet_name, range_name) pairs"""
+    invalidate_tabs(sheet_name for sheet_name, _ in ranges)
+
+
+def invalidate_dataset(label):
+    """Invalidate every tab a registered dataset reads"""
+    with _lock:
+        ranges = _datasets.get(label, ())
+    invalidate_ranges(ranges)
@@ -8,15 +8,15 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import hashlib
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+import cache_manager
+import netsuite_models
+import sheets_client
+import sheet_cache
+import sheet_schema
 
 # ==========================================
 # CONFIGURATION
 # ==========================================
-SPREADSHEET_ID = "12s-BanWrT_N8SuB3IXFp5JF-xPYB2I-YjmYAYaWsxJk"
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
-
 ADMIN_EMAIL = "xward@calyxcontainers.com"
 ADMIN_PASSWORD_HASH = hashlib.sha256("Secret2025!".encode()).hexdigest()
 
@@ -140,26 +140,24 @@ def load_custom_css():
 # DATA LOADING
 # ==========================================
 
-@st.cache_data(ttl=3600)
-def fetch_google_sheet_data(sheet_name, range_name):
+# Tabs this view reads (refreshable from the main dashboard's Sync Status panel)
+COMMISSION_RANGES = (("NS Invoices", "A:U"),)
+cache_manager.register_dataset("Commission", COMMISSION_RANGES)
+
+@st.cache_data(ttl=3600, max_entries=8)
+def fetch_google_sheet_data(sheet_name, range_name, generation=()):
     try:
-        if "gcp_service_account" not in st.secrets:
+        if not sheets_client.has_credentials():
             return pd.DataFrame()
 
-        creds_dict = dict(st.secrets["gcp_service_account"])
-        creds = service_account.Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
-        service = build('sheets', 'v4', credentials=creds)
-        
-        result = service.spreadsheets().values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range=f"{sheet_name}!{range_name}"
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(values[1:], columns=values[0])
+        # Served from the on-disk tab cache after a restart (see sheet_cache)
+        ranges = ((sheet_name, range_name),)
+        frames = sheet_cache.load_tabs(ranges, on_refresh=lambda: cache_manager.invalidate_ranges(ranges))
+        if sheet_cache.stale_error(ranges):
+            st.warning(f"Google Sheets unavailable - showing the last saved copy of {sheet_name}")
+        df = frames.get(sheet_name, pd.DataFrame())
+        # Version key of the shared NetSuite model (see netsuite_models)
+        df.attrs['content_hash'] = sheet_cache.frame_hash(df)
         return df
 
     except Exception as e:
@@ -170,71 +168,39 @@ def process_ns_invoices(df):
     if df.empty:
         return df
     
-    df.columns = df.columns.str.strip()
+    # Shared NetSuite invoice model: Sales Rep from Rep Master, Customer from Corrected
+    # Customer Name, amounts and dates already parsed
+    try:
+        df = netsuite_models.get_invoices(df)
+    except sheet_schema.SchemaError as e:
+        st.error(f"❌ {e}")
+        return pd.DataFrame()
+    if df.empty:
+        return df
     
-    if 'Date' in df.columns and 'Date Closed' in df.columns:
+    if 'Date Closed' in df.columns:
         df = df.drop(columns=['Date'])
-    if 'Sales Rep' in df.columns:
-        df = df.rename(columns={'Sales Rep': 'Original Sales Rep'})
+    df = df.drop(columns=[col for col in ['Corrected Customer Name'] if col in df.columns])
     
     rename_map = {
-        'Amount (Transaction Total)': 'Amount',
         'Date Closed': 'Close Date',
-        'Document Number': 'Invoice',
-        'Status': 'Status',
-        'Amount (Transaction Tax Total)': 'Tax Amount',
-        'Amount (Shipping)': 'Shipping Amount',
-        'Corrected Customer Name': 'Customer',
+        'Invoice Number': 'Invoice',
         'Created From': 'SO Number',
-        'CSM': 'CSM',
-        'HubSpot Pipeline': 'Pipeline',
-        'Rep Master': 'Rep Master'
+        'HubSpot_Pipeline': 'Pipeline',
     }
     
     df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
     
-    if 'Rep Master' in df.columns:
-        df['Sales Rep'] = df['Rep Master']
+    # Clean customer names and SO numbers
+    df['Customer'] = df['Customer'].astype(str).str.replace('^Customer ', '', regex=True)
+    df['SO Number'] = df['SO Number'].astype(str).str.replace('Sales Order', '').str.strip()
     
-    # Clean customer names - defensive approach
-    try:
-        if 'Customer' in df.columns:
-            df['Customer'] = df['Customer'].astype(str).str.replace('^Customer ', '', regex=True)
-    except:
-        pass
-    
-    # Clean SO Number - defensive approach
-    try:
-        if 'SO Number' in df.columns:
-            df['SO Number'] = df['SO Number'].astype(str).str.replace('Sales Order', '').str.strip()
-    except:
-        pass
-    
-    # Parse dates - defensive approach
-    try:
-        if 'Close Date' in df.columns:
-            df['Close Date'] = pd.to_datetime(df['Close Date'], errors='coerce')
-    except:
-        pass
-    
-    numeric_cols = ['Amount', 'Tax Amount', 'Shipping Amount']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.replace(r'[$,]', '', regex=True)
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    
-    # Calculate subtotal - defensive approach
-    try:
-        if 'Amount' in df.columns:
-            df['Subtotal'] = df['Amount']
-            if 'Tax Amount' in df.columns:
-                df['Subtotal'] = df['Subtotal'] - df['Tax Amount']
-            if 'Shipping Amount' in df.columns:
-                df['Subtotal'] = df['Subtotal'] - df['Shipping Amount']
-        else:
-            df['Subtotal'] = 0
-    except:
-        df['Subtotal'] = 0
+    # Calculate subtotal
+    df['Subtotal'] = df['Amount']
+    if 'Tax Amount' in df.columns:
+        df['Subtotal'] = df['Subtotal'] - df['Tax Amount']
+    if 'Shipping Amount' in df.columns:
+        df['Subtotal'] = df['Subtotal'] - df['Shipping Amount']
     
     return df
 
@@ -315,7 +281,7 @@ def display_dashboard():
             st.rerun()
     
     with st.spinner("🔄 Loading commission data..."):
-        raw_data = fetch_google_sheet_data("NS Invoices", "A:U")
+        raw_data = fetch_google_sheet_data("NS Invoices", "A:U", generation=cache_manager.generation(COMMISSION_RANGES))
         if raw_data.empty:
             st.error("❌ Could not load data")
             return
@@ -0,0 +1,73 @@
+"""
+Fiscal Periods
+Quarter boundaries in one place. A FiscalPeriod is a named date range (both ends
+included); the dashboard's current, previous and next quarters and the forecast's history
+year are all derived from CURRENT_QUARTER.
+
+Rolling the dashboard to the next quarter is an edit of CURRENT_QUARTER.
+"""
+
+import pandas as pd
+
+
+class FiscalPeriod:
+    """A named [start, end] date range - end is a whole day, so Mar 31 23:59 is still in Q1"""
+
+    def __init__(self, key, start, end):
+        self.key = key
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp(end)
+
+    def __repr__(self):
+        return f"FiscalPeriod({self.key!r}, {self.start.date()}, {self.end.date()})"
+
+    def __eq__(self, other):
+        return isinstance(other, FiscalPeriod) and (self.key, self.start, self.end) == (other.key, other.start, other.end)
+
+    def __hash__(self):
+        return hash((self.key, self.start, self.end))
+
+    @property
+    def end_exclusive(self):
+        """First moment after the period (compare with <)"""
+        return self.end + pd.Timedelta(days=1)
+
+    @property
+    def window(self):
+        """(start, end) pair for the inclusive window tests in the sales order buckets"""
+        return self.start, self.end
+
+    def contains(self, dates):
+        """Mask of dates inside the period (NaT never is)"""
+        return (dates >= self.start) & (dates < self.end_exclusive)
+
+    def shift(self, quarters):
+        """The quarter this many quarters later (earlier when negative) - quarters only"""
+        index = self.start.year * 4 + (self.start.month - 1) // 3 + quarters
+        return quarter(index // 4, index % 4 + 1)
+
+
+# ========== CONSTRUCTORS ==========
+
+def quarter(year, number):
+    """Calendar quarter number (1-4) of year, keyed like 'Q1 2026'"""
+    start = pd.Timestamp(year=year, month=3 * (number - 1) + 1, day=1)
+    end = start + pd.offsets.QuarterEnd(startingMonth=3)
+    return FiscalPeriod(f"Q{number} {year}", start, end)
+
+
+def fiscal_year(year):
+    """Jan 1 - Dec 31 of year, keyed like '2025'"""
+    return FiscalPeriod(str(year), pd.Timestamp(year=year, month=1, day=1), pd.Timestamp(year=year, month=12, day=31))
+
+
+# ========== CURRENT PERIODS ==========
+
+# The quarter the dashboard forecasts - edit at quarter rollover
+CURRENT_QUARTER = quarter(2026, 1)
+PREVIOUS_QUARTER = CURRENT_QUARTER.shift(-1)   # spillover backward
+NEXT_QUARTER = CURRENT_QUARTER.shift(1)        # spillover forward
+
+# Full year the forecast's history (completed orders, invoices) is read from
+HISTORY_YEAR = fiscal_year(CURRENT_QUARTER.start.year - 1)
+
@@ -0,0 +1,220 @@
+"""
+NetSuite Models
+One canonical, typed model per NetSuite tab ("NS Sales Orders", "NS Invoices"), parsed once
+per tab version and shared by every view. Each model keeps all statuses and all years;
+views (open orders for the dashboard, billed 2025 orders for the forecast, commission
+invoices, ...) are derived from it by masking instead of re-parsing the raw tab.
+"""
+
+import pandas as pd
+import streamlit as st
+
+import sheet_cache
+import sheet_schema
+from sheet_parsing import parse_numeric, parse_sheet_dates
+
+# Placeholder / formula-error values that mean "no value" in text columns
+INVALID_VALUES = ['', 'nan', 'None', '#N/A', '#REF!', '#VALUE!', '#ERROR!']
+
+# Sales order statuses counted as open pipeline on the main dashboard
+OPEN_SO_STATUSES = ['Pending Approval', 'Pending Fulfillment', 'Pending Billing/Partially Fulfilled']
+
+# Sales order statuses counted as completed orders in the forecast's history
+COMPLETED_SO_STATUSES = ['Billed', 'Closed']
+
+SO_DATE_COLUMNS = ['Order Start Date', 'Customer Promise Date', 'Projected Date',
+                   'Pending Approval Date', 'Pending Fulfillment Date']
+
+
+def _content_hash(df):
+    """Version key of a raw tab (stamped by load_google_sheets_batch, computed otherwise)"""
+    return df.attrs.get('content_hash') or sheet_cache.frame_hash(df)
+
+
+def _drop_duplicate_columns(df):
+    if df.columns.duplicated().any():
+        df = df.loc[:, ~df.columns.duplicated()]
+    return df
+
+
+# ========== SALES ORDERS ==========
+
+def build_sales_orders(raw_df):
+    """
+    Canonical sales order model from the raw "NS Sales Orders" tab (A:AF)
+    - Named columns: Internal ID, Document Number, Status, Amount, Sales Rep, Customer,
+      Order Start Date, Pending Fulfillment Date, Customer Promise Date, Projected Date,
+      Order Type, Calyx External Order, Pending Approval Date, PI_CSM (others kept as-is)
+    - Sales Rep comes from Rep Master (rows without a valid Rep Master are dropped - they
+      never count toward any rep), Customer from Corrected Customer Name
+    - Amount is numeric, Status / Sales Rep stripped, date columns parsed once
+    Raises sheet_schema.SchemaError when the header row lacks a required column.
+    """
+    if raw_df.empty:
+        return pd.DataFrame()
+
+    # Canonical column names (mapping resolved once per header row - see sheet_schema)
+    sales_orders_df = sheet_schema.SALES_ORDERS.apply(raw_df)
+
+    # Rep Master is the ONLY source of truth for the rep - rows without one (including #N/A)
+    # don't count toward any revenue
+    if 'Rep Master' in sales_orders_df.columns:
+        rep_master = sales_orders_df['Rep Master'].astype(str).str.strip()
+        valid_rep = ~rep_master.isin(INVALID_VALUES)
+        sales_orders_df = sales_orders_df[valid_rep]
+        sales_orders_df['Sales Rep'] = rep_master[valid_rep]
+        sales_orders_df = sales_orders_df.drop(columns=['Rep Master'])
+
+    # Corrected Customer Name takes priority over Customer
+    if 'Corrected Customer Name' in sales_orders_df.columns:
+        sales_orders_df['Customer'] = sales_orders_df['Corrected Customer Name']
+        sales_orders_df = sales_orders_df.drop(columns=['Corrected Customer Name'])
+
+    sales_orders_df = _drop_duplicate_columns(sales_orders_df)
+
+    if 'Amount' in sales_orders_df.columns:
+        sales_orders_df['Amount'] = parse_numeric(sales_orders_df['Amount'])
+    if 'Sales Rep' in sales_orders_df.columns:
+        sales_orders_df['Sales Rep'] = sales_orders_df['Sales Rep'].astype(str).str.strip()
+    if 'Status' in sales_orders_df.columns:
+        sales_orders_df['Status'] = sales_orders_df['Status'].astype(str).str.strip()
+
+    # Explicit formats + 2-digit year fix (26 = 2026, not 1926) in one pass
+    for col in SO_DATE_COLUMNS:
+        if col in sales_orders_df.columns:
+            sales_orders_df[col] = parse_sheet_dates(sales_orders_df[col], fix_century=True)
+
+    return sales_orders_df
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _sales_orders_model(content_hash, _raw_df):
+    return build_sales_orders(_raw_df)
+
+
+def get_sales_orders(raw_df):
+    """
+    Canonical sales order model for a raw "NS Sales Orders" tab, built once per tab version
+    and shared across views and sessions (returned as a shallow copy-on-write copy)
+    """
+    return _sales_orders_model(_content_hash(raw_df), raw_df).copy(deep=False)
+
+
+def completed_orders(sales_orders_df, rep_name, start, end):
+    """
+    Billed/Closed orders of one rep with an Order Start Date in [start, end] and Amount > 0
+    (forecast history). Adds SO_Number (upper-cased Document Number), Rep Master and a
+    cleaned Order Type (blank -> 'Standard').
+    """
+    if sales_orders_df.empty or 'Status' not in sales_orders_df.columns or 'Sales Rep' not in sales_orders_df.columns:
+        return pd.DataFrame()
+
+    mask = sales_orders_df['Status'].isin(COMPLETED_SO_STATUSES) & (sales_orders_df['Sales Rep'] == rep_name)
+    if 'Customer' in sales_orders_df.columns:
+        mask &= ~sales_orders_df['Customer'].astype(str).str.strip().isin(INVALID_VALUES)
+    if 'Amount' in sales_orders_df.columns:
+        mask &= sales_orders_df['Amount'] > 0
+    if 'Order Start Date' in sales_orders_df.columns:
+        mask &= (sales_orders_df['Order Start Date'] >= start) & (sales_orders_df['Order Start Date'] <= end)
+
+    orders = sales_orders_df[mask]
+    orders['Rep Master'] = orders['Sales Rep']
+    if 'Customer' in orders.columns:
+        orders['Customer'] = orders['Customer'].astype(str).str.strip()
+    if 'Document Number' in orders.columns:
+        orders['SO_Number'] = orders['Document Number'].astype(str).str.strip().str.upper()
+    if 'Order Type' in orders.columns:
+        orders['Order Type'] = orders['Order Type'].astype(str).str.strip()
+        orders.loc[orders['Order Type'].isin(['', 'nan', 'None']), 'Order Type'] = 'Standard'
+    else:
+        orders['Order Type'] = 'Standard'
+    return orders
+
+
+# ========== INVOICES ==========
+
+def build_invoices(raw_df):
+    """
+    Canonical invoice model from the raw "NS Invoices" tab (A:U)
+    - Named columns: Invoice Number, Status, Date, Created From, Customer, Amount,
+      Original Sales Rep, Corrected Customer Name, Rep Master, HubSpot_Pipeline, CSM,
+      Date Closed, Tax Amount, Shipping Amount (other headers kept as-is)
+    - Sales Rep = Rep Master (stripped) when the column exists, Customer = Corrected
+      Customer Name where that is filled in
+    - Every row is kept (including ones without a valid Rep Master) - views filter
+    - Amounts numeric, Date / Date Closed parsed once
+    Raises sheet_schema.SchemaError when the header row lacks a required column.
+    """
+    if raw_df.empty:
+        return pd.DataFrame()
+
+    # Canonical column names (mapping resolved once per header row - see sheet_schema)
+    invoices_df = _drop_duplicate_columns(sheet_schema.INVOICES.apply(raw_df))
+
+    invoices_df['Original Sales Rep'] = invoices_df['Original Sales Rep'].astype(str).str.strip()
+    if 'Rep Master' in invoices_df.columns:
+        invoices_df['Rep Master'] = invoices_df['Rep Master'].astype(str).str.strip()
+        invoices_df['Sales Rep'] = invoices_df['Rep Master']
+    else:
+        invoices_df['Sales Rep'] = invoices_df['Original Sales Rep']
+
+    if 'Corrected Customer Name' in invoices_df.columns:
+        corrected = invoices_df['Corrected Customer Name'].astype(str).str.strip()
+        invoices_df['Corrected Customer Name'] = corrected
+        invoices_df['Customer'] = corrected.where(~corrected.isin(INVALID_VALUES), invoices_df['Customer'])
+
+    invoices_df['Amount'] = parse_numeric(invoices_df['Amount'])
+    for col in ['Tax Amount', 'Shipping Amount']:
+        if col in invoices_df.columns:
+            invoices_df[col] = parse_numeric(invoices_df[col])
+
+    invoices_df['Date'] = parse_sheet_dates(invoices_df['Date'], fix_century=True)
+    if 'Date Closed' in invoices_df.columns:
+        invoices_df['Date Closed'] = parse_sheet_dates(invoices_df['Date Closed'], fix_century=True)
+
+    return invoices_df
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _invoices_model(content_hash, _raw_df):
+    return build_invoices(_raw_df)
+
+
+def get_invoices(raw_df):
+    """
+    Canonical invoice model for a raw "NS Invoices" tab, built once per tab version and
+    shared across views and sessions (returned as a shallow copy-on-write copy)
+    """
+    return _invoices_model(_content_hash(raw_df), raw_df).copy(deep=False)
+
+
+def has_valid_rep_master(invoices_df):
+    """Mask of invoices attributed to a rep via Rep Master (all True if the column is missing)"""
+    if 'Rep Master' not in invoices_df.columns:
+        return pd.Series(True, index=invoices_df.index)
+    return ~invoices_df['Rep Master'].isin(INVALID_VALUES)
+
+
+def rep_invoices(invoices_df, rep_name, start, end):
+    """
+    Invoices of one rep dated in [start, end] with a positive amount (forecast history),
+    using the forecast's column names: Invoice_Date, SO_Number, Invoice_Amount, Customer
+    (= Corrected Customer Name), Rep Master
+    """
+    if invoices_df.empty or 'Rep Master' not in invoices_df.columns:
+        return pd.DataFrame()
+
+    corrected = invoices_df.get('Corrected Customer Name', invoices_df['Customer']).astype(str).str.strip()
+    mask = (
+        has_valid_rep_master(invoices_df) &
+        (invoices_df['Rep Master'] == rep_name) &
+        ~corrected.isin(INVALID_VALUES) &
+        (invoices_df['Amount'] > 0) &
+        (invoices_df['Date'] >= start) &
+        (invoices_df['Date'] <= end)
+    )
+
+    invoices = invoices_df[mask].drop(columns=['Customer'])
+    invoices['Customer'] = corrected[mask]
+    invoices['SO_Number'] = invoices['Created From'].astype(str).str.strip().str.upper()
+    return invoices.rename(columns={'Date': 'Invoice_Date', 'Amount': 'Invoice_Amount'})
@@ -0,0 +1,80 @@
+"""
+Rep Partitions
+Row positions of every rep in a loaded dataset (deals by Deal Owner, invoices and sales
+orders by Sales Rep), built once per data version with groupby().indices. Rep views take
+their rows with one .take() instead of scanning the whole frame with a == mask per rep.
+
+The partition rides along in df.attrs, so it reaches every shallow copy load_all_data
+hands out. A frame that was filtered, sorted or re-indexed since, or whose rep column was
+rewritten, no longer matches its partition (index + rep column fingerprint) and simply
+falls back to the mask.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class RepPartition:
+    """column value -> row positions, for the exact rows (index + rep values) it was built from"""
+
+    def __init__(self, df, column):
+        self.column = column
+        self.index = df.index
+        self.fingerprint = column_fingerprint(df[column])
+        self.positions = df.groupby(column, observed=True).indices if not df.empty else {}
+
+    def __deepcopy__(self, memo):
+        # pandas deep-copies attrs on every derived frame - the partition is read-only, share it
+        return self
+
+    def matches(self, df, column):
+        """
+        True when df still has exactly the rows, in the same order, with the same rep values
+        the partition was built from - a sort followed by reset_index keeps the index but
+        moves the reps, and an in-place remap of the rep column keeps both
+        """
+        if column != self.column or len(df) != len(self.index):
+            return False
+        if not (df.index is self.index or df.index.equals(self.index)):
+            return False
+        return column_fingerprint(df[column]) == self.fingerprint
+
+
+def column_fingerprint(values):
+    """Order-sensitive content hash of a column (one vectorized pass, cheap for categoricals)"""
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    # Weight by position so swapping two rows changes the result (uint64 wraps around)
+    return int((hashes * np.arange(1, len(hashes) + 1, dtype='uint64')).sum())
+
+
+def partition(df, column):
+    """Build df's rep partition by column and attach it to df (returns df)"""
+    if column in df.columns:
+        df.attrs['rep_partition'] = RepPartition(df, column)
+    return df
+
+
+def _partition_for(df, column):
+    found = df.attrs.get('rep_partition')
+    if isinstance(found, RepPartition) and found.matches(df, column):
+        return found
+    return None
+
+
+def rep_rows(df, column, rep_name):
+    """df[df[column] == rep_name] - a take() of the precomputed positions when df is partitioned"""
+    found = _partition_for(df, column)
+    if found is None:
+        return df[df[column] == rep_name]
+    positions = found.positions.get(rep_name)
+    if positions is None:
+        return df.iloc[:0]
+    return df.take(positions)
+
+
+def rep_positions(df, column):
+    """{rep: row positions} for df - the precomputed partition, or one groupby when there is none"""
+    found = _partition_for(df, column)
+    if found is not None:
+        return found.positions
+    return df.groupby(column, observed=True).indices if not df.empty else {}
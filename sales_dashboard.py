@@ -9,15 +9,25 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import plotly.io as pio
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 import json
+import logging
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import time
 import base64
 import numpy as np
 import claude_insights
+import cache_manager
+import sheets_client
+import sheet_cache
+import business_calendar
+import fiscal_periods
+import netsuite_models
+import rep_partitions
+import sheet_schema
+from sheet_parsing import parse_numeric, parse_sheet_dates, to_categories
+from sheets_client import SPREADSHEET_ID
 # Optional: Commission calculator module (if available)
 try:
     import commission_calculator
@@ -51,6 +61,15 @@ except Exception as e:
     ALL_PRODUCTS_FORECAST_AVAILABLE = False
     ALL_PRODUCTS_FORECAST_ERROR = f"Error loading module: {str(e)}"
 
+# Copy-on-Write: the cached datasets are shared by every session (st.cache_resource) and
+# handed out as shallow copies - with CoW, changing a column in one copy never touches the
+# shared frame. Always on from pandas 3.0.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Messages from the background refresher, which has no page to render them on
+logger = logging.getLogger(__name__)
+
 # Configure Plotly for dark mode compatibility
 pio.templates.default = "plotly"  # Use default template that adapts to theme
 
@@ -58,30 +77,9 @@ pio.templates.default = "plotly"  # Use default template that adapts to theme
 def calculate_business_days_remaining():
     """
     Calculate business days from today through end of Q1 2026 (Mar 31)
-    Excludes weekends and major holidays
+    Excludes weekends and company holidays (see business_calendar)
     """
-    from datetime import date, timedelta
-    
-    today = date.today()
-    q1_end = date(2026, 3, 31)
-    
-    # Define holidays to exclude
-    holidays = [
-        date(2026, 1, 1),   # New Year's Day
-        date(2026, 1, 20),  # MLK Day
-        date(2026, 2, 16),  # Presidents Day
-    ]
-    
-    business_days = 0
-    current_date = today
-    
-    while current_date <= q1_end:
-        # Check if it's a weekday (Monday=0, Sunday=6)
-        if current_date.weekday() < 5 and current_date not in holidays:
-            business_days += 1
-        current_date += timedelta(days=1)
-    
-    return business_days
+    return business_calendar.business_days_remaining(fiscal_periods.CURRENT_QUARTER.end)
 
 def get_mst_time():
     """
@@ -700,88 +698,132 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Google Sheets Configuration
-SPREADSHEET_ID = "12s-BanWrT_N8SuB3IXFp5JF-xPYB2I-YjmYAYaWsxJk"
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+# Google Sheets Configuration (SPREADSHEET_ID / SCOPES live in sheets_client)
 
 # Cache version for manual refresh control
 # No TTL - data only refreshes when user clicks refresh button
 CACHE_VERSION = "v62_manual_refresh_only"
 
-@st.cache_data  # Removed TTL - cache persists until manually cleared
-def load_google_sheets_data(sheet_name, range_name, version=CACHE_VERSION):
+# Tabs and ranges read by load_all_data - fetched together (see load_google_sheets_batch)
+MAIN_SHEET_RANGES = (
+    ("All Reps All Pipelines", "A:R"),
+    ("Dashboard Info", "A:C"),
+    ("NS Invoices", "A:U"),
+    ("NS Sales Orders", "A:AF"),
+)
+cache_manager.register_dataset("Main dashboard", MAIN_SHEET_RANGES)
+
+# Low-cardinality label columns of the processed frames, stored as category
+CATEGORY_COLUMNS = ('Sales Rep', 'Status', 'Deal Stage', 'Deal Owner', 'Pipeline',
+                    'Product Type', 'Order Type', 'Customer')
+
+def sheets_error_notices(sheet_name, error):
+    """
+    A Sheets API error with troubleshooting hints based on the error type, as load notices
+    (see show_load_notices) - cached loaders return them instead of rendering them
     """
-    Load data from Google Sheets with caching and enhanced error handling
+    error_msg = str(error)
+    notices = [('main', 'error', f"❌ Error loading data from {sheet_name}: {error_msg}")]
+    
+    # Provide specific troubleshooting based on error type
+    if "403" in error_msg or "permission" in error_msg.lower():
+        notices.append(('main', 'warning', """
+        **Permission Error:**
+        - Make sure you've shared the Google Sheet with your service account email
+        - The service account email looks like: `your-service-account@project.iam.gserviceaccount.com`
+        - Share the sheet with 'Viewer' access
+        """))
+    elif "404" in error_msg or "not found" in error_msg.lower():
+        notices.append(('main', 'warning', """
+        **Sheet Not Found:**
+        - Check that the spreadsheet ID is correct
+        - Check that the sheet name matches exactly (case-sensitive)
+        - Current spreadsheet ID: `12s-BanWrT_N8SuB3IXFp5JF-xPYB2I-YjmYAYaWsxJk`
+        """))
+    elif "401" in error_msg or "authentication" in error_msg.lower():
+        notices.append(('main', 'warning', """
+        **Authentication Error:**
+        - Your service account credentials may be invalid
+        - Try regenerating the service account key in Google Cloud Console
+        """))
+    return notices
+
+def show_stale_warning(ranges):
+    """Warn when tabs were served from the disk cache because Google could not be reached"""
+    error = sheet_cache.stale_error(ranges)
+    if error:
+        sheet_names = ', '.join(sheet_name for sheet_name, _ in ranges)
+        st.warning(f"⚠️ Showing the last saved copy of {sheet_names} - Google Sheets is unavailable "
+                   f"or rate limiting ({error}). Press Refresh in a minute to retry.")
+
+def load_google_sheets_batch(ranges, version=CACHE_VERSION, generation=()):
+    """
+    Load several tabs in one go (one batchGet round trip, see sheets_client.batch_get_values)
+    
+    Returns this caller's view of the process-wide copy (load_google_sheets_batch_shared):
+    shallow copy-on-write frames, so callers can add or change columns freely without
+    duplicating the data per session or touching anyone else's.
+    Messages from the fetch are rendered here, in the session's script run.
     """
+    shared, notices = load_google_sheets_batch_shared(ranges, version=version, generation=generation)
+    show_load_notices(notices)
+    show_stale_warning(ranges)
+    return {sheet_name: df.copy(deep=False) for sheet_name, df in shared.items()}
+
+@st.cache_resource(max_entries=8)  # Shared read-only copy; no TTL - refreshed by bumping the tabs' generation (cache_manager)
+def load_google_sheets_batch_shared(ranges, version=CACHE_VERSION, generation=()):
+    """
+    Fetch several tabs once per process - never mutate the returned frames (see load_google_sheets_batch)
+    
+    ranges: tuple of (sheet_name, range_name) pairs
+    generation: cache_manager.generation(ranges) - a new value forces a reload
+    Returns (frames, notices): a dict mapping sheet name -> DataFrame (empty DataFrame if
+    the tab had no data) and the messages for show_load_notices. Nothing is rendered here -
+    the background refresher calls this outside any script run.
+    After a restart the first call is served from the on-disk cache while the live
+    copy is fetched in the background (see sheet_cache.load_tabs)
+    """
+    frames = {sheet_name: pd.DataFrame() for sheet_name, _ in ranges}
+    sheet_names = ', '.join(sheet_name for sheet_name, _ in ranges)
+    notices = []
+    
     try:
-        # Check if secrets exist
-        if "gcp_service_account" not in st.secrets:
-            st.error("❌ Missing Google Cloud credentials in Streamlit secrets")
-            return pd.DataFrame()
-        
-        # Load credentials from Streamlit secrets
-        creds_dict = dict(st.secrets["gcp_service_account"])
-        
-        # Create credentials
-        creds = service_account.Credentials.from_service_account_info(
-            creds_dict, scopes=SCOPES
-        )
-        
-        # Build service
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
+        if not sheets_client.has_credentials():
+            notices.append(('main', 'error', "❌ Missing Google Cloud credentials in Streamlit secrets"))
+            return frames, notices
         
-        # Fetch data
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range=f"{sheet_name}!{range_name}"
-        ).execute()
+        frames.update(sheet_cache.load_tabs(ranges, on_refresh=lambda: cache_manager.invalidate_ranges(ranges)))
         
-        values = result.get('values', [])
+        # Data version for the cached processing step (see raw_data_version)
+        for df in frames.values():
+            df.attrs['content_hash'] = sheet_cache.frame_hash(df)
         
-        if not values:
-            st.warning(f"⚠️ No data found in {sheet_name}!{range_name}")
-            return pd.DataFrame()
+        for sheet_name, range_name in ranges:
+            if len(frames[sheet_name].columns) == 0:
+                notices.append(('main', 'warning', f"⚠️ No data found in {sheet_name}!{range_name}"))
         
-        # Handle mismatched column counts - pad shorter rows with empty strings
-        if len(values) > 1:
-            max_cols = max(len(row) for row in values)
-            for row in values:
-                while len(row) < max_cols:
-                    row.append('')
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(values[1:], columns=values[0])
-        
-        return df
+        return frames, notices
         
     except Exception as e:
-        error_msg = str(e)
-        st.error(f"❌ Error loading data from {sheet_name}: {error_msg}")
-        
-        # Provide specific troubleshooting based on error type
-        if "403" in error_msg or "permission" in error_msg.lower():
-            st.warning("""
-            **Permission Error:**
-            - Make sure you've shared the Google Sheet with your service account email
-            - The service account email looks like: `your-service-account@project.iam.gserviceaccount.com`
-            - Share the sheet with 'Viewer' access
-            """)
-        elif "404" in error_msg or "not found" in error_msg.lower():
-            st.warning("""
-            **Sheet Not Found:**
-            - Check that the spreadsheet ID is correct
-            - Check that the sheet name matches exactly (case-sensitive)
-            - Current spreadsheet ID: `12s-BanWrT_N8SuB3IXFp5JF-xPYB2I-YjmYAYaWsxJk`
-            """)
-        elif "401" in error_msg or "authentication" in error_msg.lower():
-            st.warning("""
-            **Authentication Error:**
-            - Your service account credentials may be invalid
-            - Try regenerating the service account key in Google Cloud Console
-            """)
-        
-        return pd.DataFrame()
+        return frames, notices + sheets_error_notices(sheet_names, e)
+
+def on_main_tabs_changed(changed_tabs):
+    """
+    Background refresher callback (sheet_cache.start_background_refresher)
+    Invalidates the changed tabs and rebuilds the main batch and the processed datasets
+    (process_all_data) on the refresher thread, so the next page load is served from
+    memory instead of waiting on Google or the cleaning pass.
+    There is no script run on this thread, so messages are logged instead of rendered.
+    """
+    cache_manager.invalidate_tabs(changed_tabs)
+    shared, notices = load_google_sheets_batch_shared(
+        MAIN_SHEET_RANGES, version=CACHE_VERSION,
+        generation=cache_manager.generation(MAIN_SHEET_RANGES)
+    )
+    log_load_notices(notices)
+    raw_sheets = {sheet_name: df.copy(deep=False) for sheet_name, df in shared.items()}
+    *_, notices = process_all_data(raw_data_version(raw_sheets), raw_sheets)
+    log_load_notices(notices)
 
 # ========== SPILLOVER COLUMN HELPER FUNCTIONS ==========
 # These functions handle both old ('Q1 2026 Spillover') and new ('Q2 2026 Spillover') column names
@@ -830,82 +872,127 @@ def is_q1_deal(df, spillover_col):
         # Old column 'Q1 2026 Spillover': for Q1 dashboard, all deals are primary quarter
         return pd.Series([True] * len(df), index=df.index)
 
-def apply_q1_fulfillment_logic(deals_df):
+# Lead time (business days from close to ship) by HubSpot Product Type - based on your image
+LEAD_TIME_DAYS = {
+    'Labeled - Labels In Stock': 10,
+    'Outer Boxes': 20,
+    'Non-Labeled - 1 Week Lead Time': 5,
+    'Non-Labeled - 2 Week Lead Time': 10,
+    'Labeled - Print & Apply': 20,
+    'Non-Labeled - Custom Lead Time': 30,
+    'Labeled with FEP - Print & Apply': 35,
+    'Labeled - Custom Lead Time': 40,
+    'Flexpack': 25,
+    'Labels Only - Direct to Customer': 15,
+    'Labels Only - For Inventory': 15,
+    'Labeled with FEP - Labels In Stock': 25,
+    'Labels Only (deprecated)': 15
+}
+
+def fulfillment_cutoffs(product_types, period_end):
     """
-    Apply lead time logic to filter out deals that close late in Q1 2026
-    but won't ship until Q2 based on product type
+    Last close date that still ships by period_end, per deal: period_end minus the product
+    type's lead time in business days (NaT for types without a lead time).
+    period_end is one date or one per deal, so several quarters can be evaluated at once.
+    """
+    lead_days = np.asarray(pd.Series(product_types).astype(object).map(LEAD_TIME_DAYS), dtype=float)
+    has_lead = ~np.isnan(lead_days)
+    period_end = pd.to_datetime(period_end)
+    if np.ndim(period_end):
+        period_end = np.asarray(period_end)[has_lead]
+    
+    cutoffs = np.full(lead_days.shape, np.datetime64('NaT'), dtype='datetime64[ns]')
+    if has_lead.any():
+        cutoffs[has_lead] = business_calendar.business_days_before(period_end, lead_days[has_lead].astype(int))
+    return cutoffs
+
+def apply_q1_fulfillment_logic(deals_df, period_end=fiscal_periods.CURRENT_QUARTER.end):
+    """
+    Apply lead time logic to filter out deals that close late in the quarter ending
+    period_end (Q1 2026 by default) but won't ship until the next one based on product type
     """
-    # Lead time mapping based on your image
-    lead_time_map = {
-        'Labeled - Labels In Stock': 10,
-        'Outer Boxes': 20,
-        'Non-Labeled - 1 Week Lead Time': 5,
-        'Non-Labeled - 2 Week Lead Time': 10,
-        'Labeled - Print & Apply': 20,
-        'Non-Labeled - Custom Lead Time': 30,
-        'Labeled with FEP - Print & Apply': 35,
-        'Labeled - Custom Lead Time': 40,
-        'Flexpack': 25,
-        'Labels Only - Direct to Customer': 15,
-        'Labels Only - For Inventory': 15,
-        'Labeled with FEP - Labels In Stock': 25,
-        'Labels Only (deprecated)': 15
-    }
-    
-    # Calculate cutoff date for each product type
-    q1_end = pd.Timestamp('2026-03-31')
-    
-    def get_business_days_before(end_date, business_days):
-        """Calculate date that is N business days before end_date"""
-        current = end_date
-        days_counted = 0
-        
-        while days_counted < business_days:
-            current -= timedelta(days=1)
-            # Skip weekends (Monday=0, Sunday=6)
-            if current.weekday() < 5:
-                days_counted += 1
-        
-        return current
-    
     # Add a column to track if deal counts for Q1
     deals_df['Counts_In_Q1'] = True
     deals_df['Q2_Spillover_Amount'] = 0
     
     # Check if we have a Product Type column
     if 'Product Type' in deals_df.columns:
-        for product_type, lead_days in lead_time_map.items():
-            cutoff_date = get_business_days_before(q1_end, lead_days)
-            
-            # Mark deals closing after cutoff as Q2
-            mask = (
-                (deals_df['Product Type'] == product_type) & 
-                (deals_df['Close Date'] > cutoff_date) &
-                (deals_df['Close Date'].notna())
-            )
-            deals_df.loc[mask, 'Counts_In_Q1'] = False
-            deals_df.loc[mask, 'Q2_Spillover_Amount'] = deals_df.loc[mask, 'Amount']
-            
-        # Log how many deals were excluded
-        excluded_count = (~deals_df['Counts_In_Q1']).sum()
-        excluded_value = deals_df[~deals_df['Counts_In_Q1']]['Amount'].sum()
+        # One cutoff per deal (NaT when the product type has no lead time) and one comparison -
+        # deals closing after their cutoff ship next quarter
+        cutoffs = fulfillment_cutoffs(deals_df['Product Type'], period_end)
+        late = deals_df['Close Date'].to_numpy(dtype='datetime64[ns]') > cutoffs
         
-        if excluded_count > 0:
-            pass  # Debug info removed
-            #st.sidebar.info(f"📊 {excluded_count} deals (${excluded_value:,.0f}) deferred to Q2 2026 due to lead times")
+        deals_df['Counts_In_Q1'] = ~late
+        deals_df['Q2_Spillover_Amount'] = deals_df['Amount'].where(late, 0)
     else:
         pass  # Debug info removed
         #st.sidebar.warning("⚠️ No 'Product Type' column found - lead time logic not applied")
     
     return deals_df
 
-def load_all_data():
-    """Load all necessary data from Google Sheets"""
+def load_all_data(raw_sheets=None):
+    """
+    Load all necessary data from Google Sheets
+    
+    raw_sheets: optional dict of already-fetched tabs (from load_google_sheets_batch)
+    so callers that need extra tabs can fetch everything in one request
+    
+    The processing itself is cached per raw-data version (process_all_data), so widget
+    interactions only pay for rendering - not for the whole cleaning pass
+    """
     
     #st.sidebar.info("🔄 Loading data from Google Sheets...")
     
+    # Fetch all four tabs in one batched request (see MAIN_SHEET_RANGES)
+    if raw_sheets is None:
+        raw_sheets = load_google_sheets_batch(
+            MAIN_SHEET_RANGES, version=CACHE_VERSION,
+            generation=cache_manager.generation(MAIN_SHEET_RANGES)
+        )
+    
+    *datasets, notices = process_all_data(raw_data_version(raw_sheets), raw_sheets)
+    show_load_notices(notices)
+    # Shallow copy-on-write views of the shared frames - one physical copy for all sessions
+    return tuple(df.copy(deep=False) for df in datasets)
+
+def raw_data_version(raw_sheets):
+    """
+    Version key for process_all_data: content hash of each main tab
+    (stamped on the frames by load_google_sheets_batch, computed here otherwise)
+    plus today's date, since ages and quarter windows are computed relative to today
+    """
+    version = [CACHE_VERSION, get_mst_time().date().isoformat()]
+    for sheet_name, _ in MAIN_SHEET_RANGES:
+        df = raw_sheets.get(sheet_name, pd.DataFrame())
+        version.append(df.attrs.get('content_hash') or sheet_cache.frame_hash(df))
+    return tuple(version)
+
+def show_load_notices(notices):
+    """Render the messages collected while processing (kept out of the cached step)"""
+    for area, kind, text in notices:
+        container = st.sidebar if area == 'sidebar' else st
+        getattr(container, kind)(text)
+
+def log_load_notices(notices):
+    """show_load_notices for code running outside a script run (background refresher)"""
+    for _, kind, text in notices:
+        logger.log(logging.ERROR if kind == 'error' else logging.WARNING, text.strip())
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def process_all_data(data_version, _raw_sheets):
+    """
+    Clean, filter and enrich the main tabs - the body of load_all_data
+    Cached once per process by data_version (raw_data_version); _raw_sheets is not hashed.
+    The returned frames are shared by every session - load_all_data hands out copies.
+    Returns (deals_df, dashboard_df, invoices_df, sales_orders_df, q4_push_df, notices) where
+    notices are (area, st function name, text) tuples for show_load_notices.
+    """
+    # Shallow copies so the renames/cleaning below never write into the caller's frames
+    raw_sheets = {sheet_name: df.copy(deep=False) for sheet_name, df in _raw_sheets.items()}
+    notices = []
+    
     # Load deals data - extend range to include Q2 2026 Spillover column
-    deals_df = load_google_sheets_data("All Reps All Pipelines", "A:R", version=CACHE_VERSION)
+    deals_df = raw_sheets.get("All Reps All Pipelines", pd.DataFrame())
     
     # DEBUG: Show what we got from HubSpot
     if not deals_df.empty:
@@ -918,13 +1005,13 @@ def load_all_data():
         pass
     
     # Load dashboard info (rep quotas and orders)
-    dashboard_df = load_google_sheets_data("Dashboard Info", "A:C", version=CACHE_VERSION)
+    dashboard_df = raw_sheets.get("Dashboard Info", pd.DataFrame())
     
     # Load invoice data from NetSuite - EXTEND to include Columns T:U (Corrected Customer Name, Rep Master)
-    invoices_df = load_google_sheets_data("NS Invoices", "A:U", version=CACHE_VERSION)
+    invoices_df = raw_sheets.get("NS Invoices", pd.DataFrame())
     
     # Load sales orders data from NetSuite - EXTEND to include Columns through AF (Calyx | External Order, Pending Approval Date, Corrected Customer Name, Rep Master)
-    sales_orders_df = load_google_sheets_data("NS Sales Orders", "A:AF", version=CACHE_VERSION)
+    sales_orders_df = raw_sheets.get("NS Sales Orders", pd.DataFrame())
     
     # Q4 Push planning status removed for Q1 dashboard
     q4_push_df = pd.DataFrame()  # Empty placeholder for compatibility
@@ -1003,24 +1090,15 @@ def load_all_data():
                 #st.sidebar.error(f"❌ Missing required columns: {missing_cols}")
             
             # Clean and convert amount to numeric
-            def clean_numeric(value):
-                if pd.isna(value) or str(value).strip() == '':
-                    return 0
-                cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-                try:
-                    return float(cleaned)
-                except:
-                    return 0
-            
             if 'Amount' in deals_df.columns:
-                deals_df['Amount'] = deals_df['Amount'].apply(clean_numeric)
+                deals_df['Amount'] = parse_numeric(deals_df['Amount'])
             else:
                 pass  # Debug info removed
                 #st.sidebar.error("❌ No Amount column found!")
             
             # Convert close date to datetime
             if 'Close Date' in deals_df.columns:
-                deals_df['Close Date'] = pd.to_datetime(deals_df['Close Date'], errors='coerce')
+                deals_df['Close Date'] = parse_sheet_dates(deals_df['Close Date'])
                 
                 # Debug: Show date range in the data
                 valid_dates = deals_df['Close Date'].dropna()
@@ -1028,15 +1106,6 @@ def load_all_data():
                     min_date = valid_dates.min()
                     max_date = valid_dates.max()
                     #st.sidebar.info(f"📅 Date range in data: {min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}")
-                    
-                    # Count deals in each quarter
-                    q4_2024_count = len(deals_df[(deals_df['Close Date'] >= '2024-10-01') & (deals_df['Close Date'] <= '2024-12-31')])
-                    q1_2025_count = len(deals_df[(deals_df['Close Date'] >= '2025-01-01') & (deals_df['Close Date'] <= '2025-03-31')])
-                    q2_2025_count = len(deals_df[(deals_df['Close Date'] >= '2025-04-01') & (deals_df['Close Date'] <= '2025-06-30')])
-                    q3_2025_count = len(deals_df[(deals_df['Close Date'] >= '2025-07-01') & (deals_df['Close Date'] <= '2025-09-30')])
-                    q4_2025_count = len(deals_df[(deals_df['Close Date'] >= '2025-10-01') & (deals_df['Close Date'] <= '2025-12-31')])
-                    
-                    #st.sidebar.info(f"Q4 2024: {q4_2024_count} | Q1 2025: {q1_2025_count} | Q2 2025: {q2_2025_count} | Q3 2025: {q3_2025_count} | Q4 2025: {q4_2025_count}")
                 else:
                     pass  # Debug info removed
                     #st.sidebar.error("❌ No valid dates found in Close Date column!")
@@ -1058,34 +1127,28 @@ def load_all_data():
                 #st.sidebar.error("❌ No Status column found! Check 'Close Status' mapping")
             
             # FILTER: Only Q1 2026 deals (Jan 1 - Mar 31, 2026)
-            # Use < Apr 1, 2026 to include all of Mar 31 regardless of timestamp
-            q1_start = pd.Timestamp('2026-01-01')
-            q1_end = pd.Timestamp('2026-04-01')
-            
+            # contains() compares with < Apr 1, 2026 to include all of Mar 31 regardless of timestamp
             if 'Close Date' in deals_df.columns:
                 before_count = len(deals_df)
                 before_amount = deals_df['Amount'].sum()
                 
-                deals_df = deals_df[
-                    (deals_df['Close Date'] >= q1_start) & 
-                    (deals_df['Close Date'] < q1_end)
-                ]
+                deals_df = deals_df[fiscal_periods.CURRENT_QUARTER.contains(deals_df['Close Date'])]
                 after_count = len(deals_df)
                 after_amount = deals_df['Amount'].sum()
                 
-                st.sidebar.markdown("### 📊 HubSpot Data Loaded")
-                st.sidebar.caption(f"Total deals before Q1 filter: {before_count} (${before_amount:,.0f})")
-                st.sidebar.caption(f"Q1 2026 deals: {after_count} (${after_amount:,.0f})")
-                st.sidebar.caption(f"Filtered out: {before_count - after_count} deals")
+                notices.append(('sidebar', 'markdown', "### 📊 HubSpot Data Loaded"))
+                notices.append(('sidebar', 'caption', f"Total deals before Q1 filter: {before_count} (${before_amount:,.0f})"))
+                notices.append(('sidebar', 'caption', f"Q1 2026 deals: {after_count} (${after_amount:,.0f})"))
+                notices.append(('sidebar', 'caption', f"Filtered out: {before_count - after_count} deals"))
                 
                 # Show breakdown by rep for Expect/Commit
                 if 'Deal Owner' in deals_df.columns and 'Status' in deals_df.columns:
                     expect_commit = deals_df[deals_df['Status'].isin(['Expect', 'Commit'])]
-                    st.sidebar.markdown("**Expect/Commit by Rep:**")
+                    notices.append(('sidebar', 'markdown', "**Expect/Commit by Rep:**"))
                     for rep in ['Brad Sherman', 'Jake Lynch', 'Dave Borkowski', 'Lance Mitton']:
                         rep_deals = expect_commit[expect_commit['Deal Owner'] == rep]
                         if not rep_deals.empty:
-                            st.sidebar.caption(f"{rep}: {len(rep_deals)} deals, ${rep_deals['Amount'].sum():,.0f}")
+                            notices.append(('sidebar', 'caption', f"{rep}: {len(rep_deals)} deals, ${rep_deals['Amount'].sum():,.0f}"))
 
             else:
                 pass  # Debug info removed
@@ -1130,278 +1193,93 @@ def load_all_data():
             dashboard_df = dashboard_df[dashboard_df['Rep Name'].notna() & (dashboard_df['Rep Name'] != '')]
             
             # Clean and convert numeric columns
-            def clean_numeric(value):
-                if pd.isna(value) or str(value).strip() == '':
-                    return 0
-                cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-                try:
-                    return float(cleaned)
-                except:
-                    return 0
-            
-            dashboard_df['Quota'] = dashboard_df['Quota'].apply(clean_numeric)
-            dashboard_df['NetSuite Orders'] = dashboard_df['NetSuite Orders'].apply(clean_numeric)
+            dashboard_df['Quota'] = parse_numeric(dashboard_df['Quota'])
+            dashboard_df['NetSuite Orders'] = parse_numeric(dashboard_df['NetSuite Orders'])
     
-    # Process invoice data
+    # Process invoice data (parsed once into the shared NetSuite invoice model)
+    try:
+        invoices_df = netsuite_models.get_invoices(invoices_df)
+    except sheet_schema.SchemaError as e:
+        notices.append(('main', 'error', f"❌ {e}"))
+        invoices_df = pd.DataFrame()
     if not invoices_df.empty:
-        if len(invoices_df.columns) >= 15:
-            # Map additional columns for Shopify identification
-            rename_dict = {
-                invoices_df.columns[0]: 'Invoice Number',
-                invoices_df.columns[1]: 'Status',
-                invoices_df.columns[2]: 'Date',
-                invoices_df.columns[6]: 'Customer',
-                invoices_df.columns[10]: 'Amount',
-                invoices_df.columns[14]: 'Sales Rep'
-            }
-            
-            # NEW: Map Corrected Customer Name (Column T - index 19) and Rep Master (Column U - index 20)
-            if len(invoices_df.columns) > 19:
-                rename_dict[invoices_df.columns[19]] = 'Corrected Customer Name'  # Column T
-            if len(invoices_df.columns) > 20:
-                rename_dict[invoices_df.columns[20]] = 'Rep Master'  # Column U
-            
-            # Try to find HubSpot Pipeline and CSM columns
-            for idx, col in enumerate(invoices_df.columns):
-                col_str = str(col).lower()
-                if 'hubspot' in col_str and 'pipeline' in col_str:
-                    rename_dict[col] = 'HubSpot_Pipeline'
-                elif col_str == 'csm' or 'csm' in col_str:
-                    rename_dict[col] = 'CSM'
-            
-            invoices_df = invoices_df.rename(columns=rename_dict)
-            
-            # CRITICAL: Replace Sales Rep with Rep Master and Customer with Corrected Customer Name
-            # This fixes the Shopify eCommerce invoices that weren't being applied to reps correctly
-            if 'Rep Master' in invoices_df.columns:
-                # Rep Master is the ONLY source of truth - completely replace Sales Rep
-                invoices_df['Rep Master'] = invoices_df['Rep Master'].astype(str).str.strip()
-                
-                # Define invalid values that should be filtered out
-                invalid_values = ['', 'nan', 'None', '#N/A', '#REF!', '#VALUE!', '#ERROR!']
-                
-                # FILTER OUT rows where Rep Master is invalid (including #N/A)
-                # These rows won't count toward any revenue
-                invoices_df = invoices_df[~invoices_df['Rep Master'].isin(invalid_values)]
-                
-                # Now replace Sales Rep with Rep Master for all remaining rows
-                invoices_df['Sales Rep'] = invoices_df['Rep Master']
-                # Drop the Rep Master column since we've copied it to Sales Rep
-                invoices_df = invoices_df.drop(columns=['Rep Master'])
-            else:
-                st.sidebar.warning("⚠️ Rep Master column not found in invoices!")
-            
-            if 'Corrected Customer Name' in invoices_df.columns:
-                # Corrected Customer Name takes priority - replace Customer with corrected values
-                invoices_df['Corrected Customer Name'] = invoices_df['Corrected Customer Name'].astype(str).str.strip()
-                invalid_values = ['', 'nan', 'None', '#N/A', '#REF!', '#VALUE!', '#ERROR!']
-                mask = invoices_df['Corrected Customer Name'].isin(invalid_values)
-                invoices_df.loc[~mask, 'Customer'] = invoices_df.loc[~mask, 'Corrected Customer Name']
-                # Drop the Corrected Customer Name column since we've copied it to Customer
-                invoices_df = invoices_df.drop(columns=['Corrected Customer Name'])
-            
-            def clean_numeric(value):
-                if pd.isna(value) or str(value).strip() == '':
-                    return 0
-                cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-                try:
-                    return float(cleaned)
-                except:
-                    return 0
-            
-            invoices_df['Amount'] = invoices_df['Amount'].apply(clean_numeric)
-            invoices_df['Date'] = pd.to_datetime(invoices_df['Date'], errors='coerce')
-            
-            # Filter to Q1 2026 only (1/1/2026 - 3/31/2026)
-            # This should match exactly what your boss filters in the sheet
-            q1_start = pd.Timestamp('2026-01-01')
-            q1_end = pd.Timestamp('2026-03-31')
-            
-            # Apply date filter
-            invoices_df = invoices_df[
-                (invoices_df['Date'] >= q1_start) & 
-                (invoices_df['Date'] <= q1_end)
-            ]
-            
-            # Clean up Sales Rep field
-            invoices_df['Sales Rep'] = invoices_df['Sales Rep'].astype(str).str.strip()
-            
-            # Filter out invalid Sales Reps BEFORE groupby
-            # NOTE: We DO NOT filter Amount > 0 because credit memos (negative amounts) should reduce totals
-            invoices_df = invoices_df[
-                (invoices_df['Sales Rep'].notna()) & 
-                (invoices_df['Sales Rep'] != '') &
-                (invoices_df['Sales Rep'].str.lower() != 'nan') &
-                (invoices_df['Sales Rep'].str.lower() != 'house')
-            ]
-            
-            # CRITICAL: Remove duplicate invoices if they exist (keep first occurrence)
-            if 'Invoice Number' in invoices_df.columns:
-                before_dedupe = len(invoices_df)
-                invoices_df = invoices_df.drop_duplicates(subset=['Invoice Number'], keep='first')
-                after_dedupe = len(invoices_df)
-                if before_dedupe != after_dedupe:
-                    st.sidebar.warning(f"⚠️ Removed {before_dedupe - after_dedupe} duplicate invoices!")
-            
-            # Calculate invoice totals by rep
-            invoice_totals = invoices_df.groupby('Sales Rep')['Amount'].sum().reset_index()
-            invoice_totals.columns = ['Rep Name', 'Invoice Total']
-            
-            dashboard_df['Rep Name'] = dashboard_df['Rep Name'].str.strip()
-            
-            dashboard_df = dashboard_df.merge(invoice_totals, on='Rep Name', how='left')
-            dashboard_df['Invoice Total'] = dashboard_df['Invoice Total'].fillna(0)
-            
-            dashboard_df['NetSuite Orders'] = dashboard_df['Invoice Total']
-            dashboard_df = dashboard_df.drop('Invoice Total', axis=1)
-            
-            # Add Shopify ECommerce to dashboard if it has invoices but isn't in dashboard yet
-            if 'Shopify ECommerce' in invoice_totals['Rep Name'].values:
-                if 'Shopify ECommerce' not in dashboard_df['Rep Name'].values:
-                    shopify_total = invoice_totals[invoice_totals['Rep Name'] == 'Shopify ECommerce']['Invoice Total'].iloc[0]
-                    new_shopify_row = pd.DataFrame([{
-                        'Rep Name': 'Shopify ECommerce',
-                        'Quota': 0,
-                        'NetSuite Orders': shopify_total
-                    }])
-                    dashboard_df = pd.concat([dashboard_df, new_shopify_row], ignore_index=True)
-    
-    # Process sales orders data with NEW LOGIC
-    if not sales_orders_df.empty:
-        # Map column positions
-        col_names = sales_orders_df.columns.tolist()
-        
-        rename_dict = {}
-        
-        # NEW: Map Internal Id column (Column A) - CRITICAL for NetSuite links
-        if len(col_names) > 0:
-            col_a_lower = str(col_names[0]).lower()
-            if 'internal' in col_a_lower and 'id' in col_a_lower:
-                rename_dict[col_names[0]] = 'Internal ID'
-        
-        # Find standard columns - only map FIRST occurrence
-        for idx, col in enumerate(col_names):
-            col_lower = str(col).lower()
-            if 'status' in col_lower and 'Status' not in rename_dict.values():
-                rename_dict[col] = 'Status'
-            elif ('amount' in col_lower or 'total' in col_lower) and 'Amount' not in rename_dict.values():
-                rename_dict[col] = 'Amount'
-            elif ('sales rep' in col_lower or 'salesrep' in col_lower) and 'Sales Rep' not in rename_dict.values():
-                rename_dict[col] = 'Sales Rep'
-            elif 'customer' in col_lower and 'customer promise' not in col_lower and 'Customer' not in rename_dict.values():
-                rename_dict[col] = 'Customer'
-            elif ('doc' in col_lower or 'document' in col_lower) and 'Document Number' not in rename_dict.values():
-                rename_dict[col] = 'Document Number'
-        
-        # Map specific columns by position (0-indexed) - be more careful
-        if len(col_names) > 8 and 'Order Start Date' not in rename_dict.values():
-            rename_dict[col_names[8]] = 'Order Start Date'  # Column I
-        if len(col_names) > 11 and 'Customer Promise Date' not in rename_dict.values():
-            rename_dict[col_names[11]] = 'Customer Promise Date'  # Column L
-        if len(col_names) > 12 and 'Projected Date' not in rename_dict.values():
-            rename_dict[col_names[12]] = 'Projected Date'  # Column M
-        
-        # NEW COLUMN POSITIONS after adding Calyx | External Order in column AC
-        if len(col_names) > 28:
-            rename_dict[col_names[28]] = 'Calyx External Order'  # Column AC - NEW!
-        if len(col_names) > 29 and 'Pending Approval Date' not in rename_dict.values():
-            rename_dict[col_names[29]] = 'Pending Approval Date'  # Column AD (was AB)
-        if len(col_names) > 30:
-            rename_dict[col_names[30]] = 'Corrected Customer Name'  # Column AE (was AC)
-        if len(col_names) > 31:
-            rename_dict[col_names[31]] = 'Rep Master'  # Column AF (was AD)
-        
-        # NEW: Map PI || CSM column (Column G based on screenshot)
-        for idx, col in enumerate(col_names):
-            col_str = str(col).lower()
-            if ('pi' in col_str and 'csm' in col_str) or col_str == 'pi || csm':
-                rename_dict[col] = 'PI_CSM'
-                break
-        
-        sales_orders_df = sales_orders_df.rename(columns=rename_dict)
-        
-        # CRITICAL: Replace Sales Rep with Rep Master and Customer with Corrected Customer Name
-        # This fixes the Shopify eCommerce orders that weren't being applied to reps correctly
-        if 'Rep Master' in sales_orders_df.columns:
-            # Rep Master is the ONLY source of truth - completely replace Sales Rep
-            sales_orders_df['Rep Master'] = sales_orders_df['Rep Master'].astype(str).str.strip()
-            
-            # Define invalid values that should be filtered out
-            invalid_values = ['', 'nan', 'None', '#N/A', '#REF!', '#VALUE!', '#ERROR!']
-            
+        # CRITICAL: Sales Rep comes from Rep Master and Customer from Corrected Customer Name
+        # This fixes the Shopify eCommerce invoices that weren't being applied to reps correctly
+        if 'Rep Master' in invoices_df.columns:
             # FILTER OUT rows where Rep Master is invalid (including #N/A)
             # These rows won't count toward any revenue
-            sales_orders_df = sales_orders_df[~sales_orders_df['Rep Master'].isin(invalid_values)]
-            
-            # Now replace Sales Rep with Rep Master for all remaining rows
-            sales_orders_df['Sales Rep'] = sales_orders_df['Rep Master']
-            # Drop the Rep Master column since we've copied it to Sales Rep
-            sales_orders_df = sales_orders_df.drop(columns=['Rep Master'])
-        
-        if 'Corrected Customer Name' in sales_orders_df.columns:
-            # Corrected Customer Name takes priority - replace Customer with corrected values
-            sales_orders_df['Customer'] = sales_orders_df['Corrected Customer Name']
-            # Drop the Corrected Customer Name column since we've copied it to Customer
-            sales_orders_df = sales_orders_df.drop(columns=['Corrected Customer Name'])
-        
-        # CRITICAL: Remove any duplicate columns that may have been created
-        if sales_orders_df.columns.duplicated().any():
-            pass  # Debug info removed
-            #st.sidebar.warning(f"⚠️ Removed duplicate columns in Sales Orders: {sales_orders_df.columns[sales_orders_df.columns.duplicated()].tolist()}")
-            sales_orders_df = sales_orders_df.loc[:, ~sales_orders_df.columns.duplicated()]
-        
-        # Clean numeric values
-        def clean_numeric_so(value):
-            value_str = str(value).strip()
-            if value_str == '' or value_str == 'nan' or value_str == 'None':
-                return 0
-            cleaned = value_str.replace(',', '').replace('$', '').replace(' ', '')
-            try:
-                return float(cleaned)
-            except:
-                return 0
-        
-        if 'Amount' in sales_orders_df.columns:
-            sales_orders_df['Amount'] = sales_orders_df['Amount'].apply(clean_numeric_so)
-        
-        if 'Sales Rep' in sales_orders_df.columns:
-            sales_orders_df['Sales Rep'] = sales_orders_df['Sales Rep'].astype(str).str.strip()
-        
-        if 'Status' in sales_orders_df.columns:
-            sales_orders_df['Status'] = sales_orders_df['Status'].astype(str).str.strip()
-        
-        # Convert date columns - handle 2-digit years correctly (26 = 2026, not 1926)
-        date_columns = ['Order Start Date', 'Customer Promise Date', 'Projected Date', 'Pending Approval Date']
-        for col in date_columns:
-            if col in sales_orders_df.columns:
-                # First try standard parsing
-                sales_orders_df[col] = pd.to_datetime(sales_orders_df[col], errors='coerce')
-                
-                # Fix any dates that got parsed as 1900s (2-digit year issue)
-                # If year < 2000, add 100 years (e.g., 1926 -> 2026)
-                if sales_orders_df[col].notna().any():
-                    mask = (sales_orders_df[col].dt.year < 2000) & (sales_orders_df[col].notna())
-                    if mask.any():
-                        sales_orders_df.loc[mask, col] = sales_orders_df.loc[mask, col] + pd.DateOffset(years=100)
+            invoices_df = invoices_df[netsuite_models.has_valid_rep_master(invoices_df)]
+        else:
+            notices.append(('sidebar', 'warning', "⚠️ Rep Master column not found in invoices!"))
+        
+        # Rep Master / Corrected Customer Name already live in Sales Rep / Customer
+        invoices_df = invoices_df.drop(columns=[
+            col for col in ['Original Sales Rep', 'Rep Master', 'Corrected Customer Name'] if col in invoices_df.columns
+        ])
+        
+        # Filter to Q1 2026 only (1/1/2026 - 3/31/2026)
+        # This should match exactly what your boss filters in the sheet
+        invoices_df = invoices_df[fiscal_periods.CURRENT_QUARTER.contains(invoices_df['Date'])]
+        
+        # Filter out invalid Sales Reps BEFORE groupby
+        # NOTE: We DO NOT filter Amount > 0 because credit memos (negative amounts) should reduce totals
+        invoices_df = invoices_df[
+            (invoices_df['Sales Rep'].notna()) & 
+            (invoices_df['Sales Rep'] != '') &
+            (invoices_df['Sales Rep'].str.lower() != 'nan') &
+            (invoices_df['Sales Rep'].str.lower() != 'house')
+        ]
         
-        # Filter to include Pending Approval, Pending Fulfillment, AND Pending Billing/Partially Fulfilled
+        # CRITICAL: Remove duplicate invoices if they exist (keep first occurrence)
+        before_dedupe = len(invoices_df)
+        invoices_df = invoices_df.drop_duplicates(subset=['Invoice Number'], keep='first')
+        after_dedupe = len(invoices_df)
+        if before_dedupe != after_dedupe:
+            notices.append(('sidebar', 'warning', f"⚠️ Removed {before_dedupe - after_dedupe} duplicate invoices!"))
+        
+        # Calculate invoice totals by rep
+        invoice_totals = invoices_df.groupby('Sales Rep')['Amount'].sum().reset_index()
+        invoice_totals.columns = ['Rep Name', 'Invoice Total']
+        
+        dashboard_df['Rep Name'] = dashboard_df['Rep Name'].str.strip()
+        
+        dashboard_df = dashboard_df.merge(invoice_totals, on='Rep Name', how='left')
+        dashboard_df['Invoice Total'] = dashboard_df['Invoice Total'].fillna(0)
+        
+        dashboard_df['NetSuite Orders'] = dashboard_df['Invoice Total']
+        dashboard_df = dashboard_df.drop('Invoice Total', axis=1)
+        
+        # Add Shopify ECommerce to dashboard if it has invoices but isn't in dashboard yet
+        if 'Shopify ECommerce' in invoice_totals['Rep Name'].values:
+            if 'Shopify ECommerce' not in dashboard_df['Rep Name'].values:
+                shopify_total = invoice_totals[invoice_totals['Rep Name'] == 'Shopify ECommerce']['Invoice Total'].iloc[0]
+                new_shopify_row = pd.DataFrame([{
+                    'Rep Name': 'Shopify ECommerce',
+                    'Quota': 0,
+                    'NetSuite Orders': shopify_total
+                }])
+                dashboard_df = pd.concat([dashboard_df, new_shopify_row], ignore_index=True)
+    
+    # Process sales orders data (parsed once into the shared NetSuite sales order model -
+    # Rep Master / Corrected Customer Name applied, amounts and dates typed)
+    try:
+        sales_orders_df = netsuite_models.get_sales_orders(sales_orders_df)
+    except sheet_schema.SchemaError as e:
+        notices.append(('main', 'error', f"❌ {e}"))
+        sales_orders_df = pd.DataFrame()
+    if not sales_orders_df.empty:
+        # The model keeps every status for the forecast's history - the dashboard only needs
+        # Pending Approval, Pending Fulfillment AND Pending Billing/Partially Fulfilled
         if 'Status' in sales_orders_df.columns:
             sales_orders_df = sales_orders_df[
-                sales_orders_df['Status'].isin(['Pending Approval', 'Pending Fulfillment', 'Pending Billing/Partially Fulfilled'])
+                sales_orders_df['Status'].isin(netsuite_models.OPEN_SO_STATUSES)
             ]
         
-        # Calculate age for Old Pending Approval
+        # Calculate age for Old Pending Approval - one np.busday_count over the whole column
+        # (weekends and company holidays excluded, see business_calendar)
         if 'Order Start Date' in sales_orders_df.columns:
-            today = pd.Timestamp.now()
-            
-            def business_days_between(start_date, end_date):
-                if pd.isna(start_date):
-                    return 0
-                days = pd.bdate_range(start=start_date, end=end_date).size - 1
-                return max(0, days)
-            
-            sales_orders_df['Age_Business_Days'] = sales_orders_df['Order Start Date'].apply(
-                lambda x: business_days_between(x, today)
+            sales_orders_df['Age_Business_Days'] = business_calendar.business_days_between(
+                sales_orders_df['Order Start Date'], pd.Timestamp.now()
             )
         else:
             sales_orders_df['Age_Business_Days'] = 0
@@ -1416,10 +1294,24 @@ def load_all_data():
                 (~sales_orders_df['Sales Rep'].str.lower().isin(['house']))
             ]
     else:
-        st.warning("Could not find required columns in NS Sales Orders")
+        notices.append(('main', 'warning', "Could not find required columns in NS Sales Orders"))
         sales_orders_df = pd.DataFrame()
     
-    return deals_df, dashboard_df, invoices_df, sales_orders_df, q4_push_df
+    # Repeated labels as category dtype - the per-rep filters (Deal Owner == rep, Status.isin)
+    # then compare integer codes
+    deals_df = to_categories(deals_df, CATEGORY_COLUMNS)
+    invoices_df = to_categories(invoices_df, CATEGORY_COLUMNS)
+    sales_orders_df = to_categories(sales_orders_df, CATEGORY_COLUMNS)
+    
+    # Forecast buckets once per data version - per-rep categorization is then only a filter
+    sales_orders_df = tag_sales_orders(sales_orders_df)
+    
+    # Row positions of every rep, once per data version - rep views take() their rows
+    deals_df = rep_partitions.partition(deals_df, 'Deal Owner')
+    invoices_df = rep_partitions.partition(invoices_df, 'Sales Rep')
+    sales_orders_df = rep_partitions.partition(sales_orders_df, 'Sales Rep')
+    
+    return deals_df, dashboard_df, invoices_df, sales_orders_df, q4_push_df, notices
 
 def store_snapshot(deals_df, dashboard_df, invoices_df, sales_orders_df, q4_push_df=None):
     """
@@ -1427,10 +1319,11 @@ def store_snapshot(deals_df, dashboard_df, invoices_df, sales_orders_df, q4_push
     """
     snapshot = {
         'timestamp': datetime.now(),
-        'deals': deals_df.copy() if not deals_df.empty else pd.DataFrame(),
-        'dashboard': dashboard_df.copy() if not dashboard_df.empty else pd.DataFrame(),
-        'invoices': invoices_df.copy() if not invoices_df.empty else pd.DataFrame(),
-        'sales_orders': sales_orders_df.copy() if not sales_orders_df.empty else pd.DataFrame()
+        # Shallow copy-on-write copies - the data itself is shared with the cached datasets
+        'deals': deals_df.copy(deep=False) if not deals_df.empty else pd.DataFrame(),
+        'dashboard': dashboard_df.copy(deep=False) if not dashboard_df.empty else pd.DataFrame(),
+        'invoices': invoices_df.copy(deep=False) if not invoices_df.empty else pd.DataFrame(),
+        'sales_orders': sales_orders_df.copy(deep=False) if not sales_orders_df.empty else pd.DataFrame()
     }
     
     # Store in session state
@@ -1598,23 +1491,18 @@ def create_dod_audit_section(deals_df, dashboard_df, invoices_df, sales_orders_d
             so_df['Amount_Numeric'] = pd.to_numeric(so_df.get('Amount', 0), errors='coerce')
             
             # Q1 2026 date range for filtering
-            q1_start = pd.Timestamp('2026-01-01')
-            q1_end = pd.Timestamp('2026-03-31')
+            q1_start, q1_end = fiscal_periods.CURRENT_QUARTER.window
             
             # Parse dates
             if 'Estimated Ship Date' in so_df.columns:
-                so_df['Ship_Date_Parsed'] = pd.to_datetime(so_df['Estimated Ship Date'], errors='coerce')
+                so_df['Ship_Date_Parsed'] = parse_sheet_dates(so_df['Estimated Ship Date'])
             else:
                 so_df['Ship_Date_Parsed'] = pd.NaT
             
             # Parse Pending Approval Date for PA filtering
             if 'Pending Approval Date' in so_df.columns:
-                so_df['PA_Date_Parsed'] = pd.to_datetime(so_df['Pending Approval Date'], errors='coerce')
-                # Fix any dates that got parsed as 1900s (2-digit year issue: 26 -> 1926 instead of 2026)
-                if so_df['PA_Date_Parsed'].notna().any():
-                    mask_1900s = (so_df['PA_Date_Parsed'].dt.year < 2000) & (so_df['PA_Date_Parsed'].notna())
-                    if mask_1900s.any():
-                        so_df.loc[mask_1900s, 'PA_Date_Parsed'] = so_df.loc[mask_1900s, 'PA_Date_Parsed'] + pd.DateOffset(years=100)
+                # Already parsed and century-corrected in load_all_data - no re-parse
+                so_df['PA_Date_Parsed'] = parse_sheet_dates(so_df['Pending Approval Date'], fix_century=True)
             else:
                 so_df['PA_Date_Parsed'] = pd.NaT
             
@@ -1640,7 +1528,7 @@ def create_dod_audit_section(deals_df, dashboard_df, invoices_df, sales_orders_d
             
             # Pending Approval > 2 weeks old
             if 'Transaction Date' in so_df.columns:
-                so_df['Transaction_Date_Parsed'] = pd.to_datetime(so_df['Transaction Date'], errors='coerce')
+                so_df['Transaction_Date_Parsed'] = parse_sheet_dates(so_df['Transaction Date'])
                 two_weeks_ago = datetime.now() - timedelta(days=14)
                 old_pa = pa_df[pa_df['Transaction_Date_Parsed'] < two_weeks_ago]
                 metrics['pending_approval_old'] = old_pa['Amount_Numeric'].sum()
@@ -1907,7 +1795,7 @@ def display_invoices_drill_down(invoices_df, rep_name=None):
     
     # Filter by rep if specified
     if rep_name and 'Sales Rep' in invoices_df.columns:
-        filtered_invoices = invoices_df[invoices_df['Sales Rep'] == rep_name].copy()
+        filtered_invoices = rep_partitions.rep_rows(invoices_df, 'Sales Rep', rep_name)
     else:
         filtered_invoices = invoices_df.copy()
     
@@ -2105,24 +1993,19 @@ def build_your_own_forecast_section(metrics, quota, rep_name=None, deals_df=None
         # Filter for Rep
         if rep_name:
             if 'Sales Rep' in sales_orders_df.columns:
-                so_data = sales_orders_df[sales_orders_df['Sales Rep'] == rep_name].copy()
+                so_data = rep_partitions.rep_rows(sales_orders_df, 'Sales Rep', rep_name)
             else:
                 so_data = sales_orders_df.copy() 
         else:
             so_data = sales_orders_df.copy()
             
-        # --- GRAB RAW COLUMNS BY INDEX ---
-        so_data['Display_SO_Num'] = get_col_by_index(so_data, 1)        # Col B: SO#
-        so_data['Display_PF_Date'] = pd.to_datetime(get_col_by_index(so_data, 9), errors='coerce') # Col J: PF Date
-        so_data['Display_Promise_Date'] = pd.to_datetime(get_col_by_index(so_data, 11), errors='coerce') # Col L
-        so_data['Display_Projected_Date'] = pd.to_datetime(get_col_by_index(so_data, 12), errors='coerce') # Col M
-        so_data['Display_Type'] = get_col_by_index(so_data, 17).fillna('Standard') # Col R: Order Type
-        
-        # Use renamed column if available, otherwise try by index
-        if 'Pending Approval Date' in so_data.columns:
-            so_data['Display_PA_Date'] = pd.to_datetime(so_data['Pending Approval Date'], errors='coerce')
-        else:
-            so_data['Display_PA_Date'] = pd.to_datetime(get_col_by_index(so_data, 29), errors='coerce') # Col AD: PA Date
+        # --- NAMED COLUMNS (NS Sales Orders schema, dates already parsed) ---
+        so_data['Display_SO_Num'] = sheet_schema.column(so_data, 'Document Number')        # Col B: SO#
+        so_data['Display_PF_Date'] = parse_sheet_dates(sheet_schema.column(so_data, 'Pending Fulfillment Date')) # Col J
+        so_data['Display_Promise_Date'] = parse_sheet_dates(sheet_schema.column(so_data, 'Customer Promise Date')) # Col L
+        so_data['Display_Projected_Date'] = parse_sheet_dates(sheet_schema.column(so_data, 'Projected Date')) # Col M
+        so_data['Display_Type'] = sheet_schema.column(so_data, 'Order Type').astype(object).fillna('Standard') # Col R: Order Type
+        so_data['Display_PA_Date'] = parse_sheet_dates(sheet_schema.column(so_data, 'Pending Approval Date')) # Col AD
 
         if 'Amount' in so_data.columns:
             so_data['Amount_Numeric'] = pd.to_numeric(so_data['Amount'], errors='coerce').fillna(0)
@@ -2134,19 +2017,19 @@ def build_your_own_forecast_section(metrics, quota, rep_name=None, deals_df=None
     # Prepare HubSpot Data
     if deals_df is not None and not deals_df.empty:
         if rep_name:
-            hs_data = deals_df[deals_df['Deal Owner'] == rep_name].copy()
+            hs_data = rep_partitions.rep_rows(deals_df, 'Deal Owner', rep_name)
         else:
             hs_data = deals_df.copy()
             
         # Map Deal Type (Column N - Index 13)
-        hs_data['Display_Type'] = get_col_by_index(hs_data, 13).fillna('Standard')
+        hs_data['Display_Type'] = get_col_by_index(hs_data, 13).astype(object).fillna('Standard')
         
         # Get Pending Approval Date from Column P (index 15)
         if 'Pending Approval Date' in hs_data.columns:
-            hs_data['Display_PA_Date'] = pd.to_datetime(hs_data['Pending Approval Date'], errors='coerce')
+            hs_data['Display_PA_Date'] = parse_sheet_dates(hs_data['Pending Approval Date'])
         else:
             # Fallback to column index 15 (Column P)
-            hs_data['Display_PA_Date'] = pd.to_datetime(get_col_by_index(hs_data, 15), errors='coerce')
+            hs_data['Display_PA_Date'] = parse_sheet_dates(get_col_by_index(hs_data, 15))
 
         if 'Amount' in hs_data.columns:
             hs_data['Amount_Numeric'] = pd.to_numeric(hs_data['Amount'], errors='coerce').fillna(0)
@@ -2820,20 +2703,8 @@ def build_your_own_forecast_section(metrics, quota, rep_name=None, deals_df=None
         st.plotly_chart(fig, use_container_width=True)
         
     with c2:
-        # Helper locally if needed
-        def calculate_biz_days():
-             from datetime import date, timedelta
-             today = date.today()
-             q4_end = date(2025, 12, 31)
-             holidays = [date(2025, 11, 27), date(2025, 11, 28), date(2025, 12, 25), date(2025, 12, 26)]
-             days = 0
-             current = today
-             while current <= q4_end:
-                 if current.weekday() < 5 and current not in holidays: days += 1
-                 current += timedelta(days=1)
-             return days
-
-        biz_days = calculate_biz_days()
+        # Same business days left in Q1 as the sidebar
+        biz_days = calculate_business_days_remaining()
         # Calculate based on what still needs to ship (pending orders + pipeline deals)
         items_to_ship = selected_pending + selected_pipeline
         if items_to_ship > 0 and biz_days > 0:
@@ -2859,7 +2730,7 @@ def build_your_own_forecast_section(metrics, quota, rep_name=None, deals_df=None
             amount_col = 'Amount' if 'Amount' in df.columns else 'Amount_Numeric'
             
             if rep_col in df.columns and amount_col in df.columns:
-                by_rep = df.groupby(rep_col)[amount_col].sum()
+                by_rep = df.groupby(rep_col, observed=True)[amount_col].sum()
                 for rep, amt in by_rep.items():
                     if pd.notna(rep) and rep and str(rep).strip():
                         rep_bucket_summary.append({
@@ -2931,7 +2802,7 @@ def build_your_own_forecast_section(metrics, quota, rep_name=None, deals_df=None
             # Filter for rep if needed (using Sales Rep col)
             inv_source = invoices_df
             if rep_name and 'Sales Rep' in invoices_df.columns:
-                inv_source = invoices_df[invoices_df['Sales Rep'] == rep_name]
+                inv_source = rep_partitions.rep_rows(invoices_df, 'Sales Rep', rep_name)
                 
             for _, row in inv_source.iterrows():
                 export_data.append({
@@ -3071,7 +2942,7 @@ def display_hubspot_deals_audit(deals_df, rep_name=None):
     
     # Filter by rep if specified
     if rep_name and 'Deal Owner' in deals_df.columns:
-        filtered_deals = deals_df[deals_df['Deal Owner'] == rep_name].copy()
+        filtered_deals = rep_partitions.rep_rows(deals_df, 'Deal Owner', rep_name)
     else:
         filtered_deals = deals_df.copy()
     
@@ -3183,6 +3054,187 @@ def calculate_team_metrics(deals_df, dashboard_df):
     }
 
 # ========== CENTRALIZED SALES ORDER CATEGORIZATION ==========
+
+# Period windows (inclusive) the bucket rules test order dates against; None = open-ended
+# (the bucket names keep their quarter; the dates come from fiscal_periods)
+SO_PERIOD_WINDOWS = {
+    'q4_2025': fiscal_periods.PREVIOUS_QUARTER.window,  # spillover backward
+    'q1_2026': fiscal_periods.CURRENT_QUARTER.window,   # primary quarter
+    'q2_2026': fiscal_periods.NEXT_QUARTER.window,      # spillover forward
+}
+
+# Sales order forecast buckets, in the order their rules are applied (first match wins)
+SO_BUCKETS = [
+    'pf_q4_spillover', 'pf_q2_spillover', 'pf_date_ext', 'pf_date_int', 'pf_nodate_ext', 'pf_nodate_int',
+    'pa_q4_spillover', 'pa_q2_spillover', 'pa_old', 'pa_date', 'pa_nodate',
+]
+
+PF_STATUSES = ['Pending Fulfillment', 'Pending Billing/Partially Fulfilled']
+
+# PA orders at least this many business days old go to 'pa_old'
+PA_OLD_BUSINESS_DAYS = 13
+
+
+def date_window_masks(df, date_columns, windows):
+    """
+    Vectorized window test: {window name: boolean Series} where a row is True if ANY of
+    date_columns falls inside the (start, end) window. Missing columns and NaT never match.
+    """
+    date_arrays = [
+        parse_sheet_dates(df[col]).to_numpy(dtype='datetime64[ns]')
+        for col in date_columns if col in df.columns
+    ]
+    masks = {}
+    for name, (start, end) in windows.items():
+        mask = np.zeros(len(df), dtype=bool)
+        for dates in date_arrays:
+            in_window = dates >= np.datetime64(start, 'ns')
+            if end is not None:
+                in_window &= dates <= np.datetime64(end, 'ns')
+            mask |= in_window
+        masks[name] = pd.Series(mask, index=df.index)
+    return masks
+
+
+def so_bucket_labels(orders):
+    """
+    Forecast bucket of every order as one categorical Series (categories = SO_BUCKETS,
+    NaN for orders in no bucket). Needs Status; uses Customer Promise / Projected Date,
+    Calyx External Order, Pending Approval Date and Age_Business_Days when present.
+    
+    Pending Fulfillment (by Customer Promise OR Projected Date):
+    - Q4 2025 / Q2 2026 date -> spillover buckets (checked first, so never also Q1)
+    - Q1 2026 date -> pf_date_ext / pf_date_int (External Order = YES)
+    - Neither date -> pf_nodate_ext / pf_nodate_int
+    Pending Approval (by Pending Approval Date):
+    - Q4 2025 date -> pa_q4_spillover, Q2 2026 or later -> pa_q2_spillover
+    - otherwise Age >= 13 business days -> pa_old (regardless of PA date)
+    - otherwise Q1 2026 PA date -> pa_date, no PA date -> pa_nodate
+    """
+    status = orders['Status']
+    is_pf = status.isin(PF_STATUSES).to_numpy()
+    is_pa = (status == 'Pending Approval').to_numpy()
+    
+    pf_windows = date_window_masks(orders, ['Customer Promise Date', 'Projected Date'], SO_PERIOD_WINDOWS)
+    pf_dates = orders.reindex(columns=['Customer Promise Date', 'Projected Date'])
+    no_date = (pf_dates['Customer Promise Date'].isna() & pf_dates['Projected Date'].isna()).to_numpy()
+    
+    if 'Calyx External Order' in orders.columns:
+        is_ext = (orders['Calyx External Order'].astype(str).str.strip().str.upper() == 'YES').to_numpy()
+    else:
+        is_ext = np.zeros(len(orders), dtype=bool)
+    
+    if 'Pending Approval Date' in orders.columns:
+        pa_date = parse_sheet_dates(orders['Pending Approval Date'], fix_century=True)
+        pa_text = orders['Pending Approval Date'].astype(str).str.strip()
+        no_pa_date = (pa_date.isna() | pa_text.isin(['No Date', ''])).to_numpy()
+    else:
+        pa_date = pd.Series(pd.NaT, index=orders.index)
+        no_pa_date = np.ones(len(orders), dtype=bool)
+    pa_windows = date_window_masks(
+        pd.DataFrame({'PA Date': pa_date}), ['PA Date'],
+        {**SO_PERIOD_WINDOWS, 'q2_2026_on': (SO_PERIOD_WINDOWS['q2_2026'][0], None)}
+    )
+    
+    if 'Age_Business_Days' in orders.columns:
+        is_old = (orders['Age_Business_Days'] >= PA_OLD_BUSINESS_DAYS).to_numpy()
+    else:
+        is_old = np.zeros(len(orders), dtype=bool)
+    
+    rules = [
+        is_pf & pf_windows['q4_2025'].to_numpy(),
+        is_pf & pf_windows['q2_2026'].to_numpy(),
+        is_pf & pf_windows['q1_2026'].to_numpy() & is_ext,
+        is_pf & pf_windows['q1_2026'].to_numpy(),
+        is_pf & no_date & is_ext,
+        is_pf & no_date,
+        is_pa & pa_windows['q4_2025'].to_numpy(),
+        is_pa & pa_windows['q2_2026_on'].to_numpy(),
+        is_pa & is_old,
+        is_pa & pa_windows['q1_2026'].to_numpy(),
+        is_pa & no_pa_date,
+    ]
+    codes = np.select(rules, list(range(len(SO_BUCKETS))), default=-1)
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=SO_BUCKETS), index=orders.index, name='Forecast_Bucket'
+    )
+
+
+def tag_sales_orders(sales_orders_df):
+    """
+    Add the columns categorization and the UI read to every order, once per dataset:
+    Display_SO_Num, Display_Type, Display_Promise_Date, Display_Projected_Date,
+    Display_PA_Date, PA_Date_Parsed and the categorical Forecast_Bucket.
+    load_all_data tags the shared frame, so per-rep categorization is only a filter.
+    """
+    orders = sales_orders_df.copy(deep=False)
+    
+    # Remove duplicate columns
+    if orders.columns.duplicated().any():
+        orders = orders.loc[:, ~orders.columns.duplicated()]
+    
+    if orders.empty:
+        return orders
+    
+    # === ADD DISPLAY COLUMNS FOR UI ===
+    # Named by the NS Sales Orders schema (dates already parsed) - no positional lookups
+    orders['Display_SO_Num'] = sheet_schema.column(orders, 'Document Number')  # Col B: SO#
+    orders['Display_Type'] = sheet_schema.column(orders, 'Order Type').astype(object).fillna('Standard')  # Col R: Order Type
+    orders['Display_Promise_Date'] = parse_sheet_dates(sheet_schema.column(orders, 'Customer Promise Date'))  # Col L
+    orders['Display_Projected_Date'] = parse_sheet_dates(sheet_schema.column(orders, 'Projected Date'))  # Col M
+    orders['Display_PA_Date'] = parse_sheet_dates(sheet_schema.column(orders, 'Pending Approval Date'))  # Col AD
+    
+    # Already parsed and century-corrected in load_all_data - no re-parse
+    if 'Pending Approval Date' in orders.columns:
+        orders['PA_Date_Parsed'] = parse_sheet_dates(orders['Pending Approval Date'], fix_century=True)
+    
+    # One vectorized pass labels every order; each bucket frame is a mask on the labels
+    orders['Forecast_Bucket'] = so_bucket_labels(orders)
+    return orders
+
+
+class SalesOrderBuckets(Mapping):
+    """
+    Result of categorize_sales_orders: '<bucket>' -> DataFrame of the orders in that bucket,
+    '<bucket>_amount' -> their total Amount (0 when empty), for every bucket in SO_BUCKETS.
+    Amounts are precomputed; the orders and each bucket frame are only built when read.
+    """
+    
+    def __init__(self, get_orders, amounts):
+        self._get_orders = get_orders
+        self._orders = None
+        self._amounts = amounts
+        self._frames = {}
+    
+    def __getitem__(self, key):
+        if key.endswith('_amount') and key[:-len('_amount')] in SO_BUCKETS:
+            return self._amounts.get(key[:-len('_amount')], 0)
+        if key not in SO_BUCKETS:
+            raise KeyError(key)
+        if key not in self._frames:
+            if self._orders is None:
+                self._orders = self._get_orders()
+            orders = self._orders
+            self._frames[key] = orders[orders['Forecast_Bucket'] == key] if not orders.empty else pd.DataFrame()
+        return self._frames[key]
+    
+    def __iter__(self):
+        for bucket in SO_BUCKETS:
+            yield bucket
+            yield f'{bucket}_amount'
+    
+    def __len__(self):
+        return 2 * len(SO_BUCKETS)
+
+
+def _bucket_amounts(orders, by=None):
+    """Total Amount per Forecast_Bucket (per (by, bucket) when by is given) - one groupby"""
+    if orders.empty or 'Amount' not in orders.columns:
+        return {}
+    keys = [by, 'Forecast_Bucket'] if by else 'Forecast_Bucket'
+    return orders.groupby(keys, observed=True)['Amount'].sum().to_dict()
+
+
 def categorize_sales_orders(sales_orders_df, rep_name=None):
     """
     SINGLE SOURCE OF TRUTH for categorizing sales orders into forecast buckets.
@@ -3192,245 +3244,54 @@ def categorize_sales_orders(sales_orders_df, rep_name=None):
     - Individual Rep views
     - Build Your Own Forecast section
     
-    Returns a dictionary with categorized DataFrames and their amounts.
+    Returns a SalesOrderBuckets mapping of categorized DataFrames and their amounts. Every
+    frame carries its bucket in the categorical Forecast_Bucket column (see so_bucket_labels).
+    For all reps at once use categorize_all_sales_orders.
     """
     if sales_orders_df is None or sales_orders_df.empty:
-        return {
-            'pf_date_ext': pd.DataFrame(), 'pf_date_ext_amount': 0,
-            'pf_date_int': pd.DataFrame(), 'pf_date_int_amount': 0,
-            'pf_nodate_ext': pd.DataFrame(), 'pf_nodate_ext_amount': 0,
-            'pf_nodate_int': pd.DataFrame(), 'pf_nodate_int_amount': 0,
-            'pa_date': pd.DataFrame(), 'pa_date_amount': 0,
-            'pa_nodate': pd.DataFrame(), 'pa_nodate_amount': 0,
-            'pa_old': pd.DataFrame(), 'pa_old_amount': 0,
-            'pf_q4_spillover': pd.DataFrame(), 'pf_q4_spillover_amount': 0,
-            'pa_q4_spillover': pd.DataFrame(), 'pa_q4_spillover_amount': 0,
-            'pf_q2_spillover': pd.DataFrame(), 'pf_q2_spillover_amount': 0,
-            'pa_q2_spillover': pd.DataFrame(), 'pa_q2_spillover_amount': 0
-        }
+        return SalesOrderBuckets(pd.DataFrame, {})
+    
+    # Frames from load_all_data are already tagged
+    if 'Forecast_Bucket' not in sales_orders_df.columns:
+        sales_orders_df = tag_sales_orders(sales_orders_df)
     
     # Filter by rep if specified
     if rep_name and 'Sales Rep' in sales_orders_df.columns:
-        orders = sales_orders_df[sales_orders_df['Sales Rep'] == rep_name].copy()
+        orders = rep_partitions.rep_rows(sales_orders_df, 'Sales Rep', rep_name)
     else:
-        orders = sales_orders_df.copy()
+        orders = sales_orders_df.copy(deep=False)
     
-    if orders.empty:
-        return {
-            'pf_date_ext': pd.DataFrame(), 'pf_date_ext_amount': 0,
-            'pf_date_int': pd.DataFrame(), 'pf_date_int_amount': 0,
-            'pf_nodate_ext': pd.DataFrame(), 'pf_nodate_ext_amount': 0,
-            'pf_nodate_int': pd.DataFrame(), 'pf_nodate_int_amount': 0,
-            'pa_date': pd.DataFrame(), 'pa_date_amount': 0,
-            'pa_nodate': pd.DataFrame(), 'pa_nodate_amount': 0,
-            'pa_old': pd.DataFrame(), 'pa_old_amount': 0,
-            'pf_q4_spillover': pd.DataFrame(), 'pf_q4_spillover_amount': 0,
-            'pa_q4_spillover': pd.DataFrame(), 'pa_q4_spillover_amount': 0,
-            'pf_q2_spillover': pd.DataFrame(), 'pf_q2_spillover_amount': 0,
-            'pa_q2_spillover': pd.DataFrame(), 'pa_q2_spillover_amount': 0
-        }
+    return SalesOrderBuckets(lambda: orders, _bucket_amounts(orders))
+
+
+def categorize_all_sales_orders(sales_orders_df):
+    """
+    categorize_sales_orders for every rep in one pass: {rep name: SalesOrderBuckets}
+    - amounts for all reps come from a single groupby(['Sales Rep', 'Forecast_Bucket'])
+    - a rep's orders are taken (by row position) only when one of its bucket frames is read
+    Reps without orders have no entry - .get(rep) and fall back to categorize_sales_orders.
+    """
+    if sales_orders_df is None or sales_orders_df.empty or 'Sales Rep' not in sales_orders_df.columns:
+        return {}
     
-    # Remove duplicate columns
-    if orders.columns.duplicated().any():
-        orders = orders.loc[:, ~orders.columns.duplicated()]
+    if 'Forecast_Bucket' not in sales_orders_df.columns:
+        sales_orders_df = tag_sales_orders(sales_orders_df)
     
-    # === ADD DISPLAY COLUMNS FOR UI ===
-    # Add display columns to orders dataframe
-    orders['Display_SO_Num'] = get_col_by_index(orders, 1)  # Col B: SO#
-    orders['Display_Type'] = get_col_by_index(orders, 17).fillna('Standard')  # Col R: Order Type
-    orders['Display_Promise_Date'] = pd.to_datetime(get_col_by_index(orders, 11), errors='coerce')  # Col L: Promise Date
-    orders['Display_Projected_Date'] = pd.to_datetime(get_col_by_index(orders, 12), errors='coerce')  # Col M: Projected Date
-    
-    # PA Date handling
-    if 'Pending Approval Date' in orders.columns:
-        orders['Display_PA_Date'] = pd.to_datetime(orders['Pending Approval Date'], errors='coerce')
-    else:
-        orders['Display_PA_Date'] = pd.to_datetime(get_col_by_index(orders, 29), errors='coerce')  # Col AD: PA Date
-    
-    # Define Q1 2026 (primary), Q4 2025 (spillover backward), and Q2 2026 (spillover forward) date ranges
-    q4_2025_start = pd.Timestamp('2025-10-01')
-    q4_2025_end = pd.Timestamp('2025-12-31')
-    q1_2026_start = pd.Timestamp('2026-01-01')
-    q1_2026_end = pd.Timestamp('2026-03-31')
-    q2_2026_start = pd.Timestamp('2026-04-01')
-    q2_2026_end = pd.Timestamp('2026-06-30')
-    
-    # === PENDING FULFILLMENT CATEGORIZATION ===
-    pf_orders = orders[orders['Status'].isin(['Pending Fulfillment', 'Pending Billing/Partially Fulfilled'])].copy()
-    
-    if not pf_orders.empty:
-        # Check if dates are in Q1 2026 range (primary quarter)
-        def has_q1_date(row):
-            if pd.notna(row.get('Customer Promise Date')):
-                if q1_2026_start <= row['Customer Promise Date'] <= q1_2026_end:
-                    return True
-            if pd.notna(row.get('Projected Date')):
-                if q1_2026_start <= row['Projected Date'] <= q1_2026_end:
-                    return True
-            return False
-        
-        # Check if dates are in Q4 2025 range (backward spillover - carryover from Q4)
-        def has_q4_2025_date(row):
-            if pd.notna(row.get('Customer Promise Date')):
-                if q4_2025_start <= row['Customer Promise Date'] <= q4_2025_end:
-                    return True
-            if pd.notna(row.get('Projected Date')):
-                if q4_2025_start <= row['Projected Date'] <= q4_2025_end:
-                    return True
-            return False
-        
-        # Check if dates are in Q2 2026 range (forward spillover)
-        def has_q2_2026_date(row):
-            if pd.notna(row.get('Customer Promise Date')):
-                if q2_2026_start <= row['Customer Promise Date'] <= q2_2026_end:
-                    return True
-            if pd.notna(row.get('Projected Date')):
-                if q2_2026_start <= row['Projected Date'] <= q2_2026_end:
-                    return True
-            return False
-        
-        pf_orders['Has_Q1_Date'] = pf_orders.apply(has_q1_date, axis=1)
-        pf_orders['Has_Q4_2025_Date'] = pf_orders.apply(has_q4_2025_date, axis=1)
-        pf_orders['Has_Q2_2026_Date'] = pf_orders.apply(has_q2_2026_date, axis=1)
-        
-        # Check External/Internal flag
-        is_ext = pd.Series(False, index=pf_orders.index)
-        if 'Calyx External Order' in pf_orders.columns:
-            is_ext = pf_orders['Calyx External Order'].astype(str).str.strip().str.upper() == 'YES'
-        
-        # Q4 2025 Spillover bucket (carryover from Q4 that hasn't shipped)
-        pf_q4_spillover = pf_orders[pf_orders['Has_Q4_2025_Date'] == True].copy()
-        q4_spillover_ids = pf_q4_spillover.index
-        
-        # Q2 2026 Spillover bucket (forward spillover)
-        pf_q2_spillover = pf_orders[pf_orders['Has_Q2_2026_Date'] == True].copy()
-        q2_spillover_ids = pf_q2_spillover.index
-        
-        # Categorize Q1 PF orders (exclude both spillover buckets to avoid double counting)
-        excluded_ids = q4_spillover_ids.union(q2_spillover_ids)
-        q1_candidates = pf_orders[(pf_orders['Has_Q1_Date'] == True) & (~pf_orders.index.isin(excluded_ids))]
-        pf_date_ext = q1_candidates[is_ext.loc[q1_candidates.index]].copy()
-        pf_date_int = q1_candidates[~is_ext.loc[q1_candidates.index]].copy()
-        
-        # No date means BOTH dates are missing (not Q1, not Q4, not Q2)
-        no_date_mask = (
-            (pf_orders['Customer Promise Date'].isna()) &
-            (pf_orders['Projected Date'].isna())
-        )
-        pf_nodate_ext = pf_orders[no_date_mask & is_ext].copy()
-        pf_nodate_int = pf_orders[no_date_mask & ~is_ext].copy()
-    else:
-        pf_date_ext = pf_date_int = pf_nodate_ext = pf_nodate_int = pf_q4_spillover = pf_q2_spillover = pd.DataFrame()
-    
-    # === PENDING APPROVAL CATEGORIZATION ===
-    # Logic:
-    # 1. PA with Date (within Q1): Has PA Date in Q1 2026 AND Age < 13 business days
-    # 2. PA No Date: No PA Date AND Age < 13 business days  
-    # 3. PA Old (>2 Weeks): Age >= 13 business days (regardless of whether they have a PA date or not)
-    pa_orders = orders[orders['Status'] == 'Pending Approval'].copy()
-    
-    if not pa_orders.empty:
-        # Check if Age_Business_Days column exists
-        if 'Age_Business_Days' not in pa_orders.columns:
-            pa_orders['Age_Business_Days'] = 0
-        
-        # Parse Pending Approval Date for all PA orders
-        if 'Pending Approval Date' in pa_orders.columns:
-            pa_orders['PA_Date_Parsed'] = pd.to_datetime(pa_orders['Pending Approval Date'], errors='coerce')
-            
-            # Fix any dates that got parsed as 1900s (2-digit year issue: 26 -> 1926 instead of 2026)
-            if pa_orders['PA_Date_Parsed'].notna().any():
-                mask_1900s = (pa_orders['PA_Date_Parsed'].dt.year < 2000) & (pa_orders['PA_Date_Parsed'].notna())
-                if mask_1900s.any():
-                    pa_orders.loc[mask_1900s, 'PA_Date_Parsed'] = pa_orders.loc[mask_1900s, 'PA_Date_Parsed'] + pd.DateOffset(years=100)
-        else:
-            pa_orders['PA_Date_Parsed'] = pd.NaT
-        
-        # Determine which orders have a valid Q1 2026 PA Date (primary quarter)
-        has_q1_pa_date = (
-            (pa_orders['PA_Date_Parsed'].notna()) &
-            (pa_orders['PA_Date_Parsed'] >= q1_2026_start) &
-            (pa_orders['PA_Date_Parsed'] <= q1_2026_end)
-        )
-        
-        # Determine which orders have a Q4 2025 PA Date (backward spillover)
-        has_q4_2025_pa_date = (
-            (pa_orders['PA_Date_Parsed'].notna()) &
-            (pa_orders['PA_Date_Parsed'] >= q4_2025_start) &
-            (pa_orders['PA_Date_Parsed'] <= q4_2025_end)
-        )
-        
-        # Determine which orders have a Q2 2026 PA Date (forward spillover)
-        has_q2_2026_pa_date = (
-            (pa_orders['PA_Date_Parsed'].notna()) &
-            (pa_orders['PA_Date_Parsed'] >= q2_2026_start)
-        )
-        
-        # Determine which orders have NO PA Date (or invalid)
-        has_no_pa_date = (
-            (pa_orders['PA_Date_Parsed'].isna()) |
-            (pa_orders['Pending Approval Date'].astype(str).str.strip() == 'No Date') |
-            (pa_orders['Pending Approval Date'].astype(str).str.strip() == '')
-        )
-        
-        # PA Q4 2025 Spillover bucket (carryover from Q4)
-        pa_q4_spillover = pa_orders[has_q4_2025_pa_date].copy()
-        q4_spillover_pa_ids = pa_q4_spillover.index
-        
-        # PA Q2 2026 Spillover bucket (forward spillover)
-        pa_q2_spillover = pa_orders[has_q2_2026_pa_date].copy()
-        q2_spillover_pa_ids = pa_q2_spillover.index
-        
-        # Exclude spillover from remaining PA categorization
-        excluded_pa_ids = q4_spillover_pa_ids.union(q2_spillover_pa_ids)
-        pa_orders_remaining = pa_orders[~pa_orders.index.isin(excluded_pa_ids)].copy()
-        
-        # CATEGORY 3: PA Old (>= 13 business days) - ANY PA order that is old, regardless of PA date
-        # This takes priority - old orders go here first
-        pa_old = pa_orders_remaining[pa_orders_remaining['Age_Business_Days'] >= 13].copy()
-        
-        # Only "young" orders (< 13 days) are eligible for PA with Date or PA No Date
-        young_pa = pa_orders_remaining[pa_orders_remaining['Age_Business_Days'] < 13].copy()
-        
-        # CATEGORY 1: PA with Date - has Q1 PA date AND is NOT old (< 13 days)
-        pa_date = young_pa[has_q1_pa_date.loc[young_pa.index]].copy() if not young_pa.empty else pd.DataFrame()
-        
-        # CATEGORY 2: PA No Date - no PA date AND is NOT old (< 13 days)
-        pa_nodate = young_pa[has_no_pa_date.loc[young_pa.index]].copy() if not young_pa.empty else pd.DataFrame()
-    else:
-        pa_old = pa_date = pa_nodate = pa_q4_spillover = pa_q2_spillover = pd.DataFrame()
-    
-    # Calculate amounts
-    def get_amount(df):
-        return df['Amount'].sum() if not df.empty and 'Amount' in df.columns else 0
+    amounts = {}
+    for (rep, bucket), amount in _bucket_amounts(sales_orders_df, by='Sales Rep').items():
+        amounts.setdefault(rep, {})[bucket] = amount
     
+    positions = rep_partitions.rep_positions(sales_orders_df, 'Sales Rep')
     return {
-        'pf_date_ext': pf_date_ext,
-        'pf_date_ext_amount': get_amount(pf_date_ext),
-        'pf_date_int': pf_date_int,
-        'pf_date_int_amount': get_amount(pf_date_int),
-        'pf_nodate_ext': pf_nodate_ext,
-        'pf_nodate_ext_amount': get_amount(pf_nodate_ext),
-        'pf_nodate_int': pf_nodate_int,
-        'pf_nodate_int_amount': get_amount(pf_nodate_int),
-        'pa_date': pa_date,
-        'pa_date_amount': get_amount(pa_date),
-        'pa_nodate': pa_nodate,
-        'pa_nodate_amount': get_amount(pa_nodate),
-        'pa_old': pa_old,
-        'pa_old_amount': get_amount(pa_old),
-        'pf_q4_spillover': pf_q4_spillover,
-        'pf_q4_spillover_amount': get_amount(pf_q4_spillover),
-        'pa_q4_spillover': pa_q4_spillover,
-        'pa_q4_spillover_amount': get_amount(pa_q4_spillover),
-        'pf_q2_spillover': pf_q2_spillover,
-        'pf_q2_spillover_amount': get_amount(pf_q2_spillover),
-        'pa_q2_spillover': pa_q2_spillover,
-        'pa_q2_spillover_amount': get_amount(pa_q2_spillover)
+        rep: SalesOrderBuckets(lambda rows=rows: sales_orders_df.take(rows), amounts.get(rep, {}))
+        for rep, rows in positions.items()
     }
 
-def calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df=None):
-    """Calculate metrics for a specific rep with detailed order lists for drill-down"""
+def calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df=None, so_categories=None):
+    """
+    Calculate metrics for a specific rep with detailed order lists for drill-down
+    so_categories: the rep's entry of categorize_all_sales_orders (computed here when None)
+    """
     
     # Get rep's quota and orders
     rep_info = dashboard_df[dashboard_df['Rep Name'] == rep_name]
@@ -3442,7 +3303,7 @@ def calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df=None
     orders = rep_info['NetSuite Orders'].iloc[0]
     
     # Filter deals for this rep - ALL Q1 2026 deals (regardless of spillover)
-    rep_deals = deals_df[deals_df['Deal Owner'] == rep_name].copy()
+    rep_deals = rep_partitions.rep_rows(deals_df, 'Deal Owner', rep_name)
     
     # Check for spillover column (handles both old and new column names)
     spillover_col = get_spillover_column(rep_deals)
@@ -3454,27 +3315,27 @@ def calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df=None
         rep_deals['Ships_In_Q4'] = rep_deals[spillover_col] == 'Q4 2025'
         
         # Deals that ship in Q1 2026 (primary quarter)
-        rep_deals_ship_q1 = rep_deals[rep_deals['Ships_In_Q1'] == True].copy()
+        rep_deals_ship_q1 = rep_deals[rep_deals['Ships_In_Q1'] == True]
         
         # Deals that ship in Q2 2026 (forward spillover)
-        rep_deals_ship_q2 = rep_deals[rep_deals['Ships_In_Q2'] == True].copy()
+        rep_deals_ship_q2 = rep_deals[rep_deals['Ships_In_Q2'] == True]
         
         # Deals that ship in Q4 2025 (backward spillover - carryover)
-        rep_deals_ship_q4 = rep_deals[rep_deals['Ships_In_Q4'] == True].copy()
+        rep_deals_ship_q4 = rep_deals[rep_deals['Ships_In_Q4'] == True]
     else:
         # Old column name or no column - treat all as Q1 (primary quarter)
-        rep_deals_ship_q1 = rep_deals.copy()
+        rep_deals_ship_q1 = rep_deals
         rep_deals_ship_q2 = pd.DataFrame()
         rep_deals_ship_q4 = pd.DataFrame()
     
     # Calculate metrics for DEALS SHIPPING IN Q1 (this counts toward quota)
     if not rep_deals_ship_q1.empty and 'Status' in rep_deals_ship_q1.columns:
-        expect_commit_q1_deals = rep_deals_ship_q1[rep_deals_ship_q1['Status'].isin(['Expect', 'Commit'])].copy()
+        expect_commit_q1_deals = rep_deals_ship_q1[rep_deals_ship_q1['Status'].isin(['Expect', 'Commit'])]
         if expect_commit_q1_deals.columns.duplicated().any():
             expect_commit_q1_deals = expect_commit_q1_deals.loc[:, ~expect_commit_q1_deals.columns.duplicated()]
         expect_commit_q1 = expect_commit_q1_deals['Amount'].sum() if not expect_commit_q1_deals.empty else 0
         
-        best_opp_q1_deals = rep_deals_ship_q1[rep_deals_ship_q1['Status'].isin(['Best Case', 'Opportunity'])].copy()
+        best_opp_q1_deals = rep_deals_ship_q1[rep_deals_ship_q1['Status'].isin(['Best Case', 'Opportunity'])]
         if best_opp_q1_deals.columns.duplicated().any():
             best_opp_q1_deals = best_opp_q1_deals.loc[:, ~best_opp_q1_deals.columns.duplicated()]
         best_opp_q1 = best_opp_q1_deals['Amount'].sum() if not best_opp_q1_deals.empty else 0
@@ -3486,12 +3347,12 @@ def calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df=None
     
     # Calculate metrics for Q2 SPILLOVER DEALS (closing in Q1 but shipping in Q2)
     if not rep_deals_ship_q2.empty and 'Status' in rep_deals_ship_q2.columns:
-        expect_commit_q2_deals = rep_deals_ship_q2[rep_deals_ship_q2['Status'].isin(['Expect', 'Commit'])].copy()
+        expect_commit_q2_deals = rep_deals_ship_q2[rep_deals_ship_q2['Status'].isin(['Expect', 'Commit'])]
         if expect_commit_q2_deals.columns.duplicated().any():
             expect_commit_q2_deals = expect_commit_q2_deals.loc[:, ~expect_commit_q2_deals.columns.duplicated()]
         expect_commit_q2_spillover = expect_commit_q2_deals['Amount'].sum() if not expect_commit_q2_deals.empty else 0
         
-        best_opp_q2_deals = rep_deals_ship_q2[rep_deals_ship_q2['Status'].isin(['Best Case', 'Opportunity'])].copy()
+        best_opp_q2_deals = rep_deals_ship_q2[rep_deals_ship_q2['Status'].isin(['Best Case', 'Opportunity'])]
         if best_opp_q2_deals.columns.duplicated().any():
             best_opp_q2_deals = best_opp_q2_deals.loc[:, ~best_opp_q2_deals.columns.duplicated()]
         best_opp_q2_spillover = best_opp_q2_deals['Amount'].sum() if not best_opp_q2_deals.empty else 0
@@ -3503,12 +3364,12 @@ def calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df=None
     
     # Calculate metrics for Q4 2025 SPILLOVER DEALS (carryover from Q4)
     if not rep_deals_ship_q4.empty and 'Status' in rep_deals_ship_q4.columns:
-        expect_commit_q4_deals = rep_deals_ship_q4[rep_deals_ship_q4['Status'].isin(['Expect', 'Commit'])].copy()
+        expect_commit_q4_deals = rep_deals_ship_q4[rep_deals_ship_q4['Status'].isin(['Expect', 'Commit'])]
         if expect_commit_q4_deals.columns.duplicated().any():
             expect_commit_q4_deals = expect_commit_q4_deals.loc[:, ~expect_commit_q4_deals.columns.duplicated()]
         expect_commit_q4_spillover = expect_commit_q4_deals['Amount'].sum() if not expect_commit_q4_deals.empty else 0
         
-        best_opp_q4_deals = rep_deals_ship_q4[rep_deals_ship_q4['Status'].isin(['Best Case', 'Opportunity'])].copy()
+        best_opp_q4_deals = rep_deals_ship_q4[rep_deals_ship_q4['Status'].isin(['Best Case', 'Opportunity'])]
         if best_opp_q4_deals.columns.duplicated().any():
             best_opp_q4_deals = best_opp_q4_deals.loc[:, ~best_opp_q4_deals.columns.duplicated()]
         best_opp_q4_spillover = best_opp_q4_deals['Amount'].sum() if not best_opp_q4_deals.empty else 0
@@ -3523,7 +3384,8 @@ def calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df=None
     q4_spillover_total = expect_commit_q4_spillover + best_opp_q4_spillover
     
     # === USE CENTRALIZED CATEGORIZATION FUNCTION ===
-    so_categories = categorize_sales_orders(sales_orders_df, rep_name)
+    if so_categories is None:
+        so_categories = categorize_sales_orders(sales_orders_df, rep_name)
     
     # Extract amounts
     pending_fulfillment = so_categories['pf_date_ext_amount'] + so_categories['pf_date_int_amount']
@@ -3657,7 +3519,7 @@ def create_pipeline_sankey(deals_df):
         return go.Figure()
     
     # Aggregate data: Pipeline -> Status
-    df_agg = deals_df.groupby(['Pipeline', 'Status'])['Amount'].sum().reset_index()
+    df_agg = deals_df.groupby(['Pipeline', 'Status'], observed=True)['Amount'].sum().reset_index()
     
     if df_agg.empty:
         return go.Figure()
@@ -3746,7 +3608,7 @@ def create_team_sunburst(dashboard_df, deals_df):
             })
         
         # Add pipeline data if available
-        rep_deals = deals_df[deals_df['Deal Owner'] == rep_name] if not deals_df.empty else pd.DataFrame()
+        rep_deals = rep_partitions.rep_rows(deals_df, 'Deal Owner', rep_name) if not deals_df.empty else pd.DataFrame()
         if not rep_deals.empty:
             pipeline_total = rep_deals['Amount'].sum()
             if pipeline_total > 0:
@@ -3864,13 +3726,6 @@ def create_gap_chart(metrics, title):
     
     return fig
 
-# Helper function to safely grab a column by index
-def get_col_by_index(df, index):
-    """Safely grab a column by index with fallback"""
-    if df is not None and not df.empty and len(df.columns) > index:
-        return df.iloc[:, index]
-    return pd.Series(dtype=object)
-
 def create_enhanced_waterfall_chart(metrics, title, mode):
     """
     Creates a waterfall chart for forecast progress to address visibility issues with small segments.
@@ -4044,7 +3899,7 @@ def create_status_breakdown_chart(deals_df, rep_name=None):
     """Create a pie chart showing deal distribution by status"""
     
     if rep_name:
-        deals_df = deals_df[deals_df['Deal Owner'] == rep_name]
+        deals_df = rep_partitions.rep_rows(deals_df, 'Deal Owner', rep_name)
     
     # Only show Q1 deals (filter out Q2 and Q4 spillover)
     spillover_col = get_spillover_column(deals_df)
@@ -4055,7 +3910,7 @@ def create_status_breakdown_chart(deals_df, rep_name=None):
     if deals_df.empty:
         return None
     
-    status_summary = deals_df.groupby('Status')['Amount'].sum().reset_index()
+    status_summary = deals_df.groupby('Status', observed=True)['Amount'].sum().reset_index()
     
     color_map = {
         'Expect': '#1E88E5',
@@ -4083,7 +3938,7 @@ def create_pipeline_breakdown_chart(deals_df, rep_name=None):
     """Create a stacked bar chart showing pipeline breakdown"""
     
     if rep_name:
-        deals_df = deals_df[deals_df['Deal Owner'] == rep_name]
+        deals_df = rep_partitions.rep_rows(deals_df, 'Deal Owner', rep_name)
     
     # Only show Q1 deals (filter out Q2 and Q4 spillover)
     spillover_col = get_spillover_column(deals_df)
@@ -4095,7 +3950,7 @@ def create_pipeline_breakdown_chart(deals_df, rep_name=None):
         return None
     
     # Group by pipeline and status
-    pipeline_summary = deals_df.groupby(['Pipeline', 'Status'])['Amount'].sum().reset_index()
+    pipeline_summary = deals_df.groupby(['Pipeline', 'Status'], observed=True)['Amount'].sum().reset_index()
     
     color_map = {
         'Expect': '#1E88E5',
@@ -4143,7 +3998,7 @@ def create_deals_timeline(deals_df, rep_name=None):
     """Create a timeline showing when deals are expected to close"""
     
     if rep_name:
-        deals_df = deals_df[deals_df['Deal Owner'] == rep_name]
+        deals_df = rep_partitions.rep_rows(deals_df, 'Deal Owner', rep_name)
     
     # Filter out deals without close dates
     timeline_df = deals_df[deals_df['Close Date'].notna()].copy()
@@ -4216,12 +4071,12 @@ def create_invoice_status_chart(invoices_df, rep_name=None):
         return None
     
     if rep_name:
-        invoices_df = invoices_df[invoices_df['Sales Rep'] == rep_name]
+        invoices_df = rep_partitions.rep_rows(invoices_df, 'Sales Rep', rep_name)
     
     if invoices_df.empty:
         return None
     
-    status_summary = invoices_df.groupby('Status')['Amount'].sum().reset_index()
+    status_summary = invoices_df.groupby('Status', observed=True)['Amount'].sum().reset_index()
     
     fig = px.pie(
         status_summary,
@@ -4437,12 +4292,16 @@ def display_team_dashboard(deals_df, dashboard_df, invoices_df, sales_orders_df,
     section1_data = []
     section2_data = []
     
+    # Sales order buckets for every rep in one pass
+    team_so_categories = categorize_all_sales_orders(sales_orders_df)
+    
     for rep_name in dashboard_df['Rep Name']:
         # Skip excluded reps
         if rep_name in excluded_reps:
             continue
             
-        rep_metrics = calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df)
+        rep_metrics = calculate_rep_metrics(rep_name, deals_df, dashboard_df, sales_orders_df,
+                                            so_categories=team_so_categories.get(rep_name))
         if rep_metrics:
             section1_total = (rep_metrics['orders'] + rep_metrics['pending_fulfillment'] +
                               rep_metrics['pending_approval'] + rep_metrics['expect_commit'])
@@ -5081,6 +4940,9 @@ def main():
     if 'data_load_time' not in st.session_state:
         st.session_state.data_load_time = get_mst_time()
     
+    # Opt-in background refresh (SHEETS_BACKGROUND_REFRESH_MINUTES) - started once per process
+    background_refresh = sheet_cache.start_background_refresher(MAIN_SHEET_RANGES, on_main_tabs_changed)
+    
     # Dashboard tagline
     st.markdown("""
     <div style='text-align: center; padding: 10px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
@@ -5191,8 +5053,13 @@ def main():
         # Sexy metrics cards for quick stats
         biz_days = calculate_business_days_remaining()
         
-        # Get data load time from session state
+        # Get data load time from session state (or the background refresher's last check)
         data_load_time = st.session_state.data_load_time
+        background_checked_at = sheet_cache.background_checked_at(MAIN_SHEET_RANGES)
+        if background_refresh and background_checked_at is not None:
+            data_load_time = max(data_load_time, background_checked_at.astimezone(ZoneInfo("America/Denver")))
+        sync_mode_text = (f"Auto-refresh every {sheet_cache.BACKGROUND_REFRESH_MINUTES:g} min"
+                          if background_refresh else "Manual refresh only")
         current_mst_time = get_mst_time()
         time_since_load = current_mst_time - data_load_time
         minutes_ago = int(time_since_load.total_seconds() / 60)
@@ -5237,7 +5104,7 @@ def main():
                     <div style="font-size: 14px; font-weight: 600; color: #3b82f6;">""" + data_load_time.strftime('%I:%M %p %Z') + """</div>
                 </div>
             </div>
-            <div style="font-size: 10px; opacity: 0.6;">""" + time_ago_text + """ • Manual refresh only</div>
+            <div style="font-size: 10px; opacity: 0.6;">""" + time_ago_text + """ • """ + sync_mode_text + """</div>
         </div>
         """, unsafe_allow_html=True)
         
@@ -5247,8 +5114,9 @@ def main():
             if 'current_snapshot' in st.session_state:
                 st.session_state.previous_snapshot = st.session_state.current_snapshot
             
-            # Clear cache and update timestamp
-            st.cache_data.clear()
+            # Invalidate only the main dashboard tabs and update timestamp - other views
+            # keep their caches (tabs unchanged since the last fetch come from disk - see sheet_cache)
+            cache_manager.invalidate_dataset("Main dashboard")
             st.session_state.data_load_time = get_mst_time()
             
             # Rerun to load fresh data
@@ -5274,7 +5142,25 @@ def main():
                     st.error("Error reading credentials")
             else:
                 st.error("❌ GCP credentials missing")
-    
+
+            # On-disk tab cache (served first after a restart)
+            st.write("**Disk cache:**")
+            fetch_times = sheet_cache.cached_fetch_times(MAIN_SHEET_RANGES)
+            if fetch_times:
+                for sheet_name, fetched_at in fetch_times.items():
+                    local_time = fetched_at.astimezone(ZoneInfo("America/Denver"))
+                    st.caption(f"{sheet_name}: fetched {local_time.strftime('%b %d %I:%M %p %Z')}")
+            else:
+                st.caption("No tabs cached on disk yet")
+
+            # Refresh a single dataset without touching the other views' caches
+            st.write("**Refresh one dataset:**")
+            for label, ranges in cache_manager.datasets().items():
+                tab_names = ', '.join(sheet_name for sheet_name, _ in ranges)
+                if st.button(f"🔄 {label}", key=f"refresh_dataset_{label}", help=tab_names, use_container_width=True):
+                    cache_manager.invalidate_dataset(label)
+                    st.rerun()
+
     # Load data
     with st.spinner("Loading data from Google Sheets..."):
         deals_df, dashboard_df, invoices_df, sales_orders_df, q4_push_df = load_all_data()
@@ -0,0 +1,555 @@
+"""
+Persistent Sheets Tab Cache
+Writes every fetched tab to a local columnar file (Parquet, pickle fallback) keyed by
+spreadsheet ID, tab and range, with a JSON sidecar recording when it was fetched.
+
+st.cache_data only lives in memory, so every restart or redeploy used to re-download
+every tab. With this layer the first load after a restart is served straight from disk
+while a background thread pulls the live copy from Google.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+import sheets_client
+
+logger = logging.getLogger(__name__)
+
+# Where cached tabs are written (override with the SHEETS_CACHE_DIR environment variable)
+CACHE_DIR = os.environ.get("SHEETS_CACHE_DIR", ".sheets_cache")
+
+# Reuse the disk copy of a tab when the workbook revision hasn't changed since it was
+# fetched (set SHEETS_SKIP_UNCHANGED=0 to always redownload)
+SKIP_UNCHANGED_TABS = os.environ.get("SHEETS_SKIP_UNCHANGED", "1") != "0"
+
+# Tabs that grow mostly by appended rows. When they change, only the new tail (plus an
+# overlap window used to detect edits) is downloaded and appended to the disk copy.
+INCREMENTAL_TABS = {"NS Invoices", "NS Sales Orders"}
+
+# Trailing rows re-downloaded with every tail fetch and checked against stored fingerprints
+INCREMENTAL_OVERLAP_ROWS = 50
+
+# Edits above the overlap window are invisible to a tail fetch, so reload in full this often
+INCREMENTAL_FULL_RELOAD_HOURS = 24
+
+# Opt-in: re-pull tabs on a daemon thread every N minutes so page loads never wait on
+# Google (SHEETS_BACKGROUND_REFRESH_MINUTES, 0 = off - data changes on manual refresh only)
+BACKGROUND_REFRESH_MINUTES = float(os.environ.get("SHEETS_BACKGROUND_REFRESH_MINUTES", "0"))
+
+# Whole-column ranges like "A:AF" (the only shape a tail range can be derived from)
+_COLUMN_RANGE = re.compile(r'^([A-Z]+)\d*:([A-Z]+)$')
+
+# Range tuples already requested in this process - only the first request after a
+# restart is served from disk, later cache misses (e.g. manual refresh) go to Google
+_requested = set()
+
+# Fresh frames fetched by a background refresh, waiting for the next cache miss
+_background_results = {}
+
+# Range tuples currently served from disk because Google could not be reached -> error text
+_stale = {}
+
+# Range tuples with a background refresher running -> time of its last completed check
+_refreshers = {}
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent work on the same key into one execution
+    The first caller to claim a key owns it and must resolve it; callers that arrive while
+    it is in flight get the owner's Future and wait on it instead of repeating the work.
+    Keys are released once resolved, so later calls start a fresh flight.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def claim(self, keys):
+        """Split keys into (owned {key: Future}, waiting {key: Future of the flight in progress})"""
+        owned, waiting = {}, {}
+        with self._lock:
+            for key in keys:
+                if key in self._inflight:
+                    waiting[key] = self._inflight[key]
+                else:
+                    owned[key] = self._inflight[key] = Future()
+        return owned, waiting
+
+    def resolve(self, owned, results=None, error=None):
+        """Publish the owner's results (dict keyed like owned) or error to every waiter"""
+        with self._lock:
+            for key in owned:
+                self._inflight.pop(key, None)
+        for key, future in owned.items():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results.get(key))
+
+    def do(self, key, fn):
+        """Run fn() once for everyone asking for key at the same time"""
+        owned, waiting = self.claim((key,))
+        if waiting:
+            return waiting[key].result()
+        try:
+            result = fn()
+        except Exception as e:
+            self.resolve(owned, error=e)
+            raise
+        self.resolve(owned, {key: result})
+        return result
+
+
+# Shared across sessions: a refresh clicked by one user (st.cache_data.clear wipes every
+# session) makes every open dashboard miss at once - they all wait on one download per tab
+_flights = SingleFlight()
+_lock = threading.Lock()
+
+
+def cache_key(spreadsheet_id, sheet_name, range_name):
+    """Stable file key for one tab range (and the render mode it was fetched with)"""
+    render_mode = f"{sheets_client.VALUE_RENDER_OPTION}/{sheets_client.DATETIME_RENDER_OPTION}"
+    raw = f"{spreadsheet_id}|{sheet_name}|{range_name}|{render_mode}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def _paths(spreadsheet_id, sheet_name, range_name):
+    key = cache_key(spreadsheet_id, sheet_name, range_name)
+    base = os.path.join(CACHE_DIR, key)
+    return base + '.parquet', base + '.pkl', base + '.json'
+
+
+def _atomic_write(path, write_fn):
+    """Write to a temp file and rename so readers never see a half-written file"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    write_fn(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_tab(spreadsheet_id, sheet_name, range_name, df, extra_meta=None):
+    """
+    Persist one tab to disk
+    Columns are stored positionally (sheet headers can be blank or duplicated, which
+    Parquet rejects) and the real header row is kept in the metadata file.
+    extra_meta: additional metadata to store (e.g. the workbook revision it was fetched at)
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    parquet_path, pickle_path, meta_path = _paths(spreadsheet_id, sheet_name, range_name)
+
+    columns = [str(col) for col in df.columns]
+    stored = df.set_axis([str(i) for i in range(len(columns))], axis=1).reset_index(drop=True)
+
+    try:
+        _atomic_write(parquet_path, lambda path: stored.to_parquet(path, index=False))
+        file_format = 'parquet'
+    except Exception:
+        # Mixed-type columns (or no pyarrow) - fall back to a pickle
+        _atomic_write(pickle_path, lambda path: stored.to_pickle(path))
+        file_format = 'pickle'
+
+    meta = {
+        'spreadsheet_id': spreadsheet_id,
+        'sheet_name': sheet_name,
+        'range_name': range_name,
+        'columns': columns,
+        'rows': len(df),
+        'content_hash': frame_hash(df),
+        'format': file_format,
+        'fetched_at': datetime.now(timezone.utc).isoformat(),
+    }
+    if extra_meta:
+        meta.update(extra_meta)
+
+    def dump_meta(path):
+        with open(path, 'w') as f:
+            json.dump(meta, f)
+    _atomic_write(meta_path, dump_meta)
+    return meta
+
+
+def _cell_text(value):
+    """
+    Canonical text of one cell for fingerprinting
+    The typed fetch returns whole numbers as JSON ints, but a column mixing ints and floats
+    loads as float64 - so 100 and 100.0 must hash alike, or cached rows never match
+    the same rows re-downloaded.
+    """
+    if isinstance(value, (float, np.floating)):
+        if np.isnan(value):
+            return ''
+        if value.is_integer():
+            return str(int(value))
+    elif isinstance(value, np.integer):
+        return str(int(value))
+    elif value is None:
+        return ''
+    return str(value)
+
+
+def row_fingerprints(rows):
+    """Short hash per row (cells joined as text) - compares cached rows with re-downloaded ones"""
+    return [
+        hashlib.sha1('\x1f'.join(_cell_text(value) for value in row).encode('utf-8')).hexdigest()[:12]
+        for row in rows
+    ]
+
+
+def frame_hash(df):
+    """Short content hash of a tab (headers + values), used as its data version"""
+    digest = hashlib.sha1('\x1f'.join(str(col) for col in df.columns).encode('utf-8'))
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    except TypeError:
+        # Unhashable cell values - fall back to the text representation
+        digest.update(df.to_csv(index=False).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def read_meta(spreadsheet_id, sheet_name, range_name):
+    """Metadata for a cached tab, or None if it was never written"""
+    _, _, meta_path = _paths(spreadsheet_id, sheet_name, range_name)
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_tab(spreadsheet_id, sheet_name, range_name):
+    """
+    Load one tab from disk
+    Returns (DataFrame, metadata) or (None, None) if it is missing or unreadable
+    """
+    meta = read_meta(spreadsheet_id, sheet_name, range_name)
+    if meta is None:
+        return None, None
+
+    parquet_path, pickle_path, _ = _paths(spreadsheet_id, sheet_name, range_name)
+    try:
+        if meta.get('format') == 'parquet':
+            df = pd.read_parquet(parquet_path)
+        else:
+            df = pd.read_pickle(pickle_path)
+    except Exception as e:
+        logger.warning("Unreadable cache file for %s!%s: %s", sheet_name, range_name, e)
+        return None, None
+
+    return df.set_axis(meta['columns'], axis=1), meta
+
+
+def read_tabs(ranges):
+    """Load every tab in ranges from disk, or None if any of them is missing"""
+    frames = {}
+    for sheet_name, range_name in ranges:
+        df, _ = read_tab(sheets_client.SPREADSHEET_ID, sheet_name, range_name)
+        if df is None:
+            return None
+        frames[sheet_name] = df
+    return frames
+
+
+def write_tabs(ranges, frames, revision=None, full_fetched_at=None):
+    """
+    Persist every fetched tab in ranges, stamped with the workbook revision it was fetched at
+    full_fetched_at: when the tab was last downloaded in full (defaults to now) - kept
+    unchanged when a tab was only extended by an incremental tail fetch
+    """
+    full_fetched_at = full_fetched_at or datetime.now(timezone.utc).isoformat()
+    for sheet_name, range_name in ranges:
+        df = frames.get(sheet_name)
+        if df is None:
+            continue
+        extra_meta = {'revision': revision, 'full_fetched_at': full_fetched_at}
+        if sheet_name in INCREMENTAL_TABS:
+            tail_rows = df.tail(INCREMENTAL_OVERLAP_ROWS).itertuples(index=False, name=None)
+            extra_meta['row_fingerprints'] = row_fingerprints(tail_rows)
+        try:
+            write_tab(sheets_client.SPREADSHEET_ID, sheet_name, range_name, df, extra_meta=extra_meta)
+        except Exception as e:
+            # A failed disk write must never break the dashboard
+            logger.warning("Could not cache %s!%s to disk: %s", sheet_name, range_name, e)
+
+
+def fetch_appended(ranges, revision=None):
+    """
+    Incrementally refresh append-only tabs (INCREMENTAL_TABS) from their disk copies
+
+    For each tab the range from the first overlap row down is fetched (e.g. "A2951:AF"), in
+    one batchGet for all tabs. If the overlap rows still match the stored fingerprints, the
+    rows after them are appended to the cached frame. Anything else - an edit inside the
+    overlap window, deleted rows, a wider sheet, an old full fetch - is left out of the
+    result so the caller reloads that tab in full.
+
+    Returns {sheet_name: DataFrame} for the tabs updated by appending.
+    """
+    candidates = []
+    now = datetime.now(timezone.utc)
+    for sheet_name, range_name in ranges:
+        match = _COLUMN_RANGE.match(range_name)
+        if sheet_name not in INCREMENTAL_TABS or not match:
+            continue
+        meta = read_meta(sheets_client.SPREADSHEET_ID, sheet_name, range_name)
+        if not meta or not meta.get('row_fingerprints') or not meta.get('full_fetched_at'):
+            continue
+        if now - datetime.fromisoformat(meta['full_fetched_at']) > timedelta(hours=INCREMENTAL_FULL_RELOAD_HOURS):
+            continue
+        df, _ = read_tab(sheets_client.SPREADSHEET_ID, sheet_name, range_name)
+        if df is None:
+            continue
+
+        # Sheet row of the first overlap row (row 1 is the header)
+        first_row = len(df) - len(meta['row_fingerprints']) + 2
+        tail_range = f"{sheet_name}!{match.group(1)}{first_row}:{match.group(2)}"
+        candidates.append((sheet_name, range_name, df, meta, tail_range))
+
+    if not candidates:
+        return {}
+
+    tails = sheets_client.batch_get_values([tail_range for *_, tail_range in candidates])
+
+    updated = {}
+    for (sheet_name, range_name, df, meta, _), tail in zip(candidates, tails):
+        width = len(df.columns)
+        overlap = len(meta['row_fingerprints'])
+        if len(tail) < overlap or any(len(row) > width for row in tail):
+            continue
+        tail = [list(row) + [''] * (width - len(row)) for row in tail]
+        if row_fingerprints(tail[:overlap]) != meta['row_fingerprints']:
+            continue
+
+        new_rows = tail[overlap:]
+        if new_rows:
+            # Concatenate positionally - sheet headers may be duplicated
+            positions = list(range(width))
+            df = pd.concat(
+                [df.set_axis(positions, axis=1), pd.DataFrame(new_rows, columns=positions)],
+                ignore_index=True
+            ).set_axis(df.columns, axis=1)
+        updated[sheet_name] = df
+        write_tabs(((sheet_name, range_name),), updated, revision=revision,
+                   full_fetched_at=meta['full_fetched_at'])
+
+    return updated
+
+
+def fetch_changed(ranges, fetch):
+    """
+    Fetch only the tabs that changed since they were written to disk
+    Returns (frames, changed) where changed lists the (sheet_name, range_name) pairs downloaded
+
+    The workbook revision (Drive version/modifiedTime) is checked first: tabs cached at the
+    current revision are read from disk and only the rest are downloaded, so a refresh with
+    no edits in the workbook costs one metadata call. The revision is read before fetching,
+    so an edit made mid-fetch is picked up next time instead of being stamped onto older data.
+    Changed append-only tabs are extended with their new rows where possible (fetch_appended).
+    Concurrent callers share one download per tab and one revision lookup (SingleFlight).
+    """
+    revision = _flights.do('revision', sheets_client.get_spreadsheet_revision) if SKIP_UNCHANGED_TABS else None
+
+    frames = {}
+    changed = []
+    for sheet_name, range_name in ranges:
+        if revision is not None:
+            meta = read_meta(sheets_client.SPREADSHEET_ID, sheet_name, range_name)
+            if meta and meta.get('revision') == revision:
+                df, _ = read_tab(sheets_client.SPREADSHEET_ID, sheet_name, range_name)
+                if df is not None:
+                    frames[sheet_name] = df
+                    continue
+        changed.append((sheet_name, range_name))
+
+    if changed:
+        # Tabs another session is already downloading at this revision are waited on,
+        # the rest are downloaded here (and shared with anyone who asks meanwhile)
+        owned, waiting = _flights.claim((sheet_name, range_name, revision) for sheet_name, range_name in changed)
+        mine = tuple((sheet_name, range_name) for sheet_name, range_name, _ in owned)
+        try:
+            downloaded = _download(mine, fetch, revision) if mine else {}
+        except Exception as e:
+            _flights.resolve(owned, error=e)
+            raise
+        _flights.resolve(owned, {key: downloaded.get(key[0]) for key in owned})
+
+        frames.update(downloaded)
+        for (sheet_name, _, _), future in waiting.items():
+            frames[sheet_name] = future.result()
+        changed = tuple(changed)
+
+    return frames, changed
+
+
+def _download(ranges, fetch, revision):
+    """Download ranges from Google (appending where possible) and write them to disk"""
+    frames = fetch_appended(ranges, revision=revision)
+
+    full_reload = tuple(pair for pair in ranges if pair[0] not in frames)
+    if full_reload:
+        fetched = fetch(full_reload)
+        write_tabs(full_reload, fetched, revision=revision)
+        frames.update(fetched)
+
+    return frames
+
+
+def _refresh_in_background(ranges, fetch, on_refresh):
+    """Pull the live copy of ranges on a daemon thread, then hand it to the next cache miss"""
+    def run():
+        try:
+            frames, changed = fetch_changed(ranges, fetch)
+        except Exception as e:
+            logger.warning("Background refresh of %s failed: %s", [name for name, _ in ranges], e)
+            return
+        if not changed:
+            # Disk copy was already current - nothing to swap in
+            return
+        with _lock:
+            _background_results[ranges] = frames
+        if on_refresh is not None:
+            on_refresh()
+
+    threading.Thread(target=run, name="sheet-cache-refresh", daemon=True).start()
+
+
+def load_tabs(ranges, fetch=None, on_refresh=None):
+    """
+    Load tabs through the disk cache
+
+    - First request for ranges after a restart: serve the disk copy immediately (if every
+      tab is on disk) and refresh from Google in the background. on_refresh is called once
+      the fresh copy is ready - pass something that invalidates the caller's st.cache_data
+      entry (e.g. cache_manager.invalidate_ranges) so the next rerun picks it up.
+    - Later requests: download the tabs that changed since they were cached (see
+      fetch_changed) and write them back to disk. If that fails (quota, outage) the
+      disk copy is returned instead and stale_error(ranges) reports why.
+
+    ranges: tuple of (sheet_name, range_name) pairs
+    fetch: function(ranges) -> {sheet_name: DataFrame}, defaults to a batched Sheets call
+    """
+    ranges = tuple(ranges)
+    fetch = fetch or sheets_client.batch_get_frames
+
+    with _lock:
+        fresh = _background_results.pop(ranges, None)
+        first_request = ranges not in _requested
+        _requested.add(ranges)
+    if fresh is not None:
+        return fresh
+
+    if first_request:
+        cached = read_tabs(ranges)
+        if cached is not None:
+            _refresh_in_background(ranges, fetch, on_refresh)
+            return cached
+
+    try:
+        frames, _ = fetch_changed(ranges, fetch)
+    except Exception as e:
+        # Throttled / API down: serve the last good copy rather than blanking the view
+        cached = read_tabs(ranges)
+        if cached is None:
+            raise
+        logger.warning("Serving cached %s, fetch failed: %s", [name for name, _ in ranges], e)
+        with _lock:
+            _stale[ranges] = str(e)
+        return cached
+
+    with _lock:
+        _stale.pop(ranges, None)
+    return frames
+
+
+def stale_error(ranges):
+    """Error text if ranges were last served from disk because the fetch failed, else None"""
+    with _lock:
+        return _stale.get(tuple(ranges))
+
+
+# ========== BACKGROUND REFRESHER ==========
+
+def refresh_if_changed(ranges, fetch=None):
+    """
+    Bring the disk copy of ranges up to date (see fetch_changed) and report what changed
+    Returns the sheet names whose content differs from what was on disk before. The fresh
+    frames are handed to the next load_tabs(ranges) call, like a startup refresh.
+    """
+    ranges = tuple(ranges)
+    before = {
+        sheet_name: (read_meta(sheets_client.SPREADSHEET_ID, sheet_name, range_name) or {}).get('content_hash')
+        for sheet_name, range_name in ranges
+    }
+    frames, _ = fetch_changed(ranges, fetch or sheets_client.batch_get_frames)
+
+    changed = []
+    for sheet_name, range_name in ranges:
+        meta = read_meta(sheets_client.SPREADSHEET_ID, sheet_name, range_name) or {}
+        if meta.get('content_hash') != before[sheet_name]:
+            changed.append(sheet_name)
+    if changed:
+        with _lock:
+            _background_results[ranges] = frames
+    return changed
+
+
+def start_background_refresher(ranges, on_change, interval_minutes=None, fetch=None):
+    """
+    Start a daemon thread (once per process per ranges) that calls refresh_if_changed every
+    interval_minutes (default BACKGROUND_REFRESH_MINUTES) and, when any tab changed,
+    on_change(changed_sheet_names) - e.g. bump the tabs' cache generation and rebuild the
+    cached datasets so the next page load is served from memory.
+    Returns False (and starts nothing) when the interval is 0.
+    """
+    interval = BACKGROUND_REFRESH_MINUTES if interval_minutes is None else interval_minutes
+    if interval <= 0:
+        return False
+    ranges = tuple(ranges)
+    with _lock:
+        if ranges in _refreshers:
+            return True
+        _refreshers[ranges] = None
+
+    def run():
+        while True:
+            time.sleep(interval * 60)
+            try:
+                changed = refresh_if_changed(ranges, fetch)
+            except Exception as e:
+                # Keep serving the last good version, try again next interval
+                logger.warning("Background refresh of %s failed: %s", [name for name, _ in ranges], e)
+                continue
+            with _lock:
+                _refreshers[ranges] = datetime.now(timezone.utc)
+            if changed:
+                try:
+                    on_change(changed)
+                except Exception as e:
+                    logger.warning("Background refresh callback failed: %s", e)
+
+    threading.Thread(target=run, name="sheet-cache-refresher", daemon=True).start()
+    return True
+
+
+def background_checked_at(ranges):
+    """Time (UTC) the background refresher last confirmed ranges are current, or None"""
+    with _lock:
+        return _refreshers.get(tuple(ranges))
+
+
+def cached_fetch_times(ranges):
+    """Map sheet name -> fetch time (UTC datetime) of the disk copy, for the sync status panel"""
+    times = {}
+    for sheet_name, range_name in ranges:
+        meta = read_meta(sheets_client.SPREADSHEET_ID, sheet_name, range_name)
+        if meta and meta.get('fetched_at'):
+            times[sheet_name] = datetime.fromisoformat(meta['fetched_at'])
+    return times
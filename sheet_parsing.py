@@ -0,0 +1,163 @@
+"""
+Sheet Value Parsing
+Vectorized helpers that turn columns read from Google Sheets into typed pandas columns.
+
+Tabs are fetched with valueRenderOption=UNFORMATTED_VALUE and
+dateTimeRenderOption=SERIAL_NUMBER (see sheets_client), so numbers arrive as numbers and
+dates as serial day counts. Cells typed as text in the sheet still arrive as strings,
+so every helper accepts both.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Day 0 of Google Sheets (and Excel) serial dates
+SHEETS_EPOCH = pd.Timestamp('1899-12-30')
+
+# ========== DATE FORMAT REGISTRY ==========
+# Explicit formats tried, in order, on date cells that still arrive as text.
+# An explicit format parses a whole column in one pass; only cells none of them match
+# fall back to pd.to_datetime format inference.
+DEFAULT_DATE_FORMATS = ('%m/%d/%Y', '%m/%d/%y', 'ISO8601')
+
+# Per-column overrides (NetSuite exports US dates, HubSpot exports ISO timestamps)
+DATE_COLUMN_FORMATS = {
+    'Order Start Date': ('%m/%d/%Y', '%m/%d/%y'),
+    'Customer Promise Date': ('%m/%d/%Y', '%m/%d/%y'),
+    'Projected Date': ('%m/%d/%Y', '%m/%d/%y'),
+    'Pending Approval Date': ('%m/%d/%Y', '%m/%d/%y', 'ISO8601'),
+    'Estimated Ship Date': ('%m/%d/%Y', '%m/%d/%y'),
+    'Transaction Date': ('%m/%d/%Y', '%m/%d/%y'),
+    'Date': ('%m/%d/%Y', '%m/%d/%y'),
+    'Invoice_Date': ('%m/%d/%Y', '%m/%d/%y'),
+    'Close Date': ('ISO8601', '%m/%d/%Y', '%m/%d/%y'),
+}
+
+# Years before this are 2-digit-year misparses (26 -> 1926) and get 100 years added
+CENTURY_CUTOFF_YEAR = 2000
+
+
+def date_formats_for(column_name):
+    """Explicit formats to try for a column (registry entry or the defaults)"""
+    return DATE_COLUMN_FORMATS.get(column_name, DEFAULT_DATE_FORMATS)
+
+
+def correct_century(dates, cutoff_year=CENTURY_CUTOFF_YEAR):
+    """
+    Add 100 years to dates before cutoff_year (e.g. 1926 -> 2026)
+    Done as month arithmetic on the datetime64 values: +1200 months keeps the day of
+    month, and every month is at least as long 100 years later, so no clipping is needed.
+    """
+    mask = (dates.dt.year < cutoff_year).to_numpy()
+    if not mask.any():
+        return dates
+
+    values = dates.to_numpy()
+    days = values.astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    shifted = (months + 1200).astype('datetime64[D]') + (days - months.astype('datetime64[D]')) + (values - days)
+
+    return pd.Series(np.where(mask, shifted, values), index=dates.index, name=dates.name)
+
+
+def _naive(dates):
+    """
+    Timestamps with an offset (HubSpot's "...Z" exports) as naive UTC, so they fit the
+    naive datetime64 column; naive text is parsed as UTC, so its wall time is unchanged
+    """
+    return dates.dt.tz_localize(None)
+
+
+def _parse_text_dates(text, formats):
+    """Parse text date cells: explicit formats first, inference only for leftovers"""
+    text = text.astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+
+    remaining = text[text != '']
+    for fmt in formats:
+        if remaining.empty:
+            break
+        attempt = _naive(pd.to_datetime(remaining, format=fmt, errors='coerce', utc=True))
+        matched = attempt.notna()
+        parsed.loc[attempt.index[matched]] = attempt[matched]
+        remaining = remaining[~matched]
+
+    # Leftovers with digits in them (odd formats) are parsed one by one; pure text
+    # like "No Date" is left as NaT without paying for elementwise parsing
+    remaining = remaining[remaining.str.contains(r'\d', regex=True)]
+    if not remaining.empty:
+        attempt = _naive(pd.to_datetime(remaining, format='mixed', errors='coerce', utc=True))
+        parsed.loc[remaining.index] = attempt
+
+    return parsed
+
+
+def parse_sheet_dates(values, formats=None, fix_century=False):
+    """
+    Parse a date column read from Sheets into datetime64
+    - Serial day numbers convert in one vectorized step (time of day dropped, like the
+      date-only display strings they replace)
+    - Text cells are parsed with the column's explicit formats (see DATE_COLUMN_FORMATS)
+    - Columns that are already datetime64 are returned unchanged, so parsing once in
+      load_all_data is enough - downstream calls are free
+    fix_century applies correct_century to the parsed result.
+    Unparseable cells become NaT.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    serials = pd.to_numeric(series, errors='coerce')
+    dates = SHEETS_EPOCH + pd.to_timedelta(np.floor(serials), unit='D')
+
+    text_mask = serials.isna() & series.notna()
+    if text_mask.any():
+        text_dates = _parse_text_dates(series[text_mask], formats or date_formats_for(series.name))
+        dates = dates.where(~text_mask, text_dates)
+
+    dates = dates.rename(series.name)
+    if fix_century:
+        dates = correct_century(dates)
+    return dates
+
+
+def parse_numeric(values):
+    """
+    Parse an amount/quantity column read from Sheets into float64
+    - Numbers from the typed fetch pass straight through
+    - Text cells are cleaned with vectorized regexes: "$", thousands separators and
+      spaces are stripped, and accounting negatives like "(1,234.00)" become -1234.00
+    Blanks, "#N/A" and anything else unparseable become 0.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype('float64').fillna(0.0)
+
+    numbers = pd.to_numeric(series, errors='coerce')
+
+    text_mask = numbers.isna() & series.notna()
+    if text_mask.any():
+        cleaned = (
+            series[text_mask].astype(str)
+            .str.replace(r'[\s$,]', '', regex=True)
+            .str.replace(r'^\((.*)\)$', r'-\1', regex=True)
+        )
+        numbers = numbers.where(~text_mask, pd.to_numeric(cleaned, errors='coerce'))
+
+    return numbers.astype('float64').fillna(0.0).rename(series.name)
+
+
+# ========== COMPACT DTYPES ==========
+
+def to_categories(df, columns):
+    """
+    Store repeated label columns (reps, statuses, pipelines, customers...) as pandas category
+    - each distinct string is kept once per column instead of once per row
+    - == / isin filters on them compare integer codes instead of Python strings
+    Columns df doesn't have are skipped. Writing a value that isn't already a category
+    raises, so cast back with astype(object) before filling in new labels.
+    """
+    for col in columns:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
@@ -0,0 +1,188 @@
+"""
+Sheet Schemas
+Maps each tab's header row to canonical column names once. A schema lists its fields by
+position (a fixed sheet column) or by header match, optionally with a fallback column;
+the resolved mapping is cached per header row, so the substring scans run once per layout
+instead of on every rerun.
+A required field that can't be found raises SchemaError naming the tab and the field,
+instead of downstream code silently working on an empty column.
+"""
+
+import threading
+
+import pandas as pd
+
+
+class SchemaError(ValueError):
+    """A tab's header row no longer has the columns its schema requires"""
+
+
+class Field:
+    """
+    One canonical column of a tab
+    - position: 0-based sheet column (A = 0) - always wins, like the old positional renames
+    - match: predicate on the stripped, lower-cased header - first unclaimed match wins
+    - both: the column at position, only if its header matches
+    - fallback: 0-based column used when no header matches (match-only fields)
+    """
+
+    def __init__(self, name, position=None, match=None, required=False, fallback=None):
+        self.name = name
+        self.position = position
+        self.match = match
+        self.required = required
+        self.fallback = fallback
+
+
+class ResolvedSchema:
+    """Where each field lives in one concrete header row"""
+
+    def __init__(self, tab, headers, positions, missing):
+        self.tab = tab
+        self.headers = headers
+        # Canonical name -> 0-based column position
+        self.positions = positions
+        # Optional fields this header row doesn't have
+        self.missing = missing
+
+    def has(self, name):
+        return name in self.positions
+
+    def apply(self, df):
+        """df with the canonical names in place of the mapped headers (renamed by position)"""
+        names = list(self.headers)
+        for name, position in self.positions.items():
+            names[position] = name
+        renamed = df.copy(deep=False)
+        renamed.columns = names
+        return renamed
+
+
+class TabSchema:
+    def __init__(self, tab, fields):
+        self.tab = tab
+        self.fields = fields
+
+    def resolve(self, headers):
+        """Resolved schema for a header row (cached per distinct header row)"""
+        headers = tuple(str(header) for header in headers)
+        key = (self.tab, headers)
+        with _lock:
+            resolved = _resolved.get(key)
+        if resolved is None:
+            resolved = self._resolve(headers)
+            with _lock:
+                _resolved[key] = resolved
+        return resolved
+
+    def apply(self, df):
+        """Validate df's header row and rename its columns to the canonical names"""
+        return self.resolve(df.columns).apply(df)
+
+    def _resolve(self, headers):
+        normalized = [header.strip().lower() for header in headers]
+        positions = {}
+        claimed = set()
+
+        # Fixed positions first - they override any header match
+        for field in self.fields:
+            if field.position is None or field.position >= len(headers):
+                continue
+            if field.match is None or field.match(normalized[field.position]):
+                positions[field.name] = field.position
+                claimed.add(field.position)
+
+        for field in self.fields:
+            if field.name in positions or field.match is None or field.position is not None:
+                continue
+            for position, header in enumerate(normalized):
+                if position not in claimed and field.match(header):
+                    positions[field.name] = position
+                    claimed.add(position)
+                    break
+
+        # Fallback columns last, so they never take a column another field matched by name
+        for field in self.fields:
+            if field.name in positions or field.fallback is None:
+                continue
+            if field.fallback < len(headers) and field.fallback not in claimed:
+                positions[field.name] = field.fallback
+                claimed.add(field.fallback)
+
+        missing = [field.name for field in self.fields if field.name not in positions]
+        missing_required = [field.name for field in self.fields if field.required and field.name not in positions]
+        if missing_required:
+            raise SchemaError(
+                f"'{self.tab}' tab is missing required column(s): {', '.join(missing_required)} "
+                f"(found {len(headers)} columns: {', '.join(headers[:12])}{'...' if len(headers) > 12 else ''})"
+            )
+
+        return ResolvedSchema(self.tab, headers, positions, missing)
+
+
+_lock = threading.Lock()
+
+# (tab, header row) -> ResolvedSchema
+_resolved = {}
+
+
+def column(df, name, default=None):
+    """df[name], or a column of default aligned to df when the tab doesn't have that field"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+# ========== TAB SCHEMAS ==========
+
+SALES_ORDERS = TabSchema("NS Sales Orders", [
+    Field('Internal ID', position=0, match=lambda h: 'internal' in h and 'id' in h),  # Column A
+    Field('Document Number', position=1),                                # Column B: SO#
+    Field('Status', position=2, match=lambda h: 'status' in h, required=True),          # Column C
+    Field('Amount', position=7, match=lambda h: 'amount' in h or 'total' in h,
+          required=True),                                                # Column H: Amount (Transaction Total)
+    Field('Sales Rep', match=lambda h: 'sales rep' in h or 'salesrep' in h),
+    Field('Customer', match=lambda h: 'customer' in h and 'customer promise' not in h),
+    Field('PI_CSM', match=lambda h: ('pi' in h and 'csm' in h) or h == 'pi || csm'),
+    Field('Order Start Date', position=8, required=True),               # Column I
+    Field('Pending Fulfillment Date', position=9),                       # Column J
+    Field('Customer Promise Date', position=11),                         # Column L
+    Field('Projected Date', position=12),                                # Column M
+    Field('Order Type', position=17),                                    # Column R
+    Field('Calyx External Order', position=28),                          # Column AC
+    Field('Pending Approval Date', position=29),                         # Column AD
+    Field('Corrected Customer Name', position=30),                       # Column AE
+    Field('Rep Master', position=31),                                    # Column AF
+])
+
+# Commission money is read by header name (as the commission calculator always did); the
+# dashboard's old positional columns are only the fallback when a header is renamed
+INVOICES = TabSchema("NS Invoices", [
+    Field('Invoice Number', match=lambda h: h == 'document number', fallback=0, required=True),   # Column A
+    Field('Status', match=lambda h: h == 'status', fallback=1, required=True),                    # Column B
+    Field('Date', match=lambda h: h == 'date', fallback=2, required=True),                        # Column C
+    Field('Created From', match=lambda h: h == 'created from', fallback=4, required=True),        # Column E
+    Field('Customer', position=6, required=True),                                                 # Column G
+    Field('Amount', match=lambda h: h == 'amount (transaction total)', fallback=10, required=True),  # Column K
+    Field('Original Sales Rep', match=lambda h: h == 'sales rep', fallback=14, required=True),    # Column O
+    Field('Corrected Customer Name', match=lambda h: h == 'corrected customer name', fallback=19),  # Column T
+    Field('Rep Master', match=lambda h: h == 'rep master', fallback=20),                          # Column U
+    Field('HubSpot_Pipeline', match=lambda h: 'hubspot' in h and 'pipeline' in h),
+    Field('CSM', match=lambda h: 'csm' in h),
+    Field('Date Closed', match=lambda h: h == 'date closed'),
+    Field('Tax Amount', match=lambda h: h == 'amount (transaction tax total)'),
+    Field('Shipping Amount', match=lambda h: h == 'amount (shipping)'),
+])
+
+CONCENTRATE = TabSchema("Concentrate Jar Forecasting", [
+    Field('Close Date', match=lambda h: 'close date' in h, required=True),
+    Field('Quantity', match=lambda h: h == 'quantity', required=True),
+    Field('Product Name', match=lambda h: h == 'product name'),
+    Field('Product', match=lambda h: h == 'product'),
+    Field('Amount', match=lambda h: h == 'amount', required=True),
+    Field('Close Status', match=lambda h: 'close status' in h),
+    Field('Pipeline', match=lambda h: h == 'pipeline'),
+    Field('Deal Stage', match=lambda h: 'deal stage' in h),
+    Field('Company Name', match=lambda h: 'company name' in h),
+    Field('Company Owner', match=lambda h: 'company owner' in h),
+])
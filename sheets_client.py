@@ -0,0 +1,351 @@
+"""
+Shared Google Sheets Client
+Builds the service account credentials and the Sheets discovery client once per process
+and hands out pooled HTTP connections, so the main dashboard, the commission calculator
+and the concentrate jar forecast all reuse the same client instead of rebuilding it on
+every cache miss.
+"""
+
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import httplib2
+import pandas as pd
+import streamlit as st
+from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+# Google Sheets Configuration (shared by every module)
+SPREADSHEET_ID = "12s-BanWrT_N8SuB3IXFp5JF-xPYB2I-YjmYAYaWsxJk"
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets.readonly',
+    # Lets us read the workbook's modifiedTime/version to skip refetching unchanged tabs
+    'https://www.googleapis.com/auth/drive.metadata.readonly',
+]
+
+# Typed fetch: numbers arrive as numbers and dates as serial day numbers (days since
+# 1899-12-30) instead of display strings like "$1,234.00" / "1/5/26".
+# Date columns are converted with sheet_parsing.parse_sheet_dates.
+VALUE_RENDER_OPTION = 'UNFORMATTED_VALUE'
+DATETIME_RENDER_OPTION = 'SERIAL_NUMBER'
+
+# Seconds before an HTTP request to Google gives up
+HTTP_TIMEOUT = 60
+
+# Ranges per batchGet request. Up to this many tabs go out in one round trip (one read
+# against the quota); longer range lists are split into chunks fetched in parallel.
+FETCH_CHUNK_SIZE = max(1, int(os.environ.get("SHEETS_FETCH_CHUNK_SIZE", "8")))
+
+# Max chunk requests in flight at once (keeps us well inside the per-minute read quota).
+# Set SHEETS_FETCH_CONCURRENCY=1 to always fetch everything in a single batchGet.
+FETCH_CONCURRENCY = max(1, int(os.environ.get("SHEETS_FETCH_CONCURRENCY", "4")))
+
+# ========== QUOTA HANDLING ==========
+# Sheets read quota is 60 requests/minute per user (the service account is one user)
+# and 300/minute per project. Every values request waits for a token first.
+SHEETS_READS_PER_MINUTE = int(os.environ.get("SHEETS_READS_PER_MINUTE", "60"))
+
+# Throttling (429) and server errors are retried with exponential backoff + full jitter,
+# honouring Retry-After (up to BACKOFF_MAX_SECONDS) when Google sends it
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 1
+BACKOFF_MAX_SECONDS = 32
+
+# After this many requests in a row fail even with retries, stop calling the API for
+# CIRCUIT_RESET_SECONDS - callers serve the last good disk copy meanwhile (sheet_cache)
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_SECONDS = 60
+
+# httplib2 connections are not thread-safe, so each request borrows one from this pool.
+# Idle connections stay open (keep-alive) and are reused by the next request.
+_http_pool = queue.LifoQueue()
+
+# Fetch threads, created on first parallel fetch and reused for the life of the process
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+class SheetsUnavailableError(Exception):
+    """Raised without calling Google while the circuit breaker is open"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: holds up to capacity tokens, refilled continuously at
+    rate_per_minute. acquire() blocks until a token is available.
+    """
+    
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate_per_second
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failed requests; while open, calls fail fast
+    with SheetsUnavailableError. After reset_seconds one trial call is let through
+    (half-open) - success closes the breaker, failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+    
+    def before_call(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                raise SheetsUnavailableError(
+                    f"Google Sheets is throttling or unavailable - retrying in {int(remaining) + 1}s"
+                )
+            # Half-open: let this call through, re-open immediately if it fails
+            self.opened_at = None
+            self.failures = self.failure_threshold - 1
+    
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+    
+    @property
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_seconds
+
+
+# Shared by every Sheets values request in the process
+sheets_read_limiter = TokenBucket(SHEETS_READS_PER_MINUTE)
+sheets_breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+
+
+def has_credentials():
+    """Check whether the GCP service account is configured in Streamlit secrets"""
+    return "gcp_service_account" in st.secrets
+
+
+@st.cache_resource(show_spinner=False)
+def get_credentials():
+    """
+    Service account credentials, created once per process
+    The token is refreshed in place by google-auth when it expires
+    """
+    creds_dict = dict(st.secrets["gcp_service_account"])
+    return service_account.Credentials.from_service_account_info(
+        creds_dict, scopes=SCOPES
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_sheets_service():
+    """
+    Sheets v4 service, built once per process
+    Discovery document parsing happens here only; requests are executed on pooled
+    connections via execute()
+    """
+    return build('sheets', 'v4', credentials=get_credentials(), cache_discovery=False)
+
+
+@st.cache_resource(show_spinner=False)
+def get_drive_service():
+    """Drive v3 service (metadata only), built once per process"""
+    return build('drive', 'v3', credentials=get_credentials(), cache_discovery=False)
+
+
+@contextmanager
+def pooled_http():
+    """Borrow an authorized keep-alive HTTP connection from the process-wide pool"""
+    try:
+        http = _http_pool.get_nowait()
+    except queue.Empty:
+        http = AuthorizedHttp(get_credentials(), http=httplib2.Http(timeout=HTTP_TIMEOUT))
+    try:
+        yield http
+    finally:
+        _http_pool.put(http)
+
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retrying after error, or None if it should not be retried"""
+    if isinstance(error, HttpError):
+        if error.resp.status not in RETRYABLE_STATUSES:
+            return None
+        retry_after = error.resp.get('retry-after')
+        if retry_after and retry_after.isdigit():
+            # Capped - a bogus header must not stall a rerun for minutes
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+    elif not isinstance(error, (OSError, httplib2.HttpLib2Error)):
+        # Timeouts and dropped connections are retried, anything else is a real error
+        return None
+    
+    # Exponential backoff with full jitter so concurrent sessions don't retry in lockstep
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def execute(request, limiter=None, breaker=None):
+    """
+    Execute a googleapiclient request on a pooled connection
+    Throttling, server errors and transport errors are retried with backoff (up to
+    MAX_ATTEMPTS). limiter (TokenBucket) is consulted before every attempt; breaker
+    (CircuitBreaker) fails fast while open and counts requests that exhaust their retries.
+    """
+    if breaker is not None:
+        breaker.before_call()
+    
+    for attempt in range(MAX_ATTEMPTS):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            with pooled_http() as http:
+                result = request.execute(http=http)
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+            if attempt == MAX_ATTEMPTS - 1:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            logger.warning("Google API request failed (%s), retry %d in %.1fs", e, attempt + 1, delay)
+            time.sleep(delay)
+            continue
+        
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+def values_to_dataframe(values):
+    """
+    Convert a Sheets values array (header row first) into a DataFrame
+    """
+    if not values:
+        return pd.DataFrame()
+    
+    # Handle mismatched column counts - pad shorter rows with empty strings
+    if len(values) > 1:
+        max_cols = max(len(row) for row in values)
+        for row in values:
+            while len(row) < max_cols:
+                row.append('')
+    
+    # Convert to DataFrame (typed fetch can return numeric header cells - keep names as text)
+    return pd.DataFrame(values[1:], columns=[str(col) for col in values[0]])
+
+
+def get_fetch_pool():
+    """Bounded thread pool shared by every parallel tab fetch"""
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(
+                max_workers=FETCH_CONCURRENCY, thread_name_prefix="sheets-fetch"
+            )
+        return _fetch_pool
+
+
+def batch_get_values(ranges):
+    """
+    Fetch raw values for several A1 ranges (e.g. "NS Invoices!A2:U")
+    Up to FETCH_CHUNK_SIZE ranges are fetched in a single batchGet round trip. Longer lists
+    are split into chunks of that size, fetched in parallel on the fetch pool (at most
+    FETCH_CONCURRENCY in flight), so wall-clock time is roughly that of the slowest chunk.
+    Values are typed (see VALUE_RENDER_OPTION / DATETIME_RENDER_OPTION).
+    Returns a list of values arrays in the same order as ranges. Raises on API errors.
+    """
+    ranges = list(ranges)
+    if len(ranges) <= FETCH_CHUNK_SIZE or FETCH_CONCURRENCY <= 1:
+        return _batch_get(ranges)
+    
+    chunks = [ranges[start:start + FETCH_CHUNK_SIZE] for start in range(0, len(ranges), FETCH_CHUNK_SIZE)]
+    # Build the client and credentials here so worker threads only read cached resources
+    get_sheets_service()
+    futures = [get_fetch_pool().submit(_batch_get, chunk) for chunk in chunks]
+    # result() re-raises the first API error; ranges stay in request order
+    return [values for future in futures for values in future.result()]
+
+
+def _batch_get(ranges):
+    """One values().batchGet round trip for the given A1 ranges"""
+    service = get_sheets_service()
+    result = execute(service.spreadsheets().values().batchGet(
+        spreadsheetId=SPREADSHEET_ID,
+        ranges=ranges,
+        valueRenderOption=VALUE_RENDER_OPTION,
+        dateTimeRenderOption=DATETIME_RENDER_OPTION
+    ), limiter=sheets_read_limiter, breaker=sheets_breaker)
+    
+    # valueRanges come back in the same order as the requested ranges
+    value_ranges = result.get('valueRanges', [])
+    values = [value_range.get('values', []) for value_range in value_ranges]
+    return values + [[] for _ in range(len(ranges) - len(values))]
+
+
+def batch_get_frames(ranges):
+    """
+    Fetch several tabs in one batchGet (chunked and parallel for long lists, see batch_get_values)
+    
+    ranges: sequence of (sheet_name, range_name) pairs
+    Returns a dict mapping sheet name -> DataFrame (empty DataFrame if the tab had no data).
+    Raises on API errors - callers decide how to surface them.
+    """
+    all_values = batch_get_values([f"{sheet_name}!{range_name}" for sheet_name, range_name in ranges])
+    
+    frames = {sheet_name: pd.DataFrame() for sheet_name, _ in ranges}
+    for (sheet_name, _), values in zip(ranges, all_values):
+        frames[sheet_name] = values_to_dataframe(values)
+    return frames
+
+
+def get_spreadsheet_revision():
+    """
+    Cheap change marker for the whole workbook: Drive version + modifiedTime
+    Any edit to any tab bumps it. Returns None if Drive metadata is unavailable
+    (e.g. the Drive API is not enabled for the project) - callers then refetch everything.
+    """
+    try:
+        result = execute(get_drive_service().files().get(
+            fileId=SPREADSHEET_ID,
+            fields='version,modifiedTime',
+            supportsAllDrives=True
+        ))
+    except Exception as e:
+        logger.warning("Could not read spreadsheet revision from Drive: %s", e)
+        return None
+    return f"{result.get('version', '')}@{result.get('modifiedTime', '')}"
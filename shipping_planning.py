@@ -30,58 +30,49 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from datetime import datetime, timedelta
+import cache_manager
+import sheets_client
+import sheet_cache
+import sheet_schema
+from sheet_parsing import parse_numeric, parse_sheet_dates
 
-# Google Sheets Configuration (same as main dashboard)
-SPREADSHEET_ID = "12s-BanWrT_N8SuB3IXFp5JF-xPYB2I-YjmYAYaWsxJk"
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+# Google Sheets Configuration (same as main dashboard - shared client in sheets_client)
+SPREADSHEET_ID = sheets_client.SPREADSHEET_ID
 CACHE_TTL = 3600
 CACHE_VERSION = "concentrate_v3"
 
+# Tab this view reads (refreshable from the main dashboard's Sync Status panel)
+CONCENTRATE_RANGES = (("Concentrate Jar Forecasting", "A:O"),)
+cache_manager.register_dataset("Concentrate Jar Forecast", CONCENTRATE_RANGES)
+
 # =============================================================================
 # DATA LOADING
 # =============================================================================
 
-@st.cache_data(ttl=CACHE_TTL)
-def load_concentrate_data(version=CACHE_VERSION):
+@st.cache_data(ttl=CACHE_TTL, max_entries=4)
+def load_concentrate_data(version=CACHE_VERSION, generation=()):
     """
     Load data from Concentrate Jar Forecasting tab in Google Sheets
     """
     try:
-        if "gcp_service_account" not in st.secrets:
+        if not sheets_client.has_credentials():
             st.error("❌ Missing Google Cloud credentials")
             return pd.DataFrame()
         
-        creds_dict = dict(st.secrets["gcp_service_account"])
-        creds = service_account.Credentials.from_service_account_info(
-            creds_dict, scopes=SCOPES
-        )
-        
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
-        
         # Load from Concentrate Jar Forecasting tab - columns A:O
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range="Concentrate Jar Forecasting!A:O"
-        ).execute()
+        # (served from the on-disk tab cache after a restart, see sheet_cache)
+        ranges = CONCENTRATE_RANGES
+        frames = sheet_cache.load_tabs(ranges, on_refresh=lambda: cache_manager.invalidate_ranges(ranges))
+        df = frames["Concentrate Jar Forecasting"]
         
-        values = result.get('values', [])
+        if sheet_cache.stale_error(ranges):
+            st.warning("⚠️ Google Sheets is unavailable - showing the last saved copy of the forecast tab")
         
-        if not values:
+        if len(df.columns) == 0:
             st.warning("⚠️ No data found in 'Concentrate Jar Forecasting' tab")
             return pd.DataFrame()
         
-        # Pad rows to match column count
-        if len(values) > 1:
-            max_cols = max(len(row) for row in values)
-            for row in values:
-                while len(row) < max_cols:
-                    row.append('')
-        
-        df = pd.DataFrame(values[1:], columns=values[0])
         return df
         
     except Exception as e:
@@ -89,17 +80,6 @@ def load_concentrate_data(version=CACHE_VERSION):
         return pd.DataFrame()
 
 
-def clean_numeric(value):
-    """Clean and convert value to numeric"""
-    if pd.isna(value) or str(value).strip() == '':
-        return 0
-    cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-    try:
-        return float(cleaned)
-    except:
-        return 0
-
-
 def format_number(value, include_dollar=False):
     """
     Format numbers with K or M suffix.
@@ -126,35 +106,11 @@ def process_concentrate_data(df):
     if df.empty:
         return df
     
-    # Standardize column names (handle variations)
-    col_mapping = {}
-    for col in df.columns:
-        col_lower = col.lower().strip()
-        if 'close date' in col_lower or col_lower == 'close date':
-            col_mapping[col] = 'Close Date'
-        elif col_lower == 'quantity':
-            col_mapping[col] = 'Quantity'
-        elif col_lower == 'product name':
-            col_mapping[col] = 'Product Name'
-        elif col_lower == 'product' and 'product name' not in col_lower:
-            col_mapping[col] = 'Product'
-        elif col_lower == 'amount':
-            col_mapping[col] = 'Amount'
-        elif 'close status' in col_lower:
-            col_mapping[col] = 'Close Status'
-        elif col_lower == 'pipeline':
-            col_mapping[col] = 'Pipeline'
-        elif 'deal stage' in col_lower:
-            col_mapping[col] = 'Deal Stage'
-        elif 'company name' in col_lower:
-            col_mapping[col] = 'Company Name'
-        elif 'company owner' in col_lower:
-            col_mapping[col] = 'Company Owner'
-    
-    df = df.rename(columns=col_mapping)
+    # Standardize column names (mapping resolved once per header row - see sheet_schema)
+    df = sheet_schema.CONCENTRATE.apply(df)
     
     # Parse Close Date
-    df['Close Date'] = pd.to_datetime(df['Close Date'], errors='coerce')
+    df['Close Date'] = parse_sheet_dates(df['Close Date'])
     df = df[df['Close Date'].notna()].copy()
     
     # Add time-based columns
@@ -166,8 +122,8 @@ def process_concentrate_data(df):
     df['MonthLabel'] = df['Close Date'].dt.strftime('%b %Y')
     
     # Clean numeric columns
-    df['Quantity'] = df['Quantity'].apply(clean_numeric)
-    df['Amount'] = df['Amount'].apply(clean_numeric)
+    df['Quantity'] = parse_numeric(df['Quantity'])
+    df['Amount'] = parse_numeric(df['Amount'])
     
     return df
 
@@ -1488,7 +1444,7 @@ def main():
     
     # Load data
     with st.spinner("Loading Concentrate Jar Forecasting data..."):
-        raw_df = load_concentrate_data()
+        raw_df = load_concentrate_data(generation=cache_manager.generation(CONCENTRATE_RANGES))
     
     if raw_df.empty:
         st.error("❌ No data found. Please ensure the 'Concentrate Jar Forecasting' tab exists in your Google Sheet.")
@@ -1496,7 +1452,11 @@ def main():
         return
     
     # Process data
-    df = process_concentrate_data(raw_df)
+    try:
+        df = process_concentrate_data(raw_df)
+    except sheet_schema.SchemaError as e:
+        st.error(f"❌ {e}")
+        return
     
     if df.empty:
         st.error("❌ Could not process data. Check date format in 'Close Date' column.")
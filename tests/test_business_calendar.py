@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import business_calendar as bc
+
+
+def _baseline_before(date, days):
+    """What the old pd.offsets.CustomBusinessDay cutoff returned"""
+    holidays = list(bc.HOLIDAYS)
+    return pd.Timestamp(date) - pd.offsets.CustomBusinessDay(days, holidays=holidays)
+
+
+@pytest.mark.parametrize("date", ["2026-03-31", "2026-12-31", "2019-03-29", "2031-03-31", "2035-06-30"])
+def test_business_days_before_scalar_inside_and_outside_index(date):
+    result = bc.business_days_before(pd.Timestamp(date), 10)
+    assert isinstance(result, pd.Timestamp)
+    assert result == _baseline_before(date, 10)
+
+
+def test_business_days_before_series_spanning_index_edge():
+    dates = pd.Series(pd.to_datetime(["2019-03-29", "2026-03-31", "2031-03-31"]), index=[5, 6, 7])
+    result = bc.business_days_before(dates, 10)
+    assert list(result.index) == [5, 6, 7]
+    assert list(result) == [_baseline_before(date, 10) for date in dates]
+
+
+def test_business_days_in_counts_holidays_and_weekends():
+    # Week of Thanksgiving 2026: Thu + Fri are holidays
+    assert bc.business_days_in("2026-11-23", "2026-11-29") == 3
+    assert bc.business_days_in("2026-11-29", "2026-11-23") == 0
+
+
+def test_business_days_in_outside_index_matches_busday_count():
+    expected = np.busday_count("2018-06-01", "2032-01-01", busdaycal=bc.CALENDAR.busdaycal)
+    assert bc.business_days_in("2018-06-01", "2031-12-31") == expected
+
+
+def test_business_days_between_order_age():
+    start = pd.Series(pd.to_datetime(["2026-03-02", "2026-03-06", None]))
+    ages = bc.business_days_between(start, pd.Timestamp("2026-03-09"))
+    # Placed today is 0 days old, a missing date counts as 0
+    assert list(ages) == [5, 1, 0]
+    assert bc.business_days_between(pd.Timestamp("2026-03-09"), pd.Timestamp("2026-03-09")) == 0
+
+
+def test_business_days_remaining_includes_today():
+    assert bc.business_days_remaining(pd.Timestamp("2026-03-31"), today=pd.Timestamp("2026-03-30")) == 2
+    assert bc.business_days_remaining(pd.Timestamp("2026-03-31"), today=pd.Timestamp("2026-04-01")) == 0
+
+
+def test_is_business_day():
+    assert bc.CALENDAR.is_business_day(pd.Timestamp("2026-07-03")) is False
+    assert bc.CALENDAR.is_business_day(pd.Timestamp("2026-07-06")) is True
+
+
+def test_business_days_before_scalar_date_with_array_of_days():
+    # One period end, one lead time per deal (fulfillment_cutoffs)
+    days = np.array([5, 10, 20])
+    for date in ["2026-03-31", "2031-03-31"]:
+        result = bc.business_days_before(pd.Timestamp(date), days)
+        assert isinstance(result, np.ndarray)
+        assert len(result) == 3
+        assert list(pd.to_datetime(result)) == [_baseline_before(date, int(d)) for d in days]
@@ -0,0 +1,36 @@
+import pandas as pd
+
+import fiscal_periods
+from fiscal_periods import FiscalPeriod, quarter
+
+
+def test_quarter_boundaries():
+    q1 = quarter(2026, 1)
+    assert q1.key == 'Q1 2026'
+    assert (q1.start, q1.end) == (pd.Timestamp('2026-01-01'), pd.Timestamp('2026-03-31'))
+    assert quarter(2025, 4).end == pd.Timestamp('2025-12-31')
+
+
+def test_shift_across_years():
+    assert quarter(2026, 1).shift(-1) == quarter(2025, 4)
+    assert quarter(2025, 4).shift(1) == quarter(2026, 1)
+    assert quarter(2026, 1).shift(-5) == quarter(2024, 4)
+
+
+def test_contains_includes_the_whole_last_day():
+    q1 = quarter(2026, 1)
+    dates = pd.Series(pd.to_datetime(['2025-12-31 23:59', '2026-01-01 00:00', '2026-03-31 23:59', '2026-04-01 00:00', None]))
+    assert list(q1.contains(dates)) == [False, True, True, False, False]
+
+
+def test_current_periods_are_consistent():
+    assert fiscal_periods.PREVIOUS_QUARTER == fiscal_periods.CURRENT_QUARTER.shift(-1)
+    assert fiscal_periods.NEXT_QUARTER.start == fiscal_periods.CURRENT_QUARTER.end_exclusive
+    assert fiscal_periods.HISTORY_YEAR.end == fiscal_periods.CURRENT_QUARTER.start - pd.Timedelta(days=1)
+
+
+def test_fiscal_period_equality_and_repr():
+    period = FiscalPeriod('2025', '2025-01-01', '2025-12-31')
+    assert period == fiscal_periods.fiscal_year(2025)
+    assert len({period, fiscal_periods.fiscal_year(2025)}) == 1
+    assert repr(period) == "FiscalPeriod('2025', 2025-01-01, 2025-12-31)"
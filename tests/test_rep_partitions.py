@@ -0,0 +1,49 @@
+import pandas as pd
+
+import rep_partitions
+
+
+def _deals():
+    df = pd.DataFrame({
+        'Deal Owner': ['Jake', 'Brad', 'Jake', 'Lance', 'Brad'],
+        'Amount': [100.0, 200.0, 300.0, 400.0, 500.0],
+    })
+    df['Deal Owner'] = df['Deal Owner'].astype('category')
+    return rep_partitions.partition(df, 'Deal Owner')
+
+
+def test_rep_rows_uses_partition_on_shallow_copies():
+    df = _deals()
+    view = df.copy(deep=False)
+    assert rep_partitions._partition_for(view, 'Deal Owner') is df.attrs['rep_partition']
+    assert list(rep_partitions.rep_rows(view, 'Deal Owner', 'Jake')['Amount']) == [100.0, 300.0]
+    assert rep_partitions.rep_rows(view, 'Deal Owner', 'Nobody').empty
+
+
+def test_filtered_frame_falls_back_to_mask():
+    df = _deals()
+    filtered = df[df['Amount'] > 150]
+    assert rep_partitions._partition_for(filtered, 'Deal Owner') is None
+    assert list(rep_partitions.rep_rows(filtered, 'Deal Owner', 'Brad')['Amount']) == [200.0, 500.0]
+
+
+def test_sorted_and_reset_frame_is_repartitioned():
+    df = _deals()
+    resorted = df.sort_values('Amount', ascending=False).reset_index(drop=True)
+    assert rep_partitions._partition_for(resorted, 'Deal Owner') is None
+    assert list(rep_partitions.rep_rows(resorted, 'Deal Owner', 'Jake')['Amount']) == [300.0, 100.0]
+
+
+def test_rewritten_rep_column_is_repartitioned():
+    df = _deals().copy(deep=False)
+    # House-account style remap: same index and length, different reps
+    df['Deal Owner'] = df['Deal Owner'].astype(object).replace({'Lance': 'Jake'})
+    assert rep_partitions._partition_for(df, 'Deal Owner') is None
+    assert list(rep_partitions.rep_rows(df, 'Deal Owner', 'Jake')['Amount']) == [100.0, 300.0, 400.0]
+    assert set(rep_partitions.rep_positions(df, 'Deal Owner')) == {'Jake', 'Brad'}
+
+
+def test_in_place_rep_write_is_repartitioned():
+    df = _deals().copy(deep=False)
+    df.loc[df['Amount'] == 500.0, 'Deal Owner'] = 'Jake'
+    assert list(rep_partitions.rep_rows(df, 'Deal Owner', 'Jake')['Amount']) == [100.0, 300.0, 500.0]
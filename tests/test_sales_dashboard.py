@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import business_calendar
+import sales_dashboard
+import sheets_client
+
+Q1_END = pd.Timestamp('2026-03-31')
+
+
+def _deals():
+    return pd.DataFrame({
+        'Product Type': ['Labeled - Custom Lead Time', 'Labeled - Custom Lead Time', 'Flexpack',
+                         'Non-Labeled - 1 Week Lead Time', 'Non-Labeled - 1 Week Lead Time',
+                         'Unmapped Type', np.nan, 'Outer Boxes', 'Flexpack'],
+        'Close Date': pd.to_datetime(['2026-01-20', '2026-03-10', '2026-02-20', '2026-03-24',
+                                      '2026-03-25', '2026-03-30', '2026-03-30', None, '2026-01-05']),
+        'Amount': [1000.0, 2000.0, 300.5, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0],
+    })
+
+
+def _per_type_loop(deals_df):
+    """The per-type pass apply_q1_fulfillment_logic used before it was vectorized"""
+    counts, spillover = pd.Series(True, index=deals_df.index), pd.Series(0.0, index=deals_df.index)
+    for product_type, lead_days in sales_dashboard.LEAD_TIME_DAYS.items():
+        cutoff_date = business_calendar.business_days_before(Q1_END, lead_days)
+        mask = (
+            (deals_df['Product Type'] == product_type) &
+            (deals_df['Close Date'] > cutoff_date) &
+            (deals_df['Close Date'].notna())
+        )
+        counts[mask] = False
+        spillover[mask] = deals_df.loc[mask, 'Amount']
+    return counts, spillover
+
+
+def test_fulfillment_cutoffs_per_deal():
+    deals = _deals()
+    cutoffs = sales_dashboard.fulfillment_cutoffs(deals['Product Type'], Q1_END)
+
+    assert len(cutoffs) == len(deals)
+    for product_type, cutoff in zip(deals['Product Type'], cutoffs):
+        if product_type in sales_dashboard.LEAD_TIME_DAYS:
+            lead_days = sales_dashboard.LEAD_TIME_DAYS[product_type]
+            assert cutoff == business_calendar.business_days_before(Q1_END, lead_days)
+        else:
+            assert np.isnat(cutoff)
+
+
+@pytest.mark.parametrize('as_category', [False, True])
+def test_apply_q1_fulfillment_logic_matches_per_type_loop(as_category):
+    deals = _deals()
+    if as_category:
+        deals['Product Type'] = deals['Product Type'].astype('category')
+    expected_counts, expected_spillover = _per_type_loop(deals)
+
+    result = sales_dashboard.apply_q1_fulfillment_logic(deals.copy())
+
+    assert list(result['Counts_In_Q1']) == list(expected_counts)
+    assert list(result['Q2_Spillover_Amount']) == list(expected_spillover)
+    # Late custom-lead-time and 1-week orders spill; unmapped, blank and undated ones never do
+    assert list(result['Counts_In_Q1']) == [True, False, True, True, False, True, True, True, True]
+
+
+INVOICE_HEADERS = [
+    'Document Number', 'Status', 'Date', 'Date Closed', 'Created From', 'Terms', 'Customer',
+    'Memo', 'Due Date', 'Currency', 'Amount (Transaction Total)', 'Amount (Transaction Tax Total)',
+    'Amount (Shipping)', 'Amount Remaining', 'Sales Rep', 'HubSpot Pipeline', 'CSM',
+    'Class', 'Location', 'Corrected Customer Name', 'Rep Master',
+]
+
+
+def _invoice(number, amount, rep, date=46030):
+    row = [''] * len(INVOICE_HEADERS)
+    row[0], row[1], row[2], row[6] = number, 'Paid In Full', date, 'Acme'
+    row[10], row[14], row[19], row[20] = amount, rep, 'Acme Corp', rep
+    return row
+
+
+def test_credit_memo_reduces_rep_invoice_total():
+    raw_sheets = {
+        'Dashboard Info': sheets_client.values_to_dataframe([
+            ['Rep Name', 'Quota', 'NetSuite Orders'], ['Jake Lynch', 100000, 0], ['Brad Sherman', 50000, 0],
+        ]),
+        'NS Invoices': sheets_client.values_to_dataframe([INVOICE_HEADERS] + [
+            _invoice('INV1', 5000, 'Jake Lynch'),
+            # Accounting-format credit memo, as a text cell - counts as -1,903.00
+            _invoice('CM1', '(1,903.00)', 'Jake Lynch'),
+            _invoice('INV2', 1000.5, 'Jake Lynch'),
+            _invoice('INV3', 200, 'Brad Sherman'),
+            _invoice('INV4', 700, 'Brad Sherman', date=45900),  # Q3 2025 - outside the quarter
+        ]),
+    }
+
+    _, dashboard_df, _, _, _, _ = sales_dashboard.process_all_data(('test-credit-memo',), raw_sheets)
+
+    totals = dict(zip(dashboard_df['Rep Name'], dashboard_df['NetSuite Orders']))
+    assert totals['Jake Lynch'] == pytest.approx(5000 - 1903 + 1000.5)
+    assert totals['Brad Sherman'] == pytest.approx(200)
+
+
+def test_so_bucket_precedence_for_orders_in_several_windows():
+    orders = pd.DataFrame({
+        'Status': ['Pending Fulfillment', 'Pending Fulfillment', 'Pending Fulfillment',
+                   'Pending Approval', 'Pending Approval', 'Pending Approval', 'Closed'],
+        'Customer Promise Date': pd.to_datetime(['2026-02-10', '2025-12-15', '2026-02-10', None, None, None, None]),
+        'Projected Date': pd.to_datetime(['2026-04-15', '2026-04-15', None, None, None, None, None]),
+        'Calyx External Order': ['YES', 'NO', 'YES', '', '', '', ''],
+        'Pending Approval Date': pd.to_datetime([None, None, None, '2026-04-02', '2026-02-02', '2025-11-20', None]),
+        'Age_Business_Days': [0, 0, 0, 20, 20, 20, 0],
+    })
+
+    labels = sales_dashboard.so_bucket_labels(orders)
+
+    assert list(labels.astype(object).fillna('')) == [
+        'pf_q2_spillover',   # Q1 promise date AND Q2 projected date - the Q2 spillover rule comes first
+        'pf_q4_spillover',   # Q4 2025 AND Q2 2026 dates - Q4 spillover wins over Q2
+        'pf_date_ext',
+        'pa_q2_spillover',   # old order with a Q2 PA date - spillover before pa_old
+        'pa_old',            # old order with a Q1 PA date - pa_old before pa_date
+        'pa_q4_spillover',
+        '',
+    ]
+
+
+def test_background_refresh_logs_instead_of_rendering(monkeypatch, caplog):
+    def render(*args, **kwargs):
+        raise AssertionError("rendered a Streamlit element outside a script run")
+
+    for kind in ('warning', 'error', 'info', 'success'):
+        monkeypatch.setattr(sales_dashboard.st, kind, render)
+    monkeypatch.setattr(sheets_client, 'has_credentials', lambda: True)
+    # Dashboard Info comes back empty -> a "No data found" notice
+    monkeypatch.setattr(sales_dashboard.sheet_cache, 'load_tabs', lambda ranges, on_refresh=None: {
+        'Dashboard Info': pd.DataFrame(),
+    })
+    monkeypatch.setattr(sales_dashboard.cache_manager, 'generation', lambda ranges: ('background-test',))
+
+    with caplog.at_level('WARNING', logger='sales_dashboard'):
+        sales_dashboard.on_main_tabs_changed(['Dashboard Info'])
+
+    assert any('No data found in Dashboard Info' in record.getMessage() for record in caplog.records)
@@ -0,0 +1,123 @@
+import pytest
+
+import sheet_cache
+import sheets_client
+
+RANGES = (("NS Invoices", "A:E"),)
+
+
+def _values(rows):
+    """Sheets values array for rows of the typed fetch (ints and floats mixed in a column)"""
+    header = ["Document Number", "Date", "Amount", "Status", "Rep"]
+    body = [
+        [f"INV{i}", 46000 + i, 100 if i % 2 else 99.5, "Paid In Full", "Jake"]
+        for i in range(rows)
+    ]
+    return [header] + body
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_cache, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_row_fingerprints_ignore_int_float_render():
+    assert sheet_cache.row_fingerprints([["A", 100, 2]]) == sheet_cache.row_fingerprints([["A", 100.0, 2.0]])
+    assert sheet_cache.row_fingerprints([["A", 100.5]]) != sheet_cache.row_fingerprints([["A", 100]])
+
+
+def test_appended_rows_take_incremental_path(cache_dir, monkeypatch):
+    stored = _values(120)
+    df = sheets_client.values_to_dataframe([list(row) for row in stored])
+    sheet_cache.write_tabs(RANGES, {"NS Invoices": df})
+
+    # The sheet now has two more rows; the tail request starts at the first overlap row
+    live = _values(122)
+    first_row = 120 - sheet_cache.INCREMENTAL_OVERLAP_ROWS + 2
+    calls = []
+
+    def batch_get_values(ranges):
+        calls.append(list(ranges))
+        return [[list(row) for row in live[first_row - 1:]]]
+
+    monkeypatch.setattr(sheets_client, "batch_get_values", batch_get_values)
+
+    updated = sheet_cache.fetch_appended(RANGES)
+
+    assert calls == [[f"NS Invoices!A{first_row}:E"]]
+    assert len(updated["NS Invoices"]) == 122
+    assert list(updated["NS Invoices"]["Document Number"].tail(2)) == ["INV120", "INV121"]
+
+
+def test_edited_overlap_row_falls_back_to_full_reload(cache_dir, monkeypatch):
+    stored = _values(120)
+    sheet_cache.write_tabs(RANGES, {"NS Invoices": sheets_client.values_to_dataframe([list(row) for row in stored])})
+
+    live = _values(121)
+    live[115][2] = 12345
+    first_row = 120 - sheet_cache.INCREMENTAL_OVERLAP_ROWS + 2
+    monkeypatch.setattr(sheets_client, "batch_get_values",
+                        lambda ranges: [[list(row) for row in live[first_row - 1:]]])
+
+    assert sheet_cache.fetch_appended(RANGES) == {}
+
+
+def _store(rows, **write_kwargs):
+    df = sheets_client.values_to_dataframe([list(row) for row in _values(rows)])
+    sheet_cache.write_tabs(RANGES, {"NS Invoices": df}, **write_kwargs)
+    return df
+
+
+def _serve_tail(monkeypatch, live, calls=None):
+    def batch_get_values(ranges):
+        if calls is not None:
+            calls.append(list(ranges))
+        first_row = int(ranges[0].split("!A")[1].split(":")[0])
+        return [[list(row) for row in live[first_row - 1:]]]
+    monkeypatch.setattr(sheets_client, "batch_get_values", batch_get_values)
+
+
+def test_deleted_rows_fall_back_to_full_reload(cache_dir, monkeypatch):
+    _store(120)
+    _serve_tail(monkeypatch, _values(100))
+    assert sheet_cache.fetch_appended(RANGES) == {}
+
+
+def test_wider_sheet_falls_back_to_full_reload(cache_dir, monkeypatch):
+    _store(120)
+    live = [row + ["extra"] for row in _values(121)]
+    _serve_tail(monkeypatch, live)
+    assert sheet_cache.fetch_appended(RANGES) == {}
+
+
+def test_old_full_fetch_is_not_extended(cache_dir, monkeypatch):
+    _store(120, full_fetched_at="2020-01-01T00:00:00+00:00")
+    calls = []
+    _serve_tail(monkeypatch, _values(121), calls)
+    assert sheet_cache.fetch_appended(RANGES) == {}
+    assert calls == []
+
+
+def test_download_reloads_only_tabs_that_could_not_be_appended(cache_dir, monkeypatch):
+    ranges = RANGES + (("Dashboard Info", "A:C"),)
+    _store(120)
+    _serve_tail(monkeypatch, _values(121))
+    fetched = []
+
+    def fetch(reload_ranges):
+        fetched.append(reload_ranges)
+        return {"Dashboard Info": sheets_client.values_to_dataframe([["Rep", "Quota"], ["Jake", 1000]])}
+
+    frames = sheet_cache._download(ranges, fetch, revision="7@2026-01-01")
+
+    assert fetched == [(("Dashboard Info", "A:C"),)]
+    assert len(frames["NS Invoices"]) == 121
+    # The appended tab is re-fingerprinted, so the next refresh can extend it again
+    meta = sheet_cache.read_meta(sheets_client.SPREADSHEET_ID, "NS Invoices", "A:E")
+    assert meta["rows"] == 121
+    assert meta["revision"] == "7@2026-01-01"
+    calls = []
+    _serve_tail(monkeypatch, _values(123), calls)
+    assert len(sheet_cache.fetch_appended(RANGES)["NS Invoices"]) == 123
+    assert calls == [["NS Invoices!A73:E"]]
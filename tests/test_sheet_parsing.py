@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from sheet_parsing import correct_century, parse_numeric, parse_sheet_dates, to_categories
+
+
+def test_serial_dates_convert_and_drop_time_of_day():
+    dates = parse_sheet_dates(pd.Series([46023, 46023.75, 45658], name='Date'))
+    assert list(dates) == [pd.Timestamp('2026-01-01'), pd.Timestamp('2026-01-01'), pd.Timestamp('2025-01-01')]
+    assert dates.name == 'Date'
+
+
+def test_text_dates_use_column_formats():
+    dates = parse_sheet_dates(pd.Series(['1/5/2026', '1/5/26', '', 'No Date', None], name='Order Start Date'))
+    assert dates.iloc[0] == pd.Timestamp('2026-01-05')
+    assert dates.iloc[1] == pd.Timestamp('2026-01-05')
+    assert dates.iloc[2:].isna().all()
+
+
+def test_mixed_serial_and_text_cells():
+    dates = parse_sheet_dates(pd.Series([46023, '2/1/2026', '2026-03-01'], dtype=object, name='Pending Approval Date'))
+    assert list(dates.dt.strftime('%Y-%m-%d')) == ['2026-01-01', '2026-02-01', '2026-03-01']
+
+
+def test_iso_timestamps_with_offset_become_naive_utc():
+    dates = parse_sheet_dates(pd.Series(['2026-03-01T00:00:00Z', '2026-03-02T05:30:00-07:00', '2026-03-03'], name='Close Date'))
+    assert dates.dt.tz is None
+    assert list(dates) == [pd.Timestamp('2026-03-01'), pd.Timestamp('2026-03-02 12:30'), pd.Timestamp('2026-03-03')]
+
+
+def test_already_parsed_column_is_returned_unchanged():
+    dates = pd.Series(pd.to_datetime(['2026-01-01']))
+    assert parse_sheet_dates(dates) is dates
+
+
+def test_century_fix():
+    dates = pd.Series(pd.to_datetime(['1926-02-28', '2026-02-28', None]))
+    fixed = correct_century(dates)
+    assert fixed.iloc[0] == pd.Timestamp('2026-02-28')
+    assert fixed.iloc[1] == pd.Timestamp('2026-02-28')
+    assert pd.isna(fixed.iloc[2])
+    assert parse_sheet_dates(pd.Series(['1/5/1926']), fix_century=True).iloc[0] == pd.Timestamp('2026-01-05')
+
+
+def test_parse_numeric_typed_and_text_cells():
+    values = pd.Series([1234.5, 100, '$1,234.00', '(1,234.00)', ' 12 ', '', '#N/A', None], dtype=object, name='Amount')
+    assert list(parse_numeric(values)) == [1234.5, 100.0, 1234.0, -1234.0, 12.0, 0.0, 0.0, 0.0]
+    assert parse_numeric(values).name == 'Amount'
+
+
+def test_parse_numeric_numeric_column_passes_through():
+    result = parse_numeric(pd.Series([1, 2, np.nan]))
+    assert result.dtype == 'float64'
+    assert list(result) == [1.0, 2.0, 0.0]
+
+
+def test_to_categories_skips_missing_columns():
+    df = to_categories(pd.DataFrame({'Status': ['Open', 'Open', 'Closed']}), ['Status', 'Sales Rep'])
+    assert isinstance(df['Status'].dtype, pd.CategoricalDtype)
+    assert 'Sales Rep' not in df.columns
@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+
+import sheet_schema
+
+# NS Sales Orders A:AF, laid out as the loaders document it (Column B: SO#, C: Status,
+# H: Amount (Transaction Total), I: Order Start Date, ... AF: Rep Master)
+SALES_ORDER_HEADERS = [
+    'Internal ID', 'Document Number', 'Status', 'Date', 'Customer', 'Sales Rep',
+    'PI || CSM', 'Amount (Transaction Total)', 'Order Start Date', 'Pending Fulfillment Date',
+    'Amount (Transaction Tax Total)', 'Customer Promise Date', 'Projected Date', 'Memo',
+    'Terms', 'Ship Via', 'Location', 'Order Type', 'HubSpot Deal ID', 'Shipping Status',
+    'Ship Date', 'Billing Status', 'Class', 'Department', 'Subsidiary', 'Currency',
+    'Total Quantity', 'Created By', 'Calyx | External Order', 'Pending Approval Date',
+    'Corrected Customer Name', 'Rep Master',
+]
+
+
+def _positions(schema, headers):
+    return schema.resolve(headers).positions
+
+
+def test_sales_orders_baseline_positions():
+    positions = _positions(sheet_schema.SALES_ORDERS, SALES_ORDER_HEADERS)
+    assert positions['Internal ID'] == 0
+    assert positions['Document Number'] == 1   # B
+    assert positions['Status'] == 2            # C
+    assert positions['Amount'] == 7            # H, not an earlier *total* header
+    assert positions['Order Start Date'] == 8
+    assert positions['Order Type'] == 17
+    assert positions['Rep Master'] == 31
+    assert positions['Sales Rep'] == 5
+    assert positions['Customer'] == 4
+    assert positions['PI_CSM'] == 6
+
+
+def test_sales_orders_amount_must_be_an_amount_column():
+    headers = list(SALES_ORDER_HEADERS)
+    headers[7] = 'Memo (Internal)'
+    with pytest.raises(sheet_schema.SchemaError, match='Amount'):
+        sheet_schema.SALES_ORDERS.resolve(headers)
+
+
+def test_apply_renames_by_position():
+    df = pd.DataFrame([list(range(len(SALES_ORDER_HEADERS)))], columns=SALES_ORDER_HEADERS)
+    renamed = sheet_schema.SALES_ORDERS.apply(df)
+    assert renamed['Amount'].iloc[0] == 7
+    assert renamed['Document Number'].iloc[0] == 1
+    assert renamed['Memo'].iloc[0] == 13
+
+
+# NS Invoices A:U, with the headers the commission calculator reads by name
+INVOICE_HEADERS = [
+    'Document Number', 'Status', 'Date', 'Date Closed', 'Created From', 'Terms', 'Customer',
+    'Memo', 'Due Date', 'Currency', 'Amount (Transaction Total)', 'Amount (Transaction Tax Total)',
+    'Amount (Shipping)', 'Amount Remaining', 'Sales Rep', 'HubSpot Pipeline', 'CSM',
+    'Class', 'Location', 'Corrected Customer Name', 'Rep Master',
+]
+
+
+def test_invoices_resolve_by_header_name():
+    positions = _positions(sheet_schema.INVOICES, INVOICE_HEADERS)
+    assert positions['Invoice Number'] == 0
+    assert positions['Amount'] == 10
+    assert positions['Tax Amount'] == 11
+    assert positions['Shipping Amount'] == 12
+    assert positions['Original Sales Rep'] == 14
+    assert positions['HubSpot_Pipeline'] == 15
+    assert positions['CSM'] == 16
+    assert positions['Corrected Customer Name'] == 19
+    assert positions['Rep Master'] == 20
+    assert positions['Date Closed'] == 3
+
+
+def test_invoices_follow_moved_headers():
+    # A column inserted before Amount moves it to L - the header still finds it
+    headers = INVOICE_HEADERS[:10] + ['Exchange Rate'] + INVOICE_HEADERS[10:]
+    positions = _positions(sheet_schema.INVOICES, headers)
+    assert headers[positions['Amount']] == 'Amount (Transaction Total)'
+    assert headers[positions['Invoice Number']] == 'Document Number'
+
+
+def test_invoices_fall_back_to_position_for_renamed_headers():
+    headers = list(INVOICE_HEADERS)
+    headers[0] = 'Invoice #'
+    headers[10] = 'Total'
+    positions = _positions(sheet_schema.INVOICES, headers)
+    assert positions['Invoice Number'] == 0
+    assert positions['Amount'] == 10
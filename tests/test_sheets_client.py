@@ -0,0 +1,55 @@
+import httplib2
+from googleapiclient.errors import HttpError
+
+import sheets_client
+
+
+def _record_batches(monkeypatch):
+    calls = []
+
+    def batch_get(ranges):
+        calls.append(list(ranges))
+        return [[[a1_range]] for a1_range in ranges]
+
+    monkeypatch.setattr(sheets_client, "_batch_get", batch_get)
+    monkeypatch.setattr(sheets_client, "get_sheets_service", lambda: None)
+    return calls
+
+
+def test_main_tabs_go_out_in_one_batch_get(monkeypatch):
+    calls = _record_batches(monkeypatch)
+    ranges = ["All Reps All Pipelines!A:R", "Dashboard Info!A:C", "NS Invoices!A:U", "NS Sales Orders!A:AF"]
+
+    values = sheets_client.batch_get_values(ranges)
+
+    assert calls == [ranges]
+    assert values == [[[a1_range]] for a1_range in ranges]
+
+
+def test_long_range_lists_are_chunked_in_order(monkeypatch):
+    calls = _record_batches(monkeypatch)
+    monkeypatch.setattr(sheets_client, "FETCH_CHUNK_SIZE", 2)
+    ranges = [f"Tab {i}!A:B" for i in range(5)]
+
+    values = sheets_client.batch_get_values(ranges)
+
+    assert sorted(calls) == [ranges[0:2], ranges[2:4], ranges[4:5]]
+    assert values == [[[a1_range]] for a1_range in ranges]
+
+
+def _http_error(status, retry_after=None):
+    headers = {"status": str(status)}
+    if retry_after is not None:
+        headers["retry-after"] = retry_after
+    return HttpError(httplib2.Response(headers), b"")
+
+
+def test_retry_after_is_honoured_up_to_the_backoff_cap():
+    assert sheets_client._retry_delay(_http_error(429, "3"), attempt=0) == 3
+    assert sheets_client._retry_delay(_http_error(429, "600"), attempt=0) == sheets_client.BACKOFF_MAX_SECONDS
+
+
+def test_non_retryable_errors_are_not_retried():
+    assert sheets_client._retry_delay(_http_error(403), attempt=0) is None
+    assert sheets_client._retry_delay(ValueError("bad range"), attempt=0) is None
+    assert 0 <= sheets_client._retry_delay(_http_error(503), attempt=2) <= 4